@@ -0,0 +1,243 @@
+"""
+HTTP load test of the backend, reporting throughput and latency percentiles per operation as JSON.
+
+Without `--base-url` the app is built with `initialize_backend_application` and driven in-process through an
+ASGI transport, so the numbers exclude the network and the server; the app connects to the storage and Redis
+configured in the environment. `STORAGE_BACKEND=memory` keeps every table in process, so only the application
+layer and Redis are measured. With `--base-url` a running server is driven over HTTP instead.
+
+    STORAGE_BACKEND=memory python -m benchmarks.load_test --duration 30 --concurrency 32 --mix signup=1,lookup=4
+    python -m benchmarks.load_test --base-url http://localhost:8000 --output runs/baseline.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import time
+import typing
+import uuid
+from datetime import datetime, timezone
+
+import asgi_lifespan
+import httpx
+from src.config.manager import settings
+from src.main import initialize_backend_application
+
+OPERATIONS: tuple[str, ...] = ("signup", "lookup", "list", "post", "history")
+DEFAULT_MIX: str = "signup=1,lookup=4,list=2,post=4,history=4"
+
+
+class OperationStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.errors: int = 0
+        self.statuses: dict[int, int] = {}
+
+    def record(self, latency: float, status_code: int) -> None:
+        self.latencies.append(latency)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        if status_code >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict[str, typing.Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "count": len(latencies),
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+            "p50_ms": percentile_ms(latencies, 50),
+            "p95_ms": percentile_ms(latencies, 95),
+            "p99_ms": percentile_ms(latencies, 99),
+            "max_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+        }
+
+
+def percentile_ms(sorted_latencies: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of latencies in seconds, returned in milliseconds."""
+    if not sorted_latencies:
+        return None
+    rank = max(1, -(-len(sorted_latencies) * percent // 100))
+    return round(sorted_latencies[int(rank) - 1] * 1000, 3)
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        operation, _, weight = part.partition("=")
+        if operation.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation `{operation}`, expected one of {OPERATIONS}")
+        weights[operation.strip()] = int(weight or 1)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one operation with a positive weight")
+    return weights
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: dict[str, int], seed: int):
+        """Drive a weighted mix of account and chat traffic against `client` and collect per-operation stats."""
+        self.client: httpx.AsyncClient = client
+        self.operations: list[str] = list(mix)
+        self.weights: list[int] = list(mix.values())
+        self.random: random.Random = random.Random(seed)
+        self.run_id: str = uuid.uuid4().hex[:8]
+        self.usernames: list[str] = []
+        self.user_ids: list[str] = []
+        self.chatroom_ids: list[str] = []
+        self.stats: dict[str, OperationStats] = {operation: OperationStats() for operation in self.operations}
+
+    async def prepare(self, users: int, chatrooms: int) -> None:
+        """Create the users and rooms the measured traffic reads from; not part of the reported numbers."""
+        for _ in range(users):
+            response = await self._signup()
+            response.raise_for_status()
+        for index in range(chatrooms):
+            response = await self.client.post(
+                f"{settings.API_PREFIX}/chatrooms",
+                json={"chatroom_name": f"bench-{self.run_id}-{index}", "member_ids": self.user_ids[:50]},
+            )
+            response.raise_for_status()
+            self.chatroom_ids.append(response.json()["chatroom_id"])
+
+    async def run(self, concurrency: int, duration: float | None, total_requests: int | None) -> float:
+        deadline = time.perf_counter() + duration if duration else None
+        remaining = [total_requests] if total_requests else None
+
+        async def _worker() -> None:
+            while True:
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                if remaining is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+
+                operation = self.random.choices(self.operations, weights=self.weights)[0]
+                started_at = time.perf_counter()
+                try:
+                    response = await getattr(self, f"_{operation}")()
+                    status_code = response.status_code
+                except httpx.HTTPError:
+                    status_code = 599
+                self.stats[operation].record(time.perf_counter() - started_at, status_code)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        return time.perf_counter() - started_at
+
+    async def _signup(self) -> httpx.Response:
+        username = f"bench_{self.run_id}_{uuid.uuid4().hex[:12]}"
+        response = await self.client.post(
+            f"{settings.API_PREFIX}/accounts/createuser",
+            json={"username": username, "email": f"{username}@example.com", "password": "bench-password"},
+        )
+        if response.status_code == 201:
+            self.usernames.append(username)
+            self.user_ids.append(response.json()["user_id"])
+        return response
+
+    async def _lookup(self) -> httpx.Response:
+        return await self.client.get(f"{settings.API_PREFIX}/accounts/{self.random.choice(self.usernames)}")
+
+    async def _list(self) -> httpx.Response:
+        return await self.client.get(f"{settings.API_PREFIX}/accounts/list/page", params={"limit": 50})
+
+    async def _post(self) -> httpx.Response:
+        return await self.client.post(
+            f"{settings.API_PREFIX}/chatrooms/{self.random.choice(self.chatroom_ids)}/messages",
+            json={"user_id": self.random.choice(self.user_ids), "message_text": "benchmark message"},
+        )
+
+    async def _history(self) -> httpx.Response:
+        return await self.client.get(
+            f"{settings.API_PREFIX}/chatrooms/{self.random.choice(self.chatroom_ids)}/messages",
+            params={"limit": 50},
+        )
+
+
+@contextlib.asynccontextmanager
+async def open_client(base_url: str | None, ready_timeout: float) -> typing.AsyncIterator[httpx.AsyncClient]:
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            await wait_until_ready(client, ready_timeout)
+            yield client
+        return
+
+    backend_app = initialize_backend_application()
+    async with asgi_lifespan.LifespanManager(backend_app):
+        transport = httpx.ASGITransport(app=backend_app)  # type: ignore
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=30) as client:
+            await wait_until_ready(client, ready_timeout)
+            yield client
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        response = await client.get(f"{settings.API_PREFIX}/health/ready")
+        if response.status_code == 200:
+            return
+        if time.perf_counter() >= deadline:
+            raise RuntimeError(f"Backend did not become ready within {timeout}s: {response.text}")
+        await asyncio.sleep(0.2)
+
+
+async def run_load_test(arguments: argparse.Namespace) -> dict[str, typing.Any]:
+    async with open_client(base_url=arguments.base_url, ready_timeout=arguments.ready_timeout) as client:
+        load_test = LoadTest(client=client, mix=arguments.mix, seed=arguments.seed)
+        await load_test.prepare(users=arguments.users, chatrooms=arguments.chatrooms)
+        elapsed = await load_test.run(
+            concurrency=arguments.concurrency, duration=arguments.duration, total_requests=arguments.requests
+        )
+
+    total_requests = sum(len(stats.latencies) for stats in load_test.stats.values())
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "target": arguments.base_url or "asgi",
+        "config": {
+            "concurrency": arguments.concurrency,
+            "duration": arguments.duration,
+            "requests": arguments.requests,
+            "mix": arguments.mix,
+            "users": arguments.users,
+            "chatrooms": arguments.chatrooms,
+            "seed": arguments.seed,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": total_requests,
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "operations": {operation: stats.summary(elapsed) for operation, stats in load_test.stats.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the backend and report latency percentiles as JSON.")
+    parser.add_argument("--base-url", default=None, help="Drive a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual clients")
+    parser.add_argument(
+        "--duration", type=float, default=None, help="Seconds to run; defaults to 10 without --requests"
+    )
+    parser.add_argument("--requests", type=int, default=None, help="Total measured requests")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Weights, e.g. {DEFAULT_MIX}")
+    parser.add_argument("--users", type=int, default=50, help="Users created before measuring")
+    parser.add_argument("--chatrooms", type=int, default=5, help="Chatrooms created before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the operation mix, for comparable runs")
+    parser.add_argument("--ready-timeout", type=float, default=60.0, help="Seconds to wait for /health/ready")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file instead of stdout")
+    arguments = parser.parse_args()
+    if arguments.duration is None and arguments.requests is None:
+        arguments.duration = 10.0
+
+    report = json.dumps(asyncio.run(run_load_test(arguments)), indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
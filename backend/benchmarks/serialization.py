@@ -0,0 +1,121 @@
+"""
+Compare the previous response path of list endpoints with the fast one, reporting JSON.
+
+The previous path builds a model per row and lets FastAPI serialize it through `response_model`; the fast path
+builds the page with one `TypeAdapter` call and returns a `PydanticJSONResponse`. Both serve the same rows
+through a bare FastAPI app driven over an ASGI transport, so the numbers cover model construction,
+serialization and the framework, but no storage. Bodies are checked to be byte-identical.
+
+    python -m benchmarks.serialization --sizes 100,1000,5000 --rounds 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import typing
+import uuid
+from datetime import datetime
+
+import fastapi
+import httpx
+import pydantic
+from cassandra.util import uuid_from_time
+from src.api.responses import PydanticJSONResponse
+from src.models.schemas.account import UserInResponse, UserPageInResponse
+from src.models.schemas.message import MessageInResponse, MessagePageInResponse
+
+
+def build_user_rows(size: int) -> list[dict[str, typing.Any]]:
+    return [
+        {"user_id": uuid.uuid4(), "username": f"user_{index}", "email": f"user_{index}@example.com"}
+        for index in range(size)
+    ]
+
+
+def build_message_rows(size: int) -> list[dict[str, typing.Any]]:
+    chatroom_id, now = uuid.uuid4(), time.time()
+    return [
+        {
+            "chatroom_id": chatroom_id,
+            "message_id": uuid_from_time(now - index),
+            "user_id": uuid.uuid4(),
+            "message_text": f"message number {index} ✓",
+            "created_at": datetime.utcfromtimestamp(now - index).replace(microsecond=0),
+        }
+        for index in range(size)
+    ]
+
+
+def build_app(user_rows: list[dict[str, typing.Any]], message_rows: list[dict[str, typing.Any]]) -> fastapi.FastAPI:
+    user_list_adapter = pydantic.TypeAdapter(list[UserInResponse])
+    message_list_adapter = pydantic.TypeAdapter(list[MessageInResponse])
+    app = fastapi.FastAPI()
+
+    @app.get("/previous/users", response_model=UserPageInResponse)
+    async def previous_users() -> UserPageInResponse:
+        return UserPageInResponse(users=[UserInResponse(**row) for row in user_rows], next_cursor=None)
+
+    @app.get("/fast/users", response_model=UserPageInResponse)
+    async def fast_users() -> PydanticJSONResponse:
+        users = user_list_adapter.validate_python(user_rows)
+        return PydanticJSONResponse(content=UserPageInResponse(users=users, next_cursor=None))
+
+    @app.get("/previous/messages", response_model=MessagePageInResponse)
+    async def previous_messages() -> MessagePageInResponse:
+        return MessagePageInResponse(messages=[MessageInResponse(**row) for row in message_rows], next_cursor=None)
+
+    @app.get("/fast/messages", response_model=MessagePageInResponse)
+    async def fast_messages() -> PydanticJSONResponse:
+        messages = message_list_adapter.validate_python(message_rows)
+        return PydanticJSONResponse(content=MessagePageInResponse(messages=messages, next_cursor=None))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, rounds: int) -> tuple[float, bytes]:
+    """Return the median latency of `path` in milliseconds and its body."""
+    body = (await client.get(path)).content
+    latencies = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started_at)
+    return statistics.median(latencies) * 1000, body
+
+
+async def run_benchmark(sizes: list[int], rounds: int) -> list[dict[str, typing.Any]]:
+    results = []
+    for size in sizes:
+        app = build_app(user_rows=build_user_rows(size), message_rows=build_message_rows(size))
+        transport = httpx.ASGITransport(app=app)  # type: ignore
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for resource in ("users", "messages"):
+                previous_ms, previous_body = await measure(client, f"/previous/{resource}", rounds)
+                fast_ms, fast_body = await measure(client, f"/fast/{resource}", rounds)
+                results.append(
+                    {
+                        "resource": resource,
+                        "items": size,
+                        "previous_ms": round(previous_ms, 3),
+                        "fast_ms": round(fast_ms, 3),
+                        "speedup": round(previous_ms / fast_ms, 2),
+                        "identical": previous_body == fast_body,
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the fast response serialization path.")
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma-separated item counts per response")
+    parser.add_argument("--rounds", type=int, default=50, help="Requests per path and size")
+    arguments = parser.parse_args()
+
+    sizes = [int(size) for size in arguments.sizes.split(",")]
+    print(json.dumps(asyncio.run(run_benchmark(sizes=sizes, rounds=arguments.rounds)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from src.repository.cache import RedisCache, cache
-from src.repository.database import CassandraDatabase, database
+from src.repository.storage.base import StorageEngine
+from src.repository.storage.engine import storage
 
 
-def get_cassandra() -> CassandraDatabase:
-    return database
+def get_storage() -> StorageEngine:
+    return storage
 
 
 def get_redis() -> RedisCache:
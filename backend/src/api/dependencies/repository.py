@@ -1,10 +1,10 @@
 import typing
 
 import fastapi
-from src.api.dependencies.connections import get_cassandra, get_redis
+from src.api.dependencies.connections import get_redis, get_storage
 from src.repository.cache import RedisCache
 from src.repository.crud.base import BaseCRUDRepository
-from src.repository.database import CassandraDatabase
+from src.repository.storage.base import StorageEngine
 
 _repo_instances = {}  # Store repo instances to reduce overhead
 
@@ -12,16 +12,16 @@ _repo_instances = {}  # Store repo instances to reduce overhead
 def get_repository(
     repo_type: typing.Type[BaseCRUDRepository],
 ) -> typing.Callable[
-    [CassandraDatabase, RedisCache],
+    [StorageEngine, RedisCache],
     BaseCRUDRepository,
 ]:
     def _get_repo(
-        cassandra_db: CassandraDatabase = fastapi.Depends(get_cassandra),
+        storage: StorageEngine = fastapi.Depends(get_storage),
         redis_cache: RedisCache = fastapi.Depends(get_redis),
     ) -> BaseCRUDRepository:
 
         if not repo_type in _repo_instances:
-            _repo_instances[repo_type] = repo_type(cassandra_db=cassandra_db, redis_cache=redis_cache)
+            _repo_instances[repo_type] = repo_type(storage=storage, redis_cache=redis_cache)
 
         return _repo_instances[repo_type]
 
@@ -1,9 +1,17 @@
 import fastapi
 from src.api.routes.account import router as account_router
+from src.api.routes.chat import router as chat_router
+from src.api.routes.chatroom import router as chatroom_router
+from src.api.routes.health import router as health_router
+from src.api.routes.presence import router as presence_router
 
 # from src.api.routes.authentication import router as auth_router
 
 router = fastapi.APIRouter()
 
 router.include_router(router=account_router)
+router.include_router(router=chatroom_router)
+router.include_router(router=chat_router)
+router.include_router(router=presence_router)
+router.include_router(router=health_router)
 # router.include_router(router=auth_router)
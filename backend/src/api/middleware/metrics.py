@@ -0,0 +1,45 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.utilities.metrics import metrics_registry
+
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP responses by route template and status code.", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        Record latency and status of every HTTP request, labelled by route template rather than raw path so
+        path parameters do not multiply the series.
+
+        A plain ASGI middleware: it only wraps `send`, without buffering or re-wrapping requests.
+        """
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # FastAPI stores the matched route in the scope during routing
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            http_request_duration_seconds.observe(time.perf_counter() - started_at, labels)
+            http_requests_total.inc((*labels, str(status_code)))
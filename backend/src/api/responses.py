@@ -0,0 +1,20 @@
+import typing
+
+import fastapi.responses
+import pydantic_core
+
+
+class PydanticJSONResponse(fastapi.responses.Response):
+    """
+    JSON response encoding pydantic models, or lists of them, with pydantic-core's serializer.
+
+    A route returning it skips FastAPI's `response_model` round trip, which validates the already built models
+    again and walks them through `jsonable_encoder` before `json.dumps`. The body is byte-identical, so it is
+    meant for high-volume reads whose models the repositories build from trusted rows; the route should keep
+    declaring `response_model` for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: typing.Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -1,17 +1,27 @@
+import typing
+
 import fastapi
+import fastapi.responses
 
 # import pydantic
 from src.api.dependencies.repository import get_repository
+from src.api.responses import PydanticJSONResponse
+from src.config.manager import settings
 from src.models.db.models import User
 from src.models.schemas.account import (  # AccountInUpdate,; AccountWithToken,
     AccountInCreate,
     AccountInResponse,
+    UserBatchInLookup,
+    UserBatchInResponse,
     UserInResponse,
+    UserPageInResponse,
 )
 from src.repository.crud.user import UserCRUDRepository
 
 # from src.securities.authorizations.jwt import jwt_generator
-from src.utilities.exceptions.database import EntityAlreadyExists, EntityDoesNotExist
+from src.utilities.exceptions.database import EntityAlreadyExists, EntityDoesNotExist, InvalidPaginationCursor
+from src.utilities.exceptions.password import PasswordHashingOverloaded
+from src.utilities.formatters.import_formatter import parse_account_rows
 
 # from src.utilities.exceptions.http.exc_404 import (
 #     http_404_exc_email_not_found_request,
@@ -31,10 +41,109 @@ router = fastapi.APIRouter(prefix="/accounts", tags=["accounts"])
 )
 async def get_all_users(
     user_repo: UserCRUDRepository = fastapi.Depends(get_repository(repo_type=UserCRUDRepository)),
-) -> list[UserInResponse]:
+) -> PydanticJSONResponse:
     all_users = await user_repo.read_all_users()
 
-    return all_users
+    return PydanticJSONResponse(content=all_users)
+
+
+@router.get(
+    path="/list/page",
+    name="users:read-users-page",
+    response_model=UserPageInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_users_page(
+    limit: int = fastapi.Query(default=100, ge=1, le=1000),
+    cursor: str | None = fastapi.Query(default=None),
+    user_repo: UserCRUDRepository = fastapi.Depends(get_repository(repo_type=UserCRUDRepository)),
+) -> PydanticJSONResponse:
+    try:
+        users_page = await user_repo.read_users_page(limit=limit, cursor=cursor)
+    except InvalidPaginationCursor:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor {cursor} is invalid",
+        )
+
+    return PydanticJSONResponse(content=users_page)
+
+
+@router.get(
+    path="/list/stream",
+    name="users:stream-all-users",
+    response_class=fastapi.responses.StreamingResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def stream_all_users(
+    fetch_size: int = fastapi.Query(default=500, ge=1, le=5000),
+    user_repo: UserCRUDRepository = fastapi.Depends(get_repository(repo_type=UserCRUDRepository)),
+) -> fastapi.responses.StreamingResponse:
+    async def _ndjson_rows() -> typing.AsyncIterator[str]:
+        async for users in user_repo.stream_users(fetch_size=fetch_size):
+            yield "".join(f"{user.model_dump_json()}\n" for user in users)
+
+    return fastapi.responses.StreamingResponse(content=_ndjson_rows(), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/import",
+    name="users:import-users",
+    response_class=fastapi.responses.StreamingResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def import_users(
+    request: fastapi.Request,
+    file_format: str | None = fastapi.Query(default=None, alias="format", pattern="^(jsonl|csv)$"),
+    user_repo: UserCRUDRepository = fastapi.Depends(get_repository(repo_type=UserCRUDRepository)),
+) -> fastapi.responses.StreamingResponse:
+    """
+    Create the accounts of a JSON lines or CSV request body, streaming one NDJSON result per row.
+
+    The format is taken from `?format=`, else from the `Content-Type` (`text/csv` for CSV, JSON lines otherwise).
+    The body is read whole before the import starts: while a streaming response is sent, Starlette listens for
+    the client disconnecting on the same channel the body arrives on.
+    """
+    if file_format is None:
+        file_format = "csv" if request.headers.get("content-type", "").startswith("text/csv") else "jsonl"
+    try:
+        lines = (await request.body()).decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail="Import body must be UTF-8 encoded",
+        )
+
+    async def _ndjson_results() -> typing.AsyncIterator[str]:
+        accounts = parse_account_rows(lines=lines, file_format=file_format)
+        async for result in user_repo.import_users(accounts=accounts):
+            yield f"{result.model_dump_json()}\n"
+
+    return fastapi.responses.StreamingResponse(content=_ndjson_results(), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/lookup",
+    name="users:read-users-batch",
+    response_model=UserBatchInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_users_batch(
+    lookup: UserBatchInLookup,
+    user_repo: UserCRUDRepository = fastapi.Depends(get_repository(repo_type=UserCRUDRepository)),
+) -> PydanticJSONResponse:
+    """
+    Resolve the profiles of up to `USER_BATCH_MAX_SIZE` user ids and usernames in one request.
+    """
+    if len(lookup.user_ids) + len(lookup.usernames) > settings.USER_BATCH_MAX_SIZE:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.USER_BATCH_MAX_SIZE} user ids and usernames can be looked up at once",
+        )
+
+    users = await user_repo.read_accounts(user_ids=lookup.user_ids, usernames=lookup.usernames)
+
+    return PydanticJSONResponse(content=users)
 
 
 @router.get(
@@ -72,10 +181,18 @@ async def create_user(
         new_user = await user_repo.create_user(user_create=user_create)
 
     except EntityAlreadyExists:
-        fastapi.HTTPException(
+        raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail=f"Username {user_create.username} or {user_create.email} already taken",
         )
+
+    except PasswordHashingOverloaded:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many signups in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
     return new_user
 
 
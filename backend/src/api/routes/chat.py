@@ -0,0 +1,112 @@
+import asyncio
+from uuid import UUID
+
+import fastapi
+import loguru
+import pydantic
+from src.api.dependencies.repository import get_repository
+from src.config.manager import settings
+from src.models.schemas.chat import ChatClientEvent, ChatServerEvent
+from src.models.schemas.message import MessageInCreate
+from src.repository.crud.message import MessageCRUDRepository
+from src.repository.presence import presence_tracker
+from src.repository.pubsub import pubsub_hub
+
+router = fastapi.APIRouter(prefix="/ws", tags=["chat"])
+
+
+def chatroom_channel(chatroom_id: UUID) -> str:
+    return f"chatroom:{chatroom_id}"
+
+
+class ChatConnection:
+    def __init__(self, websocket: fastapi.WebSocket):
+        """
+        Pair a WebSocket with a bounded outbox drained by its own sender task, so one slow client never
+        blocks the fan-out to the others.
+        """
+        self.websocket: fastapi.WebSocket = websocket
+        self.outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.WEBSOCKET_OUTBOX_SIZE)
+        self.chatroom_ids: set[UUID] = set()
+        self.is_overflowed: bool = False
+
+    def deliver(self, payload: str) -> None:
+        """Pub/sub listener: queue a fanned-out payload, dropping the connection if it cannot keep up."""
+        try:
+            self.outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.is_overflowed = True
+
+    async def send_outbox(self) -> None:
+        while not self.is_overflowed:
+            payload = await self.outbox.get()
+            await self.websocket.send_text(payload)
+        await self.websocket.close(code=fastapi.status.WS_1008_POLICY_VIOLATION, reason="Client is too slow")
+
+    async def send_event(self, event: ChatServerEvent) -> None:
+        self.deliver(event.model_dump_json(exclude_none=True))
+
+
+@router.websocket(path="/chat", name="chat:gateway")
+async def chat_gateway(
+    websocket: fastapi.WebSocket,
+    user_id: UUID,
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> None:
+    await websocket.accept()
+    connection = ChatConnection(websocket=websocket)
+    sender_task = asyncio.create_task(connection.send_outbox())
+    # An open connection is the user's heartbeat, refreshed in the background until it closes
+    presence_tracker.track(user_id)
+
+    try:
+        while not sender_task.done():
+            try:
+                event = ChatClientEvent.model_validate_json(await websocket.receive_text())
+            except pydantic.ValidationError as validation_error:
+                await connection.send_event(ChatServerEvent(type="error", detail=str(validation_error)))
+                continue
+
+            channel = chatroom_channel(event.chatroom_id)
+
+            if event.action == "subscribe":
+                if event.chatroom_id not in connection.chatroom_ids:
+                    await pubsub_hub.subscribe(channel=channel, listener=connection.deliver)
+                    connection.chatroom_ids.add(event.chatroom_id)
+                await connection.send_event(ChatServerEvent(type="subscribed", chatroom_id=event.chatroom_id))
+
+            elif event.action == "unsubscribe":
+                if event.chatroom_id in connection.chatroom_ids:
+                    await pubsub_hub.unsubscribe(channel=channel, listener=connection.deliver)
+                    connection.chatroom_ids.discard(event.chatroom_id)
+                await connection.send_event(ChatServerEvent(type="unsubscribed", chatroom_id=event.chatroom_id))
+
+            elif not event.message_text:
+                await connection.send_event(ChatServerEvent(type="error", detail="`message_text` is required to post"))
+
+            else:
+                new_message = await message_repo.create_message(
+                    chatroom_id=event.chatroom_id,
+                    message_create=MessageInCreate(user_id=user_id, message_text=event.message_text),
+                )
+                # Every worker with subscribers for the room, this one included, delivers it from Redis
+                await pubsub_hub.publish(
+                    channel=channel,
+                    message=ChatServerEvent(
+                        type="message", chatroom_id=event.chatroom_id, message=new_message
+                    ).model_dump_json(exclude_none=True),
+                )
+
+    except fastapi.WebSocketDisconnect:
+        pass
+
+    except Exception as e:
+        loguru.logger.error(f"Chat gateway connection of user {user_id} failed: {e}")
+        raise
+
+    finally:
+        presence_tracker.untrack(user_id)
+        sender_task.cancel()
+        await asyncio.gather(sender_task, return_exceptions=True)
+        for chatroom_id in connection.chatroom_ids:
+            await pubsub_hub.unsubscribe(channel=chatroom_channel(chatroom_id), listener=connection.deliver)
@@ -0,0 +1,243 @@
+from uuid import UUID
+
+import fastapi
+from src.api.dependencies.repository import get_repository
+from src.api.responses import PydanticJSONResponse
+from src.models.schemas.chatroom import (
+    ChatroomInCreate,
+    ChatroomInResponse,
+    ChatroomMembersInUpdate,
+    RoomMemberPageInResponse,
+    RoomOnlineMembersInResponse,
+    UserRoomPageInResponse,
+)
+from src.models.schemas.message import (
+    MessageInCreate,
+    MessageInResponse,
+    MessagePageInResponse,
+    MessageSearchPageInResponse,
+    ReadMarkerInUpdate,
+    UserUnreadInResponse,
+)
+from src.repository.crud.chatroom import ChatroomCRUDRepository
+from src.repository.crud.message import MessageCRUDRepository
+from src.utilities.exceptions.database import EntityDoesNotExist, InvalidPaginationCursor
+
+router = fastapi.APIRouter(prefix="/chatrooms", tags=["chatrooms"])
+
+
+@router.post(
+    path="",
+    name="chatrooms:create-chatroom",
+    response_model=ChatroomInResponse,
+    status_code=fastapi.status.HTTP_201_CREATED,
+)
+async def create_chatroom(
+    chatroom_create: ChatroomInCreate,
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> ChatroomInResponse:
+    return await chatroom_repo.create_chatroom(chatroom_create=chatroom_create)
+
+
+@router.get(
+    path="/users/{user_id}",
+    name="chatrooms:read-user-chatrooms",
+    response_model=UserRoomPageInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_user_chatrooms(
+    user_id: UUID,
+    limit: int = fastapi.Query(default=100, ge=1, le=1000),
+    cursor: str | None = fastapi.Query(default=None),
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> PydanticJSONResponse:
+    try:
+        chatrooms_page = await chatroom_repo.read_user_chatrooms_page(user_id=user_id, limit=limit, cursor=cursor)
+    except InvalidPaginationCursor:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor {cursor} is invalid",
+        )
+
+    return PydanticJSONResponse(content=chatrooms_page)
+
+
+@router.get(
+    path="/users/{user_id}/unread",
+    name="chatrooms:read-user-unread-counts",
+    response_model=UserUnreadInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_user_unread_counts(
+    user_id: UUID,
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> PydanticJSONResponse:
+    unread_counts = await message_repo.read_unread_counts(user_id=user_id)
+
+    return PydanticJSONResponse(content=unread_counts)
+
+
+@router.get(
+    path="/{chatroom_id}",
+    name="chatrooms:read-chatroom-by-id",
+    response_model=ChatroomInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_chatroom(
+    chatroom_id: UUID,
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> ChatroomInResponse:
+    try:
+        chatroom = await chatroom_repo.read_chatroom_by_id(chatroom_id=chatroom_id)
+    except EntityDoesNotExist:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_404_NOT_FOUND,
+            detail=f"Chatroom {chatroom_id} not found",
+        )
+
+    return chatroom
+
+
+@router.get(
+    path="/{chatroom_id}/members",
+    name="chatrooms:read-members",
+    response_model=RoomMemberPageInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_chatroom_members(
+    chatroom_id: UUID,
+    limit: int = fastapi.Query(default=100, ge=1, le=1000),
+    cursor: str | None = fastapi.Query(default=None),
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> PydanticJSONResponse:
+    try:
+        members_page = await chatroom_repo.read_members_page(chatroom_id=chatroom_id, limit=limit, cursor=cursor)
+    except InvalidPaginationCursor:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor {cursor} is invalid",
+        )
+
+    return PydanticJSONResponse(content=members_page)
+
+
+@router.get(
+    path="/{chatroom_id}/members/online",
+    name="chatrooms:read-online-members",
+    response_model=RoomOnlineMembersInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_online_chatroom_members(
+    chatroom_id: UUID,
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> PydanticJSONResponse:
+    online_members = await chatroom_repo.read_online_members(chatroom_id=chatroom_id)
+
+    return PydanticJSONResponse(content=online_members)
+
+
+@router.post(
+    path="/{chatroom_id}/members",
+    name="chatrooms:add-members",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def add_chatroom_members(
+    chatroom_id: UUID,
+    members_update: ChatroomMembersInUpdate,
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> None:
+    await chatroom_repo.add_members(chatroom_id=chatroom_id, user_ids=members_update.user_ids)
+
+
+@router.delete(
+    path="/{chatroom_id}/members",
+    name="chatrooms:remove-members",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def remove_chatroom_members(
+    chatroom_id: UUID,
+    members_update: ChatroomMembersInUpdate,
+    chatroom_repo: ChatroomCRUDRepository = fastapi.Depends(get_repository(repo_type=ChatroomCRUDRepository)),
+) -> None:
+    await chatroom_repo.remove_members(chatroom_id=chatroom_id, user_ids=members_update.user_ids)
+
+
+@router.get(
+    path="/{chatroom_id}/messages",
+    name="chatrooms:read-message-history",
+    response_model=MessagePageInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_message_history(
+    chatroom_id: UUID,
+    limit: int = fastapi.Query(default=50, ge=1, le=500),
+    cursor: str | None = fastapi.Query(default=None),
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> PydanticJSONResponse:
+    try:
+        message_page = await message_repo.read_message_history(chatroom_id=chatroom_id, limit=limit, cursor=cursor)
+    except InvalidPaginationCursor:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor {cursor} is invalid",
+        )
+
+    return PydanticJSONResponse(content=message_page)
+
+
+@router.get(
+    path="/{chatroom_id}/messages/search",
+    name="chatrooms:search-messages",
+    response_model=MessageSearchPageInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def search_messages(
+    chatroom_id: UUID,
+    q: str = fastapi.Query(min_length=1, max_length=256),
+    limit: int = fastapi.Query(default=50, ge=1, le=500),
+    cursor: str | None = fastapi.Query(default=None),
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> PydanticJSONResponse:
+    try:
+        search_page = await message_repo.search_messages(chatroom_id=chatroom_id, query=q, limit=limit, cursor=cursor)
+    except InvalidPaginationCursor:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Cursor {cursor} is invalid",
+        )
+
+    return PydanticJSONResponse(content=search_page)
+
+
+@router.put(
+    path="/{chatroom_id}/read-marker",
+    name="chatrooms:mark-read",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def mark_chatroom_read(
+    chatroom_id: UUID,
+    read_marker_update: ReadMarkerInUpdate,
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> None:
+    # Markers are positions in the clustering order of messages, which only time UUIDs have
+    if read_marker_update.message_id.version != 1:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail=f"Message id {read_marker_update.message_id} is not a time UUID",
+        )
+
+    await message_repo.mark_read(chatroom_id=chatroom_id, read_marker_update=read_marker_update)
+
+
+@router.post(
+    path="/{chatroom_id}/messages",
+    name="chatrooms:create-message",
+    response_model=MessageInResponse,
+    status_code=fastapi.status.HTTP_201_CREATED,
+)
+async def create_message(
+    chatroom_id: UUID,
+    message_create: MessageInCreate,
+    message_repo: MessageCRUDRepository = fastapi.Depends(get_repository(repo_type=MessageCRUDRepository)),
+) -> MessageInResponse:
+    return await message_repo.create_message(chatroom_id=chatroom_id, message_create=message_create)
@@ -0,0 +1,32 @@
+import fastapi
+from src.models.schemas.health import ReadinessInResponse
+from src.repository.health import dependency_health
+
+router = fastapi.APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get(
+    path="/live",
+    name="health:live",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def live() -> dict[str, str]:
+    return {"status": "alive"}
+
+
+@router.get(
+    path="/ready",
+    name="health:ready",
+    response_model=ReadinessInResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+    responses={fastapi.status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessInResponse}},
+)
+async def ready(response: fastapi.Response) -> ReadinessInResponse:
+    # Orchestrators only route traffic here once every dependency finished initializing
+    if not dependency_health.is_ready:
+        response.status_code = fastapi.status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessInResponse(
+        status="ready" if dependency_health.is_ready else "unavailable",
+        dependencies=dependency_health.report(),  # type: ignore
+    )
@@ -0,0 +1,16 @@
+import fastapi
+from src.utilities.metrics import metrics_registry
+
+router = fastapi.APIRouter(tags=["metrics"])
+
+
+@router.get(
+    path="/metrics",
+    name="metrics:read-metrics",
+    response_class=fastapi.responses.PlainTextResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def read_metrics() -> fastapi.responses.PlainTextResponse:
+    return fastapi.responses.PlainTextResponse(
+        content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,17 @@
+import fastapi
+from src.models.schemas.presence import PresenceInHeartbeat
+from src.repository.presence import presence_tracker
+
+router = fastapi.APIRouter(prefix="/presence", tags=["presence"])
+
+
+@router.post(
+    path="/heartbeat",
+    name="presence:heartbeat",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def heartbeat(presence_heartbeat: PresenceInHeartbeat) -> None:
+    """
+    Keep a user without a chat connection online; clients send one at least every `PRESENCE_TTL` seconds.
+    """
+    presence_tracker.heartbeat(user_id=presence_heartbeat.user_id)
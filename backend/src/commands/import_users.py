@@ -0,0 +1,79 @@
+"""
+Bulk-create accounts from a JSON lines or CSV file, printing one NDJSON result per row.
+
+    python -m src.commands.import_users accounts.jsonl
+    python -m src.commands.import_users accounts.csv --format csv > results.ndjson
+    cat accounts.jsonl | python -m src.commands.import_users -
+
+CSV files need a `username,email,password` header; JSON lines hold one `{"username", "email", "password"}`
+object each. A summary of the outcomes is printed to stderr once every row is settled.
+"""
+
+import argparse
+import asyncio
+import collections
+import sys
+import typing
+
+import loguru
+from src.config.manager import settings
+from src.repository.cache import cache
+from src.repository.crud.user import UserCRUDRepository
+from src.repository.database import database
+from src.repository.schema.migrator import schema_migrator
+from src.repository.storage.engine import storage
+from src.securities.hashing.hash import hash_generator
+from src.utilities.formatters.import_formatter import ACCOUNT_IMPORT_FORMATS, parse_account_rows
+
+
+def read_lines(path: str) -> typing.Iterator[str]:
+    with (
+        open(sys.stdin.fileno(), encoding="utf-8", closefd=False) if path == "-" else open(path, encoding="utf-8")
+    ) as file:
+        yield from file
+
+
+async def run_import(path: str, file_format: str) -> collections.Counter:
+    if settings.STORAGE_BACKEND == "cassandra":
+        await database.connect()
+        await schema_migrator.check()
+        await asyncio.to_thread(database.prepare_statements)
+    else:
+        await storage.connect()
+
+    # Without Redis the accounts are still created; only the negative cache entries of their names are not dropped
+    try:
+        await cache.initialize()
+    except Exception as e:
+        loguru.logger.warning(f"Account Import -- Redis unavailable, cached lookups may lag until they expire: {e}")
+
+    outcomes: collections.Counter = collections.Counter()
+    user_repo = UserCRUDRepository(storage=storage, redis_cache=cache)
+    try:
+        accounts = parse_account_rows(lines=read_lines(path), file_format=file_format)
+        async for result in user_repo.import_users(accounts=accounts):
+            outcomes[result.status] += 1
+            print(result.model_dump_json(), flush=True)
+    finally:
+        await hash_generator.shutdown()
+        await cache.close()
+        storage.shutdown()
+    return outcomes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-create accounts from a JSON lines or CSV file.")
+    parser.add_argument("path", help="File to import, `-` for stdin")
+    parser.add_argument(
+        "--format", dest="file_format", choices=ACCOUNT_IMPORT_FORMATS, default=None, help="Defaults to the extension"
+    )
+    arguments = parser.parse_args()
+    file_format = arguments.file_format or ("csv" if arguments.path.endswith(".csv") else "jsonl")
+
+    outcomes = asyncio.run(run_import(path=arguments.path, file_format=file_format))
+    print(", ".join(f"{status}: {count}" for status, count in sorted(outcomes.items())) or "no rows", file=sys.stderr)
+    sys.exit(0 if outcomes.keys() <= {"created"} else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Apply the Cassandra schema migrations, once per deploy and before new workers start.
+
+    python -m src.commands.migrate upgrade [--to VERSION]
+    python -m src.commands.migrate status
+"""
+
+import argparse
+import asyncio
+
+from src.repository.database import database
+from src.repository.schema.migrator import schema_migrator
+
+
+async def run_migrations(command: str, target_version: int | None) -> None:
+    await database.connect()
+    try:
+        if command == "upgrade":
+            await schema_migrator.upgrade(target_version=target_version)
+        else:
+            applied_version = await schema_migrator.applied_version()
+            print(f"Applied schema version: {applied_version}, latest: {schema_migrator.latest_version}")
+            for migration in schema_migrator.migrations:
+                state = "applied" if migration.version <= applied_version else "pending"
+                print(f"  {migration.version:>4}  {state:<8} {migration.description}")
+    finally:
+        database.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the Cassandra schema version.")
+    parser.add_argument("command", choices=("upgrade", "status"))
+    parser.add_argument("--to", dest="target_version", type=int, default=None, help="Stop after this version")
+    arguments = parser.parse_args()
+
+    asyncio.run(run_migrations(command=arguments.command, target_version=arguments.target_version))
+
+
+if __name__ == "__main__":
+    main()
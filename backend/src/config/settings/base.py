@@ -23,12 +23,27 @@ class BackendBaseSettings(pydantic_settings.BaseSettings):
     REDOC_URL: str = "/redoc"
     OPENAPI_PREFIX: str = ""
 
+    # "cassandra", or "memory" to keep every table in process, e.g. for single-node deployments and benchmarks
+    STORAGE_BACKEND: str = decouple.config("STORAGE_BACKEND", default="cassandra", cast=str)  # type: ignore
+
     CASSANDRA_KEYSPACE: str = decouple.config("CASSANDRA_KEYSPACE", cast=str)  # type: ignore
     CASSANDRA_PASSWORD: str = decouple.config("CASSANDRA_PASSWORD", cast=str)  # type: ignore
     CASSANDRA_PORT: int = decouple.config("CASSANDRA_PORT", cast=int)  # type: ignore
     CASSANDRA_USERNAME: str = decouple.config("CASSANDRA_USERNAME", cast=str)  # type: ignore
     CASSANDRA_HOST: str = decouple.config("CASSANDRA_HOST", cast=str)  # type: ignore
+    # Comma separated contact points; the driver discovers the rest of the cluster from them
+    CASSANDRA_HOSTS: str = decouple.config("CASSANDRA_HOSTS", default=CASSANDRA_HOST, cast=str)  # type: ignore
+    # Data center whose replicas serve requests; empty means the data center of the first contact point
+    CASSANDRA_LOCAL_DC: str = decouple.config("CASSANDRA_LOCAL_DC", default="", cast=str)  # type: ignore
+    # Consistency of Cassandra queries that do not choose their own, e.g. LOCAL_ONE, LOCAL_QUORUM
+    CONSISTENCY_LEVEL: str = decouple.config("CONSISTENCY_LEVEL", default="LOCAL_ONE", cast=str)  # type: ignore
+    # Requests a worker keeps in flight on the cluster before new ones wait for a slot
+    CASSANDRA_MAX_IN_FLIGHT: int = decouple.config("CASSANDRA_MAX_IN_FLIGHT", default=1024, cast=int)  # type: ignore
+    # Idempotent reads still unanswered after this delay are also sent to the next replica; 0 disables it
+    SPECULATIVE_DELAY_MS: int = decouple.config("SPECULATIVE_DELAY_MS", default=0, cast=int)  # type: ignore
+    SPECULATIVE_ATTEMPTS: int = decouple.config("SPECULATIVE_ATTEMPTS", default=1, cast=int)  # type: ignore
 
+    # Seconds a Cassandra request may take before the driver fails it
     DB_TIMEOUT: int = decouple.config("DB_TIMEOUT", cast=int)  # type: ignore
     IS_DB_ECHO_LOG: bool = decouple.config("IS_DB_ECHO_LOG", cast=bool)  # type: ignore
 
@@ -38,12 +53,74 @@ class BackendBaseSettings(pydantic_settings.BaseSettings):
     REDIS_DB: int = decouple.config("REDIS_DB", cast=int)  # type: ignore
     REDIS_MAX_CONNECTIONS: int = decouple.config("REDIS_MAX_CONNECTIONS", cast=int)  # type: ignore
 
+    # Connection attempts per dependency at startup, spaced by exponential backoff with full jitter
+    STARTUP_RETRIES: int = decouple.config("STARTUP_RETRIES", default=8, cast=int)  # type: ignore
+    STARTUP_BACKOFF_BASE: float = decouple.config("STARTUP_BACKOFF_BASE", default=0.5, cast=float)  # type: ignore
+    STARTUP_BACKOFF_MAX: float = decouple.config("STARTUP_BACKOFF_MAX", default=30.0, cast=float)  # type: ignore
+
+    # "check": workers refuse to start on an outdated schema, "migrate": workers apply pending migrations
+    SCHEMA_STARTUP_MODE: str = decouple.config("SCHEMA_STARTUP_MODE", default="check", cast=str)  # type: ignore
+
+    USER_CACHE_TTL: int = decouple.config("USER_CACHE_TTL", default=300, cast=int)  # type: ignore
+    USER_CACHE_NEGATIVE_TTL: int = decouple.config("USER_CACHE_NEGATIVE_TTL", default=30, cast=int)  # type: ignore
+
+    # Width of a message partition; changing it after messages were written orphans the older buckets
+    MESSAGE_BUCKET_SECONDS: int = decouple.config("MESSAGE_BUCKET_SECONDS", default=86400, cast=int)  # type: ignore
+
+    MESSAGE_BATCH_MAX_SIZE: int = decouple.config("MESSAGE_BATCH_MAX_SIZE", default=50, cast=int)  # type: ignore
+    # Bytes of message rows per unlogged batch, below Cassandra's `batch_size_fail_threshold` of 50KiB
+    MESSAGE_BATCH_MAX_BYTES: int = decouple.config("MESSAGE_BATCH_MAX_BYTES", default=40960, cast=int)  # type: ignore
+    MESSAGE_BATCH_DELAY_MS: int = decouple.config("MESSAGE_BATCH_DELAY_MS", default=5, cast=int)  # type: ignore
+    MESSAGE_BUFFER_SIZE: int = decouple.config("MESSAGE_BUFFER_SIZE", default=10000, cast=int)  # type: ignore
+    # "flush": acknowledge a message once persisted, "enqueue": acknowledge it once buffered
+    MESSAGE_ACK_MODE: str = decouple.config("MESSAGE_ACK_MODE", default="flush", cast=str)  # type: ignore
+
+    # Ids plus usernames a single batch profile lookup may ask for
+    USER_BATCH_MAX_SIZE: int = decouple.config("USER_BATCH_MAX_SIZE", default=100, cast=int)  # type: ignore
+
+    # Newest messages of a room kept in Redis; history reads past them fall back to Cassandra
+    RECENT_CACHE_SIZE: int = decouple.config("RECENT_CACHE_SIZE", default=100, cast=int)  # type: ignore
+    RECENT_CACHE_TTL: int = decouple.config("RECENT_CACHE_TTL", default=3600, cast=int)  # type: ignore
+
+    # Messages waiting to be indexed for search; past it new messages are left out of the index
+    SEARCH_INDEX_QUEUE_SIZE: int = decouple.config("SEARCH_INDEX_QUEUE_SIZE", default=10000, cast=int)  # type: ignore
+    SEARCH_INDEX_BATCH_SIZE: int = decouple.config("SEARCH_INDEX_BATCH_SIZE", default=100, cast=int)  # type: ignore
+    SEARCH_MESSAGE_MAX_TERMS: int = decouple.config("SEARCH_MESSAGE_MAX_TERMS", default=64, cast=int)  # type: ignore
+    SEARCH_QUERY_MAX_TERMS: int = decouple.config("SEARCH_QUERY_MAX_TERMS", default=8, cast=int)  # type: ignore
+    # Postings of the driving term read per round trip, and in total per search request
+    SEARCH_FETCH_SIZE: int = decouple.config("SEARCH_FETCH_SIZE", default=200, cast=int)  # type: ignore
+    SEARCH_SCAN_MAX_POSTINGS: int = decouple.config("SEARCH_SCAN_MAX_POSTINGS", default=5000, cast=int)  # type: ignore
+    # Message buckets a single search request walks before returning what it found with a cursor
+    SEARCH_SCAN_MAX_BUCKETS: int = decouple.config("SEARCH_SCAN_MAX_BUCKETS", default=60, cast=int)  # type: ignore
+
+    # A user is online until this long after their last heartbeat; connected users are refreshed every third of it
+    PRESENCE_TTL: int = decouple.config("PRESENCE_TTL", default=60, cast=int)  # type: ignore
+    PRESENCE_FLUSH_SECONDS: float = decouple.config("PRESENCE_FLUSH_SECONDS", default=1.0, cast=float)  # type: ignore
+    # Users written or swept per Redis script, which keeps every script call short
+    PRESENCE_BATCH_SIZE: int = decouple.config("PRESENCE_BATCH_SIZE", default=1000, cast=int)  # type: ignore
+    ROOM_MEMBERS_CACHE_TTL: int = decouple.config("ROOM_MEMBERS_CACHE_TTL", default=300, cast=int)  # type: ignore
+
+    # Read markers live in Redis and are written to Cassandra this often, coalescing every move in between
+    READ_FLUSH_SECONDS: float = decouple.config("READ_FLUSH_SECONDS", default=5.0, cast=float)  # type: ignore
+    READ_FLUSH_BATCH_SIZE: int = decouple.config("READ_FLUSH_BATCH_SIZE", default=1000, cast=int)  # type: ignore
+    READ_MARKER_CACHE_TTL: int = decouple.config("READ_MARKER_CACHE_TTL", default=86400, cast=int)  # type: ignore
+
+    # Rows per unlogged batch when adding or removing chatroom members in bulk
+    MEMBERS_BATCH_SIZE: int = decouple.config("MEMBERS_BATCH_SIZE", default=100, cast=int)  # type: ignore
+    # Writes to distinct partitions a single bulk operation keeps in flight
+    BULK_WRITE_CONCURRENCY: int = decouple.config("BULK_WRITE_CONCURRENCY", default=64, cast=int)  # type: ignore
+
+    # Messages a WebSocket may have queued for sending before it is dropped as a slow consumer
+    WEBSOCKET_OUTBOX_SIZE: int = decouple.config("WEBSOCKET_OUTBOX_SIZE", default=256, cast=int)  # type: ignore
+
     JWT_ALGORITHM: str = decouple.config("JWT_ALGORITHM", cast=str)  # type: ignore
     JWT_SECRET_KEY: str = decouple.config("JWT_SECRET_KEY", cast=str)  # type: ignore
     JWT_MIN: int = decouple.config("JWT_MIN", cast=int)  # type: ignore
     JWT_HOUR: int = decouple.config("JWT_HOUR", cast=int)  # type: ignore
     JWT_DAY: int = decouple.config("JWT_DAY", cast=int)  # type: ignore
     JWT_ACCESS_TOKEN_EXPIRATION_TIME: int = JWT_MIN * JWT_HOUR * JWT_DAY
+    # Verified tokens remembered per process, so repeat requests skip the signature check
+    JWT_CACHE_SIZE: int = decouple.config("JWT_CACHE_SIZE", default=10000, cast=int)  # type: ignore
 
     ALLOWED_ORIGINS: list[str] = ["*"]
     ALLOWED_METHODS: list[str] = ["*"]
@@ -54,6 +131,8 @@ class BackendBaseSettings(pydantic_settings.BaseSettings):
 
     HASHING_ALGORITHM_LAYER_1: str = decouple.config("HASHING_ALGORITHM_LAYER_1", cast=str)  # type: ignore
     HASHING_ALGORITHM_LAYER_2: str = decouple.config("HASHING_ALGORITHM_LAYER_2", cast=str)  # type: ignore
+    HASHING_POOL_SIZE: int = decouple.config("HASHING_POOL_SIZE", default=4, cast=int)  # type: ignore
+    HASHING_POOL_MAX_PENDING: int = decouple.config("HASHING_POOL_MAX_PENDING", default=64, cast=int)  # type: ignore
 
     class Config(pydantic.ConfigDict):
         case_sensitive: bool = True
@@ -1,34 +1,116 @@
-import time
+import asyncio
+import typing
 
 import fastapi
+import loguru
 import uvicorn
-from cassandra.cqlengine import management
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.endpoints import router as api_endpoint_router
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.routes.metrics import router as metrics_router
 
 # from src.config.events import (
 #     execute_backend_server_event_handler,
 #     terminate_backend_server_event_handler,
 # )
 from src.config.manager import settings
-from src.models.db.models import Message, User
 from src.repository.cache import cache
 from src.repository.database import database
+from src.repository.health import dependency_health
+from src.repository.ingestion import message_ingestion_buffer
+from src.repository.presence import presence_tracker
+from src.repository.pubsub import pubsub_hub
+from src.repository.read_markers import read_marker_store
+from src.repository.schema.migrator import schema_migrator
+from src.repository.search import message_search_indexer
+from src.repository.storage.engine import storage
+from src.securities.hashing.hash import hash_generator
+from src.utilities.backoff import retry_with_backoff
+
+
+async def initialize_dependency(name: str, initializer: typing.Callable[[], typing.Awaitable[None]]) -> None:
+    dependency_health.mark_starting(name)
+    try:
+        await retry_with_backoff(
+            initializer,
+            name=f"Startup ({name})",
+            attempts=settings.STARTUP_RETRIES,
+            base_delay=settings.STARTUP_BACKOFF_BASE,
+            max_delay=settings.STARTUP_BACKOFF_MAX,
+        )
+    except Exception as e:
+        dependency_health.mark_failed(name, error=e)
+        loguru.logger.error(f"Startup ({name}) -- Giving up after {settings.STARTUP_RETRIES} attempts: {e!r}")
+        return
+    dependency_health.mark_ready(name)
+
+
+async def initialize_cassandra() -> None:
+    # A retry after a failed schema check reuses the connection it already made
+    if database.session is None:
+        await database.connect()
+
+    # Migrations normally run once per deploy (`python -m src.commands.migrate upgrade`); workers only check them
+    if settings.SCHEMA_STARTUP_MODE == "migrate":
+        await schema_migrator.upgrade()
+    else:
+        await schema_migrator.check()
+
+    # Prepare the hot-path statements once the tables exist
+    await asyncio.to_thread(database.prepare_statements)
+
+
+async def initialize_storage() -> None:
+    # The in-memory engine has no cluster to reach and no schema to migrate
+    if settings.STORAGE_BACKEND == "cassandra":
+        await initialize_cassandra()
+    else:
+        await storage.connect()
+    message_ingestion_buffer.start()
+    message_search_indexer.start()
+    # Flushes are skipped until Redis is connected
+    read_marker_store.start()
+
+
+async def initialize_dependencies() -> None:
+    # Redis and the storage engine come up independently; neither waits on the other
+    await asyncio.gather(
+        initialize_dependency("redis", cache.initialize),
+        initialize_dependency(settings.STORAGE_BACKEND, initialize_storage),
+    )
 
 
 def initialize_backend_application() -> fastapi.FastAPI:
     app = fastapi.FastAPI(**settings.set_backend_app_attributes)  # type: ignore
 
     async def startup_event():
-        """Startup event handler to initialize connections."""
-        # Initialize Redis connection
-        await cache.initialize()
+        """
+        Startup event handler to initialize connections.
 
-        # Initialize Cassandra connection
-        database.connect()
+        Connections are made in the background so the server starts listening right away; `/health/ready`
+        reports when every dependency is usable.
+        """
+        app.state.startup_task = asyncio.create_task(initialize_dependencies())
+        # Flushes are skipped until Redis is connected
+        presence_tracker.start()
 
-        management.sync_table(User)
-        management.sync_table(Message)
+    async def shutdown_event():
+        """Shutdown event handler to release connections and worker pools."""
+        startup_task = getattr(app.state, "startup_task", None)
+        if startup_task and not startup_task.done():
+            startup_task.cancel()
+            await asyncio.gather(startup_task, return_exceptions=True)
+        await message_ingestion_buffer.close()
+        # After the buffer, so the messages it flushed last are indexed too
+        await message_search_indexer.close()
+        await hash_generator.shutdown()
+        # Presence entries of this worker's users are left to expire, as they may reconnect to another worker
+        await presence_tracker.close()
+        # Markers still dirty are written while Redis and storage are both up
+        await read_marker_store.close()
+        await pubsub_hub.close()
+        await cache.close()
+        storage.shutdown()
 
     app.add_middleware(
         CORSMiddleware,
@@ -37,13 +119,18 @@ def initialize_backend_application() -> fastapi.FastAPI:
         allow_headers=settings.ALLOWED_HEADERS,
     )
 
+    app.add_middleware(MetricsMiddleware)
+
     app.add_event_handler("startup", startup_event)
+    app.add_event_handler("shutdown", shutdown_event)
     # app.add_event_handler(
     #     "shutdown",
     #     terminate_backend_server_event_handler(backend_app=app),
     # )
 
     app.include_router(router=api_endpoint_router, prefix=settings.API_PREFIX)
+    # Scraped by Prometheus at the conventional path, outside the API prefix
+    app.include_router(router=metrics_router)
 
     return app
 
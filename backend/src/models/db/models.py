@@ -13,24 +13,32 @@ class BaseCassandraModel(Model):
     __connection__ = "default"
 
 
-# Message Model
+# Message Model, a room's messages are split into fixed time buckets so no partition grows without bound
 class Message(BaseCassandraModel):
-    chatroom_id = columns.UUID(primary_key=True, partition_key=True)  # Partition key
-    created_at = columns.DateTime(primary_key=True, default=datetime.now, clustering_order="DESC")
-    message_id = columns.UUID(default=lambda: uuid_from_time(datetime.now()))  # Clustering key for message
+    chatroom_id = columns.UUID(partition_key=True)  # Partition key
+    bucket = columns.Integer(partition_key=True)  # Partition key, time bucket derived from `message_id`
+    message_id = columns.TimeUUID(primary_key=True, clustering_order="DESC")  # Clustering key, newest first
 
-    # Clustering key for created_at
     message_text = columns.Text(required=True)
     user_id = columns.UUID(required=True)
+    created_at = columns.DateTime(required=True)
 
-    __table_name__ = "messages"
+    __table_name__ = "chatroom_messages"
+
+
+# Message bucket Model, indexes the buckets of a room that hold messages so history reads skip empty ones
+class MessageBucket(BaseCassandraModel):
+    chatroom_id = columns.UUID(partition_key=True)  # Partition key
+    bucket = columns.Integer(primary_key=True, clustering_order="DESC")  # Clustering key, newest first
+
+    __table_name__ = "chatroom_message_buckets"
 
 
 # User Model
 class User(BaseCassandraModel):
     user_id = columns.UUID(primary_key=True, default=lambda: uuid_from_time(datetime.now()))  # Partition by user ID
-    username = columns.Text(required=True, index=True)  # Keep username as a text field
-    email = columns.Text(required=True, index=True)
+    username = columns.Text(required=True)  # Looked up through `users_by_username`
+    email = columns.Text(required=True)  # Looked up through `users_by_email`
     hashed_password = columns.Text(required=True)
 
     __table_name__ = "users"  # Explicitly define table name
@@ -40,13 +48,48 @@ class User(BaseCassandraModel):
     }
 
 
+# Username lookup Model, the partition owning a username is the single source of truth for its uniqueness
+class UserByUsername(BaseCassandraModel):
+    username = columns.Text(primary_key=True)  # Partition by username
+    user_id = columns.UUID(required=True)
+    email = columns.Text(required=True)
+
+    __table_name__ = "users_by_username"
+
+
+# Email lookup Model, the partition owning an email is the single source of truth for its uniqueness
+class UserByEmail(BaseCassandraModel):
+    email = columns.Text(primary_key=True)  # Partition by email
+    user_id = columns.UUID(required=True)
+    username = columns.Text(required=True)
+
+    __table_name__ = "users_by_email"
+
+
 # Chatroom Model
 class Chatroom(BaseCassandraModel):
     chatroom_id = columns.UUID(
         primary_key=True, default=lambda: uuid_from_time(datetime.now())
     )  # Partition by chatroom ID
     chatroom_name = columns.Text(index=True)  # Index chatroom_name for efficient name-based searches
-    users = columns.Set(columns.UUID)  # Use a Set of UUIDs for users in the chatroom
     created_at = columns.DateTime(default=datetime.now)
 
     __table_name__ = "chatrooms"
+
+
+# Room membership Model, one row per member so membership checks and listings never read a whole collection
+class RoomMember(BaseCassandraModel):
+    chatroom_id = columns.UUID(partition_key=True)  # Partition by chatroom ID
+    user_id = columns.UUID(primary_key=True)  # Clustering key
+    joined_at = columns.DateTime(required=True)
+
+    __table_name__ = "room_members"
+
+
+# Reverse membership Model, answers "which rooms is this user in" from a single partition
+class RoomByUser(BaseCassandraModel):
+    user_id = columns.UUID(partition_key=True)  # Partition by user ID
+    chatroom_id = columns.UUID(primary_key=True)  # Clustering key
+    joined_at = columns.DateTime(required=True)
+
+    __table_name__ = "rooms_by_user"
@@ -1,4 +1,5 @@
 import datetime
+import typing
 from uuid import UUID
 
 import pydantic
@@ -43,3 +44,27 @@ class UserInResponse(BaseSchemaModel):
     user_id: UUID
     username: str
     email: str
+
+
+class UserPageInResponse(BaseSchemaModel):
+    users: list[UserInResponse]
+    next_cursor: str | None = None
+
+
+class UserBatchInLookup(BaseSchemaModel):
+    user_ids: list[UUID] = []
+    usernames: list[str] = []
+
+
+class UserBatchInResponse(BaseSchemaModel):
+    users: list[UserInResponse]
+    missing_user_ids: list[UUID] = []
+    missing_usernames: list[str] = []
+
+
+class AccountImportResult(BaseSchemaModel):
+    line: int
+    status: typing.Literal["created", "conflict", "invalid", "failed"]
+    username: str | None = None
+    user_id: UUID | None = None
+    detail: str | None = None
@@ -0,0 +1,19 @@
+import typing
+from uuid import UUID
+
+import pydantic
+from src.models.schemas.base import BaseSchemaModel
+from src.models.schemas.message import MESSAGE_TEXT_MAX_LENGTH, MessageInResponse
+
+
+class ChatClientEvent(BaseSchemaModel):
+    action: typing.Literal["subscribe", "unsubscribe", "post"]
+    chatroom_id: UUID
+    message_text: str | None = pydantic.Field(default=None, max_length=MESSAGE_TEXT_MAX_LENGTH)
+
+
+class ChatServerEvent(BaseSchemaModel):
+    type: typing.Literal["subscribed", "unsubscribed", "message", "error"]
+    chatroom_id: UUID | None = None
+    message: MessageInResponse | None = None
+    detail: str | None = None
@@ -0,0 +1,45 @@
+import datetime
+from uuid import UUID
+
+import pydantic
+from src.models.schemas.base import BaseSchemaModel
+
+
+class ChatroomInCreate(BaseSchemaModel):
+    chatroom_name: str
+    member_ids: list[UUID] = pydantic.Field(default_factory=list, max_length=1000)
+
+
+class ChatroomInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    chatroom_name: str | None
+    created_at: datetime.datetime
+
+
+class ChatroomMembersInUpdate(BaseSchemaModel):
+    user_ids: list[UUID] = pydantic.Field(min_length=1, max_length=1000)
+
+
+class RoomMemberInResponse(BaseSchemaModel):
+    user_id: UUID
+    joined_at: datetime.datetime
+
+
+class RoomMemberPageInResponse(BaseSchemaModel):
+    members: list[RoomMemberInResponse]
+    next_cursor: str | None = None
+
+
+class UserRoomInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    joined_at: datetime.datetime
+
+
+class UserRoomPageInResponse(BaseSchemaModel):
+    chatrooms: list[UserRoomInResponse]
+    next_cursor: str | None = None
+
+
+class RoomOnlineMembersInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    user_ids: list[UUID]
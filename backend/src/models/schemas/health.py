@@ -0,0 +1,13 @@
+import typing
+
+from src.models.schemas.base import BaseSchemaModel
+
+
+class DependencyStatusInResponse(BaseSchemaModel):
+    status: typing.Literal["starting", "ready", "failed"]
+    error: str | None = None
+
+
+class ReadinessInResponse(BaseSchemaModel):
+    status: typing.Literal["ready", "unavailable"]
+    dependencies: dict[str, DependencyStatusInResponse]
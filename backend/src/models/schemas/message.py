@@ -0,0 +1,56 @@
+import datetime
+from uuid import UUID
+
+import pydantic
+from src.models.schemas.base import BaseSchemaModel
+
+# Characters per message; at 4 bytes each at most, a message stays well within Cassandra's batch size limit
+MESSAGE_TEXT_MAX_LENGTH: int = 4000
+
+
+class MessageInCreate(BaseSchemaModel):
+    user_id: UUID
+    message_text: str = pydantic.Field(max_length=MESSAGE_TEXT_MAX_LENGTH)
+
+
+class MessageInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    message_id: UUID
+    user_id: UUID
+    message_text: str
+    created_at: datetime.datetime
+
+
+class MessagePageInResponse(BaseSchemaModel):
+    messages: list[MessageInResponse]
+    next_cursor: str | None = None
+
+
+class MessageReferenceInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    bucket: int
+    message_id: UUID
+    created_at: datetime.datetime
+
+
+class MessageSearchPageInResponse(BaseSchemaModel):
+    messages: list[MessageReferenceInResponse]
+    next_cursor: str | None = None
+
+
+class ReadMarkerInUpdate(BaseSchemaModel):
+    user_id: UUID
+    message_id: UUID
+
+
+class RoomUnreadInResponse(BaseSchemaModel):
+    chatroom_id: UUID
+    last_read_message_id: UUID | None
+    unread_count: int
+    # Only the newest messages of a room are counted; when capped the room has at least `unread_count` unread
+    is_capped: bool
+
+
+class UserUnreadInResponse(BaseSchemaModel):
+    user_id: UUID
+    chatrooms: list[RoomUnreadInResponse]
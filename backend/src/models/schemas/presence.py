@@ -0,0 +1,7 @@
+from uuid import UUID
+
+from src.models.schemas.base import BaseSchemaModel
+
+
+class PresenceInHeartbeat(BaseSchemaModel):
+    user_id: UUID
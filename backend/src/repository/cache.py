@@ -1,6 +1,24 @@
+import time
+import typing
+
+import loguru
 import redis.asyncio as Redis
+from redis.commands.core import AsyncScript
 from redis.exceptions import RedisError
 from src.config.manager import settings
+from src.utilities.metrics import metrics_registry
+
+# Stored in place of a value to remember that the underlying entity does not exist
+NEGATIVE_CACHE_ENTRY: str = "__missing__"
+# Member of a window scored above every entry, present once the window was filled from the database
+WINDOW_COMPLETE_ENTRY: str = "__complete__"
+
+redis_command_duration_seconds = metrics_registry.histogram(
+    "redis_command_duration_seconds", "Redis round-trip latency by cache operation.", ("command",)
+)
+redis_command_errors_total = metrics_registry.counter(
+    "redis_command_errors_total", "Failed Redis round trips by cache operation.", ("command",)
+)
 
 
 class RedisCache:
@@ -8,23 +26,221 @@ class RedisCache:
         """Initialize Redis connection attributes."""
         self.redis: Redis.Redis | None = None
         self.redis_uri: str = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
+        self.hits: int = 0
+        self.negative_hits: int = 0
+        self.misses: int = 0
+        self.errors: int = 0
+        # History windows are counted apart, so they do not skew the hit ratio of the read-through cache
+        self.window_hits: int = 0
+        self.window_misses: int = 0
+        self._scripts: dict[str, AsyncScript] = {}
 
     async def initialize(self) -> None:
         """Initialize Redis connection asynchronously."""
+        redis = Redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+        )
         try:
-            self.redis = Redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=True,
-                max_connections=settings.REDIS_MAX_CONNECTIONS,
-            )
-            # Test connection by pinging the server
-            await self.redis.ping()
+            # Test connection by pinging the server; callers only see a client that answered
+            await redis.ping()
         except RedisError as e:
             print(f"Failed to initialize Redis: {e}")
+            await redis.close()
             raise
+        self.redis = redis
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters of the read-through cache since startup; negative hits are included in hits."""
+        return {"hits": self.hits, "negative_hits": self.negative_hits, "misses": self.misses, "errors": self.errors}
+
+    @property
+    def window_stats(self) -> dict[str, int]:
+        """Hit/miss counters of the recent message windows since startup."""
+        return {"hits": self.window_hits, "misses": self.window_misses}
+
+    @property
+    def pool_usage(self) -> dict[str, int]:
+        """Connections of the Redis pool checked out by commands and idle in the pool."""
+        pool = self.redis.connection_pool if self.redis else None
+        if pool is None:
+            return {"in_use": 0, "available": 0}
+        return {"in_use": len(pool._in_use_connections), "available": len(pool._available_connections)}
+
+    def _record_error(self, command: str) -> None:
+        self.errors += 1
+        redis_command_errors_total.inc((command,))
+
+    async def get(self, key: str) -> str | None:
+        """
+        Read a cached value, treating an unavailable Redis as a miss so callers fall back to the database.
+        """
+        if not self.redis:
+            self.misses += 1
+            return None
+        started_at = time.perf_counter()
+        try:
+            value = await self.redis.get(key)
+        except RedisError as e:
+            self._record_error("GET")
+            loguru.logger.warning(f"Redis GET {key} failed, falling back to the database: {e}")
+            return None
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("GET",))
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if value == NEGATIVE_CACHE_ENTRY:
+                self.negative_hits += 1
+        return value
+
+    async def get_many(self, keys: typing.Sequence[str]) -> list[str | None]:
+        """
+        Read the cached values of `keys` in one MGET round trip, in order; like `get`, an unavailable Redis
+        answers every key with a miss.
+        """
+        if not self.redis or not keys:
+            self.misses += len(keys)
+            return [None] * len(keys)
+        started_at = time.perf_counter()
+        try:
+            values = await self.redis.mget(keys)
+        except RedisError as e:
+            self._record_error("MGET")
+            loguru.logger.warning(f"Redis MGET of {len(keys)} keys failed, falling back to the database: {e}")
+            return [None] * len(keys)
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("MGET",))
+
+        for value in values:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if value == NEGATIVE_CACHE_ENTRY:
+                    self.negative_hits += 1
+        return values
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Cache `value` under `key` for `ttl` seconds; failures are logged and ignored."""
+        if not self.redis:
+            return
+        started_at = time.perf_counter()
+        try:
+            await self.redis.set(key, value, ex=ttl)
+        except RedisError as e:
+            self._record_error("SET")
+            loguru.logger.warning(f"Redis SET {key} failed: {e}")
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("SET",))
+
+    async def set_many(self, values: typing.Mapping[str, str], ttl: int) -> None:
+        """Cache every `key: value` pair for `ttl` seconds in one pipelined round trip; failures are ignored."""
+        if not self.redis or not values:
+            return
+        started_at = time.perf_counter()
+        try:
+            async with self.redis.pipeline(transaction=False) as pipeline:
+                for key, value in values.items():
+                    pipeline.set(key, value, ex=ttl)
+                await pipeline.execute()
+        except RedisError as e:
+            self._record_error("SET_MANY")
+            loguru.logger.warning(f"Redis SET of {len(values)} keys failed: {e}")
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("SET_MANY",))
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop cached entries, positive or negative, for every key."""
+        if not self.redis or not keys:
+            return
+        started_at = time.perf_counter()
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as e:
+            self._record_error("DEL")
+            loguru.logger.error(f"Redis DEL {keys} failed, entries may stay stale until they expire: {e}")
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("DEL",))
+
+    async def push_to_window(
+        self, key: str, entries: dict[str, float], max_size: int, ttl: int, is_complete: bool = False
+    ) -> None:
+        """
+        Add scored `entries` to the sorted set `key`, keeping only the `max_size` highest scored ones.
+
+        Pushes to a window that was never filled are kept, so a concurrent refill merges them instead of
+        overwriting them, but the window is only read once `is_complete` marked it filled.
+        """
+        if is_complete:
+            entries = {**entries, WINDOW_COMPLETE_ENTRY: float("inf")}
+        if not self.redis or not entries:
+            return
+        started_at = time.perf_counter()
+        try:
+            async with self.redis.pipeline(transaction=True) as pipeline:
+                pipeline.zadd(key, entries)  # type: ignore
+                pipeline.zremrangebyrank(key, 0, -(max_size + 2))
+                pipeline.expire(key, ttl)
+                await pipeline.execute()
+        except RedisError as e:
+            self._record_error("WINDOW_PUSH")
+            loguru.logger.warning(f"Redis ZADD {key} failed: {e}")
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("WINDOW_PUSH",))
+
+    async def read_window(self, key: str, limit: int, before: float | None = None) -> tuple[list[str], int] | None:
+        """
+        Read up to `limit` entries of the window `key` scored below `before`, highest first, with the size of
+        the whole window; `None` when the window was never filled or Redis is unavailable.
+        """
+        if not self.redis:
+            self.window_misses += 1
+            return None
+        started_at = time.perf_counter()
+        try:
+            async with self.redis.pipeline(transaction=False) as pipeline:
+                pipeline.zscore(key, WINDOW_COMPLETE_ENTRY)
+                pipeline.zcard(key)
+                pipeline.zrevrangebyscore(key, f"({before}" if before is not None else "(inf", "-inf", 0, limit)
+                is_complete, window_size, entries = await pipeline.execute()
+        except RedisError as e:
+            self._record_error("WINDOW_READ")
+            loguru.logger.warning(f"Redis ZREVRANGEBYSCORE {key} failed, falling back to the database: {e}")
+            return None
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, ("WINDOW_READ",))
+
+        if is_complete is None:
+            self.window_misses += 1
+            return None
+        self.window_hits += 1
+        return entries, window_size - 1
+
+    async def run_script(
+        self, script: str, keys: typing.Sequence[str], arguments: typing.Sequence, command: str
+    ) -> typing.Any:
+        """
+        Run the Lua `script` on `keys`, timed under `command`; failures are raised for the caller to handle.
+
+        Scripts are sent by digest, their source only when Redis does not know it yet.
+        """
+        registered_script = self._scripts.get(script)
+        if registered_script is None or registered_script.registered_client is not self.redis:
+            registered_script = self._scripts[script] = self.redis.register_script(script)  # type: ignore
+
+        started_at = time.perf_counter()
+        try:
+            return await registered_script(keys=keys, args=[str(argument) for argument in arguments])
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, (command,))
 
     async def close(self) -> None:
         """Close Redis connection."""
@@ -37,3 +253,24 @@ class RedisCache:
 
 # Singleton instance of RedisCache
 cache: RedisCache = RedisCache()
+
+metrics_registry.gauge(
+    "redis_pool_connections",
+    "Connections of the Redis pool by state.",
+    ("state",),
+    callback=lambda: {(state,): count for state, count in cache.pool_usage.items()},
+)
+metrics_registry.gauge(
+    "cache_lookups_total",
+    "Read-through cache lookups by outcome; negative hits are also counted as hits.",
+    ("result",),
+    callback=lambda: {(result,): count for result, count in cache.stats.items()},
+    metric_type="counter",
+)
+metrics_registry.gauge(
+    "cache_window_lookups_total",
+    "Recent message window lookups by outcome.",
+    ("result",),
+    callback=lambda: {(result,): count for result, count in cache.window_stats.items()},
+    metric_type="counter",
+)
@@ -1,10 +1,221 @@
-from cassandra.cluster import Session as CassandraSession
+import asyncio
+import functools
+import time
+import typing
+
+from cassandra import InvalidRequest
+from cassandra.protocol import ProtocolException
 from redis.asyncio import Redis as RedisClient
-from src.repository.cache import RedisCache
-from src.repository.database import CassandraDatabase
+from src.repository.cache import NEGATIVE_CACHE_ENTRY, RedisCache
+from src.repository.storage.base import StorageEngine
+from src.utilities.exceptions.database import InvalidPaginationCursor
+from src.utilities.formatters.cursor_formatter import decode_paging_cursor, encode_paging_cursor
+from src.utilities.metrics import metrics_registry
+
+read_through_total = metrics_registry.counter(
+    "repository_read_through_total",
+    "Read-through cache lookups by key namespace and outcome.",
+    ("namespace", "result"),
+)
+read_through_load_duration_seconds = metrics_registry.histogram(
+    "repository_read_through_load_duration_seconds",
+    "Latency of loading a read-through cache miss from the database, by key namespace.",
+    ("namespace",),
+)
+coalesced_reads_total = metrics_registry.counter(
+    "repository_coalesced_reads_total",
+    "Reads answered by an identical read already in flight instead of a fetch of their own, by method.",
+    ("method",),
+)
+
+_ReadMethod = typing.TypeVar("_ReadMethod", bound=typing.Callable[..., typing.Awaitable[typing.Any]])
+
+# Coalesced reads in flight, by method, storage engine, cache and arguments
+_in_flight_reads: dict[typing.Hashable, asyncio.Task] = {}
+
+
+def coalesce_reads(method: _ReadMethod) -> _ReadMethod:
+    """
+    Make concurrent calls of a repository read with equal arguments share one call and its outcome.
+
+    `get_repository` hands every request the same instance of each repository, but commands, tests and other
+    repositories build their own, possibly over another storage engine or cache. Reads in flight are therefore
+    keyed by the storage engine and cache they go to rather than by instance, so they are shared wherever the
+    data is the same and never across engines. The first caller starts the read as a task; callers arriving
+    before it finishes await that task instead, getting its value or its exception, and are counted in
+    `coalesced_reads_total`. A caller being cancelled does not cancel the read for the others. Arguments must be
+    hashable, and callers must not mutate the shared result.
+    """
+    method_name = method.__qualname__
+
+    @functools.wraps(method)
+    async def _coalesced(self: "BaseCRUDRepository", *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        key = (method_name, id(self.storage), id(self.redis_cache), args, tuple(sorted(kwargs.items())))
+        read_task = _in_flight_reads.get(key)
+        if read_task is None:
+            read_task = _in_flight_reads[key] = asyncio.ensure_future(method(self, *args, **kwargs))
+            read_task.add_done_callback(functools.partial(_forget_read, key))
+        else:
+            coalesced_reads_total.inc((method_name,))
+        return await asyncio.shield(read_task)
+
+    return typing.cast(_ReadMethod, _coalesced)
+
+
+def _forget_read(key: typing.Hashable, read_task: asyncio.Task) -> None:
+    del _in_flight_reads[key]
+    # Retrieved here, so a failed read whose callers were all cancelled is not reported as never retrieved
+    if not read_task.cancelled():
+        read_task.exception()
 
 
 class BaseCRUDRepository:
-    def __init__(self, cassandra_db: CassandraDatabase, redis_cache: RedisCache):
-        self.db_session: CassandraSession = cassandra_db.session
+    def __init__(self, storage: StorageEngine, redis_cache: RedisCache):
+        self.storage: StorageEngine = storage
+        self.redis_cache: RedisCache = redis_cache
         self.cache_session: RedisClient = redis_cache.redis
+
+    async def _read_through(
+        self,
+        cache_key: str,
+        loader: typing.Callable[[], typing.Awaitable[str | None]],
+        ttl: int,
+        negative_ttl: int,
+    ) -> str | None:
+        """
+        Return the cached value of `cache_key`, loading and caching it on a miss.
+
+        A loader returning `None` is cached as a negative entry for `negative_ttl` seconds, so repeated
+        lookups of missing entities are answered by Redis as well.
+        """
+        # `user:id:<uuid>` is recorded under `user:id`, keeping one series per kind of key
+        namespace = cache_key.rpartition(":")[0]
+        cached_value = await self.redis_cache.get(cache_key)
+        if cached_value is not None:
+            is_negative = cached_value == NEGATIVE_CACHE_ENTRY
+            read_through_total.inc((namespace, "negative_hit" if is_negative else "hit"))
+            return None if is_negative else cached_value
+
+        read_through_total.inc((namespace, "miss"))
+        started_at = time.perf_counter()
+        value = await loader()
+        read_through_load_duration_seconds.observe(time.perf_counter() - started_at, (namespace,))
+        if value is None:
+            await self.redis_cache.set(cache_key, NEGATIVE_CACHE_ENTRY, ttl=negative_ttl)
+        else:
+            await self.redis_cache.set(cache_key, value, ttl=ttl)
+        return value
+
+    async def _read_many_through(
+        self,
+        loaders: typing.Mapping[str, typing.Callable[[], typing.Awaitable[str | None]]],
+        ttl: int,
+        negative_ttl: int,
+    ) -> dict[str, str | None]:
+        """
+        Batch counterpart of `_read_through`: return the value of every cache key of `loaders`.
+
+        Cached values are read with a single MGET; the loaders of the misses run concurrently and their values
+        are written back in one pipelined round trip per TTL, so a batch costs two Redis round trips at most
+        whatever its size, plus one database round trip of latency.
+        """
+        cache_keys = list(loaders)
+        values: dict[str, str | None] = {}
+        missing_keys: list[str] = []
+        for cache_key, cached_value in zip(cache_keys, await self.redis_cache.get_many(cache_keys)):
+            namespace = cache_key.rpartition(":")[0]
+            if cached_value is None:
+                read_through_total.inc((namespace, "miss"))
+                missing_keys.append(cache_key)
+                continue
+            is_negative = cached_value == NEGATIVE_CACHE_ENTRY
+            read_through_total.inc((namespace, "negative_hit" if is_negative else "hit"))
+            values[cache_key] = None if is_negative else cached_value
+
+        async def _load(cache_key: str) -> str | None:
+            started_at = time.perf_counter()
+            value = await loaders[cache_key]()
+            read_through_load_duration_seconds.observe(
+                time.perf_counter() - started_at, (cache_key.rpartition(":")[0],)
+            )
+            return value
+
+        loaded_values = await asyncio.gather(*(_load(cache_key) for cache_key in missing_keys))
+        loaded = dict(zip(missing_keys, loaded_values))
+        values.update(loaded)
+        await self.redis_cache.set_many(
+            {cache_key: value for cache_key, value in loaded.items() if value is not None}, ttl=ttl
+        )
+        await self.redis_cache.set_many(
+            {cache_key: NEGATIVE_CACHE_ENTRY for cache_key, value in loaded.items() if value is None}, ttl=negative_ttl
+        )
+        return values
+
+    async def _execute(
+        self,
+        statement_name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        consistency_level: int | None = None,
+    ) -> None:
+        """
+        Execute a prepared write statement asynchronously.
+        """
+        await self.storage.execute_prepared(statement_name, parameters, consistency_level=consistency_level)
+
+    async def _fetch_one(
+        self,
+        statement_name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        consistency_level: int | None = None,
+    ) -> dict[str, typing.Any] | None:
+        """
+        Execute a prepared statement asynchronously and return its first row, if any.
+        """
+        result = await self.storage.execute_prepared(statement_name, parameters, consistency_level=consistency_level)
+        return result.one()
+
+    async def _fetch_all(
+        self,
+        statement_name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Execute a prepared statement asynchronously and collect the rows of every page.
+        """
+        rows: list[dict[str, typing.Any]] = []
+        async for page in self.storage.iterate_prepared_pages(
+            statement_name, parameters, fetch_size=fetch_size, consistency_level=consistency_level
+        ):
+            rows.extend(page)
+        return rows
+
+    async def _fetch_page(
+        self,
+        statement_name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        consistency_level: int | None = None,
+    ) -> tuple[list[dict[str, typing.Any]], str | None]:
+        """
+        Fetch one page of a prepared statement, resuming from an opaque cursor of the driver's paging state.
+        """
+        try:
+            paging_state = decode_paging_cursor(cursor)
+            result = await self.storage.execute_prepared(
+                statement_name,
+                parameters,
+                paging_state=paging_state,
+                fetch_size=limit,
+                consistency_level=consistency_level,
+            )
+        except ValueError as decode_error:
+            raise InvalidPaginationCursor(str(decode_error)) from decode_error
+        except (InvalidRequest, ProtocolException) as paging_error:
+            if cursor is None:
+                raise
+            raise InvalidPaginationCursor(f"Pagination cursor `{cursor}` was rejected!") from paging_error
+
+        return result.current_rows, encode_paging_cursor(result.paging_state)
@@ -0,0 +1,155 @@
+import asyncio
+import typing
+from datetime import datetime
+from uuid import UUID
+
+import pydantic
+from cassandra.util import uuid_from_time
+from src.config.manager import settings
+from src.models.schemas.chatroom import (
+    ChatroomInCreate,
+    ChatroomInResponse,
+    RoomMemberInResponse,
+    RoomMemberPageInResponse,
+    RoomOnlineMembersInResponse,
+    UserRoomInResponse,
+    UserRoomPageInResponse,
+)
+from src.repository.crud.base import BaseCRUDRepository, coalesce_reads
+from src.repository.presence import presence_tracker, room_members_cache_key, room_members_version_key
+from src.utilities.exceptions.database import EntityDoesNotExist
+
+# Both build every entry of a page from its row in a single pydantic-core call
+_ROOM_MEMBER_LIST_ADAPTER: pydantic.TypeAdapter[list[RoomMemberInResponse]] = pydantic.TypeAdapter(
+    list[RoomMemberInResponse]
+)
+_USER_ROOM_LIST_ADAPTER: pydantic.TypeAdapter[list[UserRoomInResponse]] = pydantic.TypeAdapter(
+    list[UserRoomInResponse]
+)
+
+
+class ChatroomCRUDRepository(BaseCRUDRepository):
+    async def create_chatroom(self, chatroom_create: ChatroomInCreate) -> ChatroomInResponse:
+        chatroom_id = uuid_from_time(datetime.now())
+        created_at = datetime.now()
+
+        await self._execute("chatroom.insert", (chatroom_id, chatroom_create.chatroom_name, created_at))
+        if chatroom_create.member_ids:
+            await self.add_members(chatroom_id=chatroom_id, user_ids=chatroom_create.member_ids)
+
+        return ChatroomInResponse(
+            chatroom_id=chatroom_id, chatroom_name=chatroom_create.chatroom_name, created_at=created_at
+        )
+
+    @coalesce_reads
+    async def read_chatroom_by_id(self, chatroom_id: UUID) -> ChatroomInResponse:
+        chatroom = await self._fetch_one("chatroom.select_by_id", (chatroom_id,))
+
+        if not chatroom:
+            raise EntityDoesNotExist(f"Chatroom with id `{chatroom_id}` does not exist!")
+
+        return ChatroomInResponse(
+            chatroom_id=chatroom["chatroom_id"],
+            chatroom_name=chatroom["chatroom_name"],
+            created_at=chatroom["created_at"],
+        )
+
+    async def add_members(self, chatroom_id: UUID, user_ids: list[UUID]) -> None:
+        joined_at = datetime.now()
+        await self._write_memberships(
+            chatroom_id=chatroom_id,
+            user_ids=user_ids,
+            room_statement_name="room_member.insert",
+            room_parameters=lambda user_id: (chatroom_id, user_id, joined_at),
+            user_statement_name="room_by_user.insert",
+            user_parameters=lambda user_id: (user_id, chatroom_id, joined_at),
+        )
+
+    async def remove_members(self, chatroom_id: UUID, user_ids: list[UUID]) -> None:
+        await self._write_memberships(
+            chatroom_id=chatroom_id,
+            user_ids=user_ids,
+            room_statement_name="room_member.delete",
+            room_parameters=lambda user_id: (chatroom_id, user_id),
+            user_statement_name="room_by_user.delete",
+            user_parameters=lambda user_id: (user_id, chatroom_id),
+        )
+
+    async def _write_memberships(
+        self,
+        chatroom_id: UUID,
+        user_ids: list[UUID],
+        room_statement_name: str,
+        room_parameters: typing.Callable[[UUID], tuple],
+        user_statement_name: str,
+        user_parameters: typing.Callable[[UUID], tuple],
+    ) -> None:
+        unique_user_ids = list(dict.fromkeys(user_ids))
+        user_id_chunks = [
+            unique_user_ids[start : start + settings.MEMBERS_BATCH_SIZE]
+            for start in range(0, len(unique_user_ids), settings.MEMBERS_BATCH_SIZE)
+        ]
+
+        # `room_members` rows share the room partition, so they go out as unlogged batches of that partition;
+        # `rooms_by_user` rows each live in their own partition, so they are written concurrently instead
+        await asyncio.gather(
+            *(
+                self.storage.execute_prepared_batch(
+                    room_statement_name, [room_parameters(user_id) for user_id in chunk]
+                )
+                for chunk in user_id_chunks
+            ),
+            self.storage.execute_prepared_concurrent(
+                ((user_statement_name, user_parameters(user_id)) for user_id in unique_user_ids),
+                concurrency=settings.BULK_WRITE_CONCURRENCY,
+            ),
+        )
+        await presence_tracker.invalidate_members(
+            room_members_cache_key(chatroom_id), room_members_version_key(chatroom_id)
+        )
+
+    async def is_member(self, chatroom_id: UUID, user_id: UUID) -> bool:
+        return await self._fetch_one("room_member.select", (chatroom_id, user_id)) is not None
+
+    async def read_members_page(
+        self, chatroom_id: UUID, limit: int, cursor: str | None = None
+    ) -> RoomMemberPageInResponse:
+        members, next_cursor = await self._fetch_page(
+            "room_member.select_all", (chatroom_id,), limit=limit, cursor=cursor
+        )
+
+        return RoomMemberPageInResponse(
+            members=_ROOM_MEMBER_LIST_ADAPTER.validate_python(members), next_cursor=next_cursor
+        )
+
+    @coalesce_reads
+    async def read_online_members(self, chatroom_id: UUID) -> RoomOnlineMembersInResponse:
+        """
+        Return the room's online members by intersecting its membership, cached in Redis, with the online set.
+
+        The membership is read from storage once per `ROOM_MEMBERS_CACHE_TTL`, or after it changed; presence
+        itself never touches storage.
+        """
+        members_key = room_members_cache_key(chatroom_id)
+        online_user_ids = await presence_tracker.read_online_members(members_key)
+        if online_user_ids is None:
+            version_key = room_members_version_key(chatroom_id)
+            # Read before the membership, so a change landing in between keeps this fill out of the cache
+            members_version = await presence_tracker.read_members_version(version_key)
+            members = await self._fetch_all("room_member.select_all", (chatroom_id,))
+            online_user_ids = await presence_tracker.fill_online_members(
+                members_key, version_key, members_version, (member["user_id"] for member in members)
+            )
+
+        return RoomOnlineMembersInResponse(chatroom_id=chatroom_id, user_ids=online_user_ids)
+
+    async def read_user_chatrooms_page(
+        self, user_id: UUID, limit: int, cursor: str | None = None
+    ) -> UserRoomPageInResponse:
+        chatrooms, next_cursor = await self._fetch_page(
+            "room_by_user.select_all", (user_id,), limit=limit, cursor=cursor
+        )
+
+        return UserRoomPageInResponse(
+            chatrooms=_USER_ROOM_LIST_ADAPTER.validate_python(chatrooms), next_cursor=next_cursor
+        )
@@ -0,0 +1,405 @@
+import asyncio
+import time
+from uuid import UUID
+
+import pydantic
+from cassandra import ConsistencyLevel
+from cassandra.util import datetime_from_uuid1, max_uuid_from_time, unix_time_from_uuid1, uuid_from_time
+from src.config.manager import settings
+from src.models.schemas.message import (
+    MessageInCreate,
+    MessageInResponse,
+    MessagePageInResponse,
+    MessageReferenceInResponse,
+    MessageSearchPageInResponse,
+    ReadMarkerInUpdate,
+    RoomUnreadInResponse,
+    UserUnreadInResponse,
+)
+from src.repository.crud.base import BaseCRUDRepository, coalesce_reads
+from src.repository.ingestion import PendingMessage, message_ingestion_buffer
+from src.repository.read_markers import read_marker_store
+from src.repository.search import tokenize_message_text
+from src.utilities.exceptions.database import InvalidPaginationCursor
+from src.utilities.formatters.cursor_formatter import decode_history_cursor, encode_history_cursor
+
+
+# 100ns intervals between the UUIDv1 epoch (1582-10-15) and the Unix epoch
+_UUID1_UNIX_EPOCH_OFFSET: int = 0x01B21DD213814000
+
+# Builds every message of a page from its row, or its cached JSON, in a single pydantic-core call
+_MESSAGE_LIST_ADAPTER: pydantic.TypeAdapter[list[MessageInResponse]] = pydantic.TypeAdapter(list[MessageInResponse])
+
+
+def compute_message_bucket(message_id: UUID) -> int:
+    """
+    Return the time bucket of a message, i.e. the index of the `MESSAGE_BUCKET_SECONDS` window it was sent in.
+    """
+    return int(unix_time_from_uuid1(message_id) // settings.MESSAGE_BUCKET_SECONDS)
+
+
+def compute_message_score(message_id: UUID) -> int:
+    """
+    Return the microseconds since the Unix epoch encoded in a message id, which orders messages in Redis the
+    way their clustering key orders them in Cassandra while staying exact as a sorted set score.
+    """
+    return (message_id.time - _UUID1_UNIX_EPOCH_OFFSET) // 10
+
+
+def recent_messages_cache_key(chatroom_id: UUID) -> str:
+    return f"chatroom:recent:{chatroom_id}"
+
+
+class MessageCRUDRepository(BaseCRUDRepository):
+    async def create_message(self, chatroom_id: UUID, message_create: MessageInCreate) -> MessageInResponse:
+        message_id = uuid_from_time(time.time())
+        bucket = compute_message_bucket(message_id)
+        # Cassandra stores timestamps with millisecond precision, so the cached copy has to match the stored one
+        created_at = datetime_from_uuid1(message_id)
+        new_message = MessageInResponse(
+            chatroom_id=chatroom_id,
+            message_id=message_id,
+            user_id=message_create.user_id,
+            message_text=message_create.message_text,
+            created_at=created_at.replace(microsecond=created_at.microsecond // 1000 * 1000),
+        )
+
+        await message_ingestion_buffer.submit(
+            PendingMessage(
+                chatroom_id=chatroom_id,
+                bucket=bucket,
+                message_id=message_id,
+                message_text=new_message.message_text,
+                user_id=new_message.user_id,
+                created_at=new_message.created_at,
+            )
+        )
+        await self._cache_recent_messages(chatroom_id=chatroom_id, messages=[new_message])
+
+        return new_message
+
+    @coalesce_reads
+    async def read_message_history(
+        self, chatroom_id: UUID, limit: int, cursor: str | None = None
+    ) -> MessagePageInResponse:
+        """
+        Read a room's messages newest-first, from the cursor position if given.
+
+        Pages within the newest `RECENT_CACHE_SIZE` messages are served from Redis alone; Cassandra is
+        only read for pages past that window, or to refill the window after it expired.
+        """
+        bucket: int | None = None
+        before_message_id: UUID | None = None
+        if cursor:
+            try:
+                bucket, before_message_id = decode_history_cursor(cursor)
+            except ValueError as decode_error:
+                raise InvalidPaginationCursor(str(decode_error)) from decode_error
+
+        recent_messages = await self.redis_cache.read_window(
+            key=recent_messages_cache_key(chatroom_id),
+            limit=limit,
+            before=compute_message_score(before_message_id) if before_message_id else None,
+        )
+        if recent_messages is not None:
+            cached_messages, window_size = recent_messages
+            # A short page is only final when the window holds the room's whole history
+            if len(cached_messages) >= limit or window_size < settings.RECENT_CACHE_SIZE:
+                return self._build_message_page(
+                    messages=_MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(cached_messages)}]"),
+                    limit=limit,
+                )
+
+        if cursor:
+            messages = await self._select_message_history(
+                chatroom_id=chatroom_id, limit=limit, bucket=bucket, before_message_id=before_message_id
+            )
+            return self._build_message_page(messages=messages, limit=limit)
+
+        messages = await self._select_message_history(
+            chatroom_id=chatroom_id, limit=max(limit, settings.RECENT_CACHE_SIZE)
+        )
+        if recent_messages is None:
+            await self._cache_recent_messages(
+                chatroom_id=chatroom_id, messages=messages[: settings.RECENT_CACHE_SIZE], is_complete=True
+            )
+        return self._build_message_page(messages=messages[:limit], limit=limit)
+
+    async def search_messages(
+        self, chatroom_id: UUID, query: str, limit: int, cursor: str | None = None
+    ) -> MessageSearchPageInResponse:
+        """
+        Find a room's messages holding every term of `query`, newest first, reading the search index only.
+
+        The postings of the longest term, usually the rarest, are walked bucket by bucket, newest first, and each
+        page of them is intersected with the postings of the other terms through one `IN` read per term. A
+        request stops after `SEARCH_SCAN_MAX_POSTINGS` postings or `SEARCH_SCAN_MAX_BUCKETS` buckets, so a page
+        can come back short with a cursor to go on from.
+        """
+        terms = tokenize_message_text(query, settings.SEARCH_QUERY_MAX_TERMS)
+        if not terms:
+            return MessageSearchPageInResponse(messages=[])
+        driving_term = max(terms, key=len)
+        other_terms = [term for term in terms if term != driving_term]
+
+        bucket: int | None = None
+        before_message_id: UUID | None = None
+        if cursor:
+            try:
+                bucket, before_message_id = decode_history_cursor(cursor)
+            except ValueError as decode_error:
+                raise InvalidPaginationCursor(str(decode_error)) from decode_error
+        else:
+            latest_bucket = await self._fetch_one(
+                "message_bucket.select_latest", (chatroom_id,), consistency_level=ConsistencyLevel.LOCAL_ONE
+            )
+            bucket = latest_bucket["bucket"] if latest_bucket else None
+
+        hits: list[tuple[int, UUID]] = []
+        scanned_postings = scanned_buckets = 0
+        while bucket is not None and scanned_buckets < settings.SEARCH_SCAN_MAX_BUCKETS:
+            scanned_buckets += 1
+            is_bucket_exhausted = False
+            while not is_bucket_exhausted and scanned_postings < settings.SEARCH_SCAN_MAX_POSTINGS:
+                fetch_size = min(settings.SEARCH_FETCH_SIZE, settings.SEARCH_SCAN_MAX_POSTINGS - scanned_postings)
+                message_ids = await self._select_postings(
+                    chatroom_id=chatroom_id,
+                    term=driving_term,
+                    bucket=bucket,
+                    before_message_id=before_message_id,
+                    limit=fetch_size,
+                )
+                scanned_postings += len(message_ids)
+                is_bucket_exhausted = len(message_ids) < fetch_size
+                before_message_id = message_ids[-1] if message_ids else before_message_id
+
+                matching_ids = await self._filter_postings(
+                    chatroom_id=chatroom_id, terms=other_terms, bucket=bucket, message_ids=message_ids
+                )
+                remaining = limit - len(hits)
+                hits.extend((bucket, message_id) for message_id in matching_ids[:remaining])
+                if len(matching_ids) >= remaining:
+                    return self._build_search_page(
+                        chatroom_id=chatroom_id, hits=hits, next_cursor=encode_history_cursor(*hits[-1])
+                    )
+
+            if not is_bucket_exhausted:
+                break
+            previous_bucket = await self._fetch_one(
+                "message_bucket.select_before", (chatroom_id, bucket), consistency_level=ConsistencyLevel.LOCAL_ONE
+            )
+            bucket = previous_bucket["bucket"] if previous_bucket else None
+            before_message_id = None
+
+        if bucket is None:
+            return self._build_search_page(chatroom_id=chatroom_id, hits=hits, next_cursor=None)
+
+        # The scan budget ran out: go on from where it stopped, or from the top of a bucket not read yet
+        resume_from = before_message_id or max_uuid_from_time((bucket + 1) * settings.MESSAGE_BUCKET_SECONDS)
+        return self._build_search_page(
+            chatroom_id=chatroom_id, hits=hits, next_cursor=encode_history_cursor(bucket, resume_from)
+        )
+
+    async def _select_postings(
+        self, chatroom_id: UUID, term: str, bucket: int, before_message_id: UUID | None, limit: int
+    ) -> list[UUID]:
+        if before_message_id:
+            result = await self.storage.execute_prepared(
+                "message_search.select_before",
+                (chatroom_id, term, bucket, before_message_id, limit),
+                consistency_level=ConsistencyLevel.LOCAL_ONE,
+            )
+        else:
+            result = await self.storage.execute_prepared(
+                "message_search.select_latest",
+                (chatroom_id, term, bucket, limit),
+                consistency_level=ConsistencyLevel.LOCAL_ONE,
+            )
+        return [row["message_id"] for row in result.current_rows]
+
+    async def _filter_postings(
+        self, chatroom_id: UUID, terms: list[str], bucket: int, message_ids: list[UUID]
+    ) -> list[UUID]:
+        """Keep the `message_ids` posted under every one of `terms`, in their order."""
+        if not terms or not message_ids:
+            return message_ids
+
+        results = await asyncio.gather(
+            *(
+                self.storage.execute_prepared(
+                    "message_search.select_matching",
+                    (chatroom_id, term, bucket, message_ids),
+                    consistency_level=ConsistencyLevel.LOCAL_ONE,
+                )
+                for term in terms
+            )
+        )
+        matching_ids = set.intersection(*({row["message_id"] for row in result.current_rows} for result in results))
+        return [message_id for message_id in message_ids if message_id in matching_ids]
+
+    @staticmethod
+    def _build_search_page(
+        chatroom_id: UUID, hits: list[tuple[int, UUID]], next_cursor: str | None
+    ) -> MessageSearchPageInResponse:
+        references = []
+        for bucket, message_id in hits:
+            created_at = datetime_from_uuid1(message_id)
+            references.append(
+                MessageReferenceInResponse(
+                    chatroom_id=chatroom_id,
+                    bucket=bucket,
+                    message_id=message_id,
+                    created_at=created_at.replace(microsecond=created_at.microsecond // 1000 * 1000),
+                )
+            )
+
+        return MessageSearchPageInResponse(messages=references, next_cursor=next_cursor)
+
+    async def mark_read(self, chatroom_id: UUID, read_marker_update: ReadMarkerInUpdate) -> None:
+        """Move the user's last-read position in the room up to the message, if it is not past it already."""
+        message_id = read_marker_update.message_id
+        score = compute_message_score(message_id)
+        if not await read_marker_store.advance(
+            user_id=read_marker_update.user_id, chatroom_id=chatroom_id, message_id=message_id, score=score
+        ):
+            await self._execute("read_marker.upsert", (read_marker_update.user_id, chatroom_id, message_id, score))
+
+    async def read_unread_counts(self, user_id: UUID) -> UserUnreadInResponse:
+        """
+        Return the last-read position and unread count of every room of the user.
+
+        Markers and the recent windows of the rooms are read from Redis in one script call; unread messages
+        are counted in those windows, so a count stops at `RECENT_CACHE_SIZE`. Cassandra is only read for the
+        user's rooms, to load the markers once their cache expired and to refill windows that are not filled.
+        """
+        chatroom_ids = [row["chatroom_id"] for row in await self._fetch_all("room_by_user.select_all", (user_id,))]
+        window_keys = [recent_messages_cache_key(chatroom_id) for chatroom_id in chatroom_ids]
+
+        cached_positions = await read_marker_store.read_unread_counts(
+            user_id=user_id, chatroom_ids=chatroom_ids, window_keys=window_keys
+        )
+        if cached_positions is not None and not cached_positions[0]:
+            stored_markers = await self._select_read_markers(user_id=user_id)
+            await read_marker_store.load(
+                user_id=user_id,
+                markers=(
+                    (chatroom_id, message_id, compute_message_score(message_id))
+                    for chatroom_id, message_id in stored_markers.items()
+                ),
+            )
+            cached_positions = await read_marker_store.read_unread_counts(
+                user_id=user_id, chatroom_ids=chatroom_ids, window_keys=window_keys
+            )
+
+        if cached_positions is not None and cached_positions[0]:
+            positions = cached_positions[1]
+        else:
+            # Without Redis the stored markers are used as they are, and every room is counted from Cassandra
+            stored_markers = await self._select_read_markers(user_id=user_id)
+            positions = [(stored_markers.get(chatroom_id), None) for chatroom_id in chatroom_ids]
+
+        unfilled_indexes = [index for index, (_, unread_count) in enumerate(positions) if unread_count is None]
+        refilled_counts = await asyncio.gather(
+            *(
+                self._count_unread(chatroom_id=chatroom_ids[index], last_read_message_id=positions[index][0])
+                for index in unfilled_indexes
+            )
+        )
+        refilled = dict(zip(unfilled_indexes, refilled_counts))
+        unread_counts: list[int] = [
+            refilled[index] if unread_count is None else unread_count
+            for index, (_, unread_count) in enumerate(positions)
+        ]
+
+        return UserUnreadInResponse(
+            user_id=user_id,
+            chatrooms=[
+                RoomUnreadInResponse(
+                    chatroom_id=chatroom_id,
+                    last_read_message_id=last_read_message_id,
+                    unread_count=unread_count,
+                    is_capped=unread_count >= settings.RECENT_CACHE_SIZE,
+                )
+                for chatroom_id, (last_read_message_id, _), unread_count in zip(chatroom_ids, positions, unread_counts)
+            ],
+        )
+
+    async def _select_read_markers(self, user_id: UUID) -> dict[UUID, UUID]:
+        rows = await self._fetch_all("read_marker.select_all", (user_id,))
+        return {row["chatroom_id"]: row["message_id"] for row in rows}
+
+    async def _count_unread(self, chatroom_id: UUID, last_read_message_id: UUID | None) -> int:
+        """Count the unread messages of a room whose window is not filled, refilling the window on the way."""
+        messages = await self._select_message_history(chatroom_id=chatroom_id, limit=settings.RECENT_CACHE_SIZE)
+        await self._cache_recent_messages(chatroom_id=chatroom_id, messages=messages, is_complete=True)
+        if last_read_message_id is None:
+            return len(messages)
+
+        last_read_score = compute_message_score(last_read_message_id)
+        return sum(compute_message_score(message.message_id) > last_read_score for message in messages)
+
+    async def _select_message_history(
+        self, chatroom_id: UUID, limit: int, bucket: int | None = None, before_message_id: UUID | None = None
+    ) -> list[MessageInResponse]:
+        """
+        Read up to `limit` messages newest-first from Cassandra, walking the room's non-empty buckets.
+
+        Without a starting bucket the walk begins at the room's latest one, so the most recent messages are one
+        read of the bucket index plus one partition read, however old the room is.
+        """
+        # History is append-only and re-read constantly, so one local replica is enough for every read of it
+        if bucket is None:
+            latest_bucket = await self._fetch_one(
+                "message_bucket.select_latest", (chatroom_id,), consistency_level=ConsistencyLevel.LOCAL_ONE
+            )
+            bucket = latest_bucket["bucket"] if latest_bucket else None
+
+        rows: list[dict] = []
+        while bucket is not None:
+            remaining = limit - len(rows)
+            if before_message_id:
+                result = await self.storage.execute_prepared(
+                    "message.select_before",
+                    (chatroom_id, bucket, before_message_id, remaining),
+                    consistency_level=ConsistencyLevel.LOCAL_ONE,
+                )
+            else:
+                result = await self.storage.execute_prepared(
+                    "message.select_latest",
+                    (chatroom_id, bucket, remaining),
+                    consistency_level=ConsistencyLevel.LOCAL_ONE,
+                )
+
+            rows.extend(result.current_rows)
+            if len(rows) >= limit:
+                break
+
+            previous_bucket = await self._fetch_one(
+                "message_bucket.select_before", (chatroom_id, bucket), consistency_level=ConsistencyLevel.LOCAL_ONE
+            )
+            bucket = previous_bucket["bucket"] if previous_bucket else None
+            before_message_id = None
+
+        return _MESSAGE_LIST_ADAPTER.validate_python(rows)
+
+    async def _cache_recent_messages(
+        self, chatroom_id: UUID, messages: list[MessageInResponse], is_complete: bool = False
+    ) -> None:
+        await self.redis_cache.push_to_window(
+            key=recent_messages_cache_key(chatroom_id),
+            entries={message.model_dump_json(): compute_message_score(message.message_id) for message in messages},
+            max_size=settings.RECENT_CACHE_SIZE,
+            ttl=settings.RECENT_CACHE_TTL,
+            is_complete=is_complete,
+        )
+
+    @staticmethod
+    def _build_message_page(messages: list[MessageInResponse], limit: int) -> MessagePageInResponse:
+        last_message_id = messages[-1].message_id if messages else None
+        next_cursor = (
+            encode_history_cursor(bucket=compute_message_bucket(last_message_id), message_id=last_message_id)
+            if last_message_id and len(messages) >= limit
+            else None
+        )
+
+        return MessagePageInResponse(messages=messages, next_cursor=next_cursor)
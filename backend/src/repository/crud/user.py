@@ -1,88 +1,285 @@
 import asyncio
+import functools
 import typing
+from datetime import datetime
 from typing import List
+from uuid import UUID
 
-from src.models.db.models import User
+import loguru
+import pydantic
+from cassandra import ConsistencyLevel
+from cassandra.util import uuid_from_time
+from src.config.manager import settings
 from src.models.schemas.account import (
+    AccountImportResult,
     AccountInCreate,
     AccountInLogin,
     AccountInUpdate,
+    UserBatchInResponse,
     UserInResponse,
+    UserPageInResponse,
 )
-from src.repository.crud.base import BaseCRUDRepository
+from src.repository.crud.base import BaseCRUDRepository, coalesce_reads
 from src.securities.hashing.password import pwd_generator
 from src.securities.verifications.credentials import credential_verifier
 from src.utilities.exceptions.database import EntityAlreadyExists, EntityDoesNotExist
 from src.utilities.exceptions.password import PasswordDoesNotMatch
 
+# Builds every user of a page from its row in a single pydantic-core call; surplus columns are ignored
+_USER_LIST_ADAPTER: pydantic.TypeAdapter[list[UserInResponse]] = pydantic.TypeAdapter(list[UserInResponse])
+
 
 class UserCRUDRepository(BaseCRUDRepository):
     async def create_user(self, user_create: AccountInCreate) -> UserInResponse:
-        loop = asyncio.get_event_loop()
-
-        # Check if user with same username or email already exists
-        existing_user = await loop.run_in_executor(
-            None, lambda: User.objects.filter(username=user_create.username).first()
-        )
+        # Fail fast on taken credentials before paying for the password hash; both reads hit a single partition
+        existing_user = await self._fetch_one("user.select_by_username", (user_create.username,))
         if existing_user:
             raise EntityAlreadyExists(f"User with username '{user_create.username}' already exists.")
 
-        existing_email = await loop.run_in_executor(None, lambda: User.objects.filter(email=user_create.email).first())
+        existing_email = await self._fetch_one("user.select_by_email", (user_create.email,))
         if existing_email:
             raise EntityAlreadyExists(f"User with email '{user_create.email}' already exists.")
 
         # Hash the password
-        hashed_password = pwd_generator.generate_hashed_password(new_password=user_create.password)
-
-        # Create the new user object
-        new_account = User.create(
-            username=user_create.username, email=user_create.email, hashed_password=hashed_password
+        hashed_password = await pwd_generator.generate_hashed_password_async(new_password=user_create.password)
+
+        return await self._register_user(user_create=user_create, hashed_password=hashed_password)
+
+    async def _register_user(self, user_create: AccountInCreate, hashed_password: str) -> UserInResponse:
+        # Claim the username and the email with lightweight transactions, so concurrent signups cannot both win
+        user_id = uuid_from_time(datetime.now())
+        await self._claim_credentials(user_id=user_id, username=user_create.username, email=user_create.email)
+
+        try:
+            await self._execute(
+                "user.insert",
+                (user_id, user_create.username, user_create.email, hashed_password),
+                consistency_level=ConsistencyLevel.LOCAL_QUORUM,
+            )
+        except Exception:
+            await self._release_credentials(user_id=user_id, username=user_create.username, email=user_create.email)
+            raise
+
+        # Drop negative entries left by lookups of the now taken username/email
+        await self._invalidate_user_cache(
+            user_id=user_id, usernames=(user_create.username,), emails=(user_create.email,)
         )
 
         # Return Pydantic model
-        return UserInResponse(
-            user_id=new_account["user_id"], username=new_account["username"], email=new_account["email"]
+        return UserInResponse(user_id=user_id, username=user_create.username, email=user_create.email)
+
+    async def import_users(
+        self, accounts: typing.Iterable[tuple[int, AccountInCreate | ValueError]]
+    ) -> typing.AsyncIterator[AccountImportResult]:
+        """
+        Create every account of a stream, yielding one result per row as soon as the row is settled.
+
+        Up to `BULK_WRITE_CONCURRENCY` rows are in flight or waiting to be consumed at once, and at most
+        `HASHING_POOL_SIZE` of them hash at a time, which keeps every hashing thread busy without filling the pool's
+        queue for regular signups. Rows skip the lookups of `create_user`: the username and email claims alone
+        detect duplicates, including duplicates within the stream. Unparsable, conflicting or failing rows are
+        reported and the import goes on. Results come in completion order, so each carries its line number.
+        """
+        results: asyncio.Queue[AccountImportResult | None] = asyncio.Queue()
+        rows_in_flight = asyncio.Semaphore(settings.BULK_WRITE_CONCURRENCY)
+        hashing_slots = asyncio.Semaphore(settings.HASHING_POOL_SIZE)
+
+        async def _import_row(line: int, account: AccountInCreate) -> None:
+            results.put_nowait(await self._import_user(line=line, account=account, hashing_slots=hashing_slots))
+
+        async def _feed_rows() -> None:
+            try:
+                async with asyncio.TaskGroup() as row_tasks:
+                    for line, account in accounts:
+                        # A row holds its slot until its result is consumed, so reading the stream pauses for a
+                        # slow consumer as well as for slow rows, and memory stays bounded
+                        await rows_in_flight.acquire()
+                        if isinstance(account, ValueError):
+                            results.put_nowait(AccountImportResult(line=line, status="invalid", detail=str(account)))
+                            continue
+                        row_tasks.create_task(_import_row(line=line, account=account))
+            finally:
+                results.put_nowait(None)
+
+        feeder = asyncio.create_task(_feed_rows())
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+                rows_in_flight.release()
+            await feeder
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+
+    async def _import_user(
+        self, line: int, account: AccountInCreate, hashing_slots: asyncio.Semaphore
+    ) -> AccountImportResult:
+        try:
+            async with hashing_slots:
+                hashed_password = await pwd_generator.generate_hashed_password_async(new_password=account.password)
+            user = await self._register_user(user_create=account, hashed_password=hashed_password)
+        except EntityAlreadyExists as conflict:
+            return AccountImportResult(line=line, status="conflict", username=account.username, detail=str(conflict))
+        except Exception as e:
+            loguru.logger.warning(f"Account Import -- Line {line} ({account.username}) failed: {e!r}")
+            return AccountImportResult(line=line, status="failed", username=account.username, detail=repr(e))
+
+        return AccountImportResult(line=line, status="created", username=user.username, user_id=user.user_id)
+
+    async def _claim_credentials(self, user_id: UUID, username: str, email: str) -> None:
+        # A signup must be readable right after it succeeds, so its writes are acknowledged by a local quorum
+        username_claim = await self.storage.execute_prepared(
+            "user.claim_username", (username, user_id, email), consistency_level=ConsistencyLevel.LOCAL_QUORUM
         )
+        if not username_claim.was_applied:
+            raise EntityAlreadyExists(f"User with username '{username}' already exists.")
+
+        email_claim = await self.storage.execute_prepared(
+            "user.claim_email", (email, user_id, username), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+        )
+        if not email_claim.was_applied:
+            await self._execute(
+                "user.release_username", (username, user_id), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+            )
+            raise EntityAlreadyExists(f"User with email '{email}' already exists.")
+
+    async def _release_credentials(self, user_id: UUID, username: str, email: str) -> None:
+        # Conditional deletes only remove claims still owned by `user_id`
+        await self._execute(
+            "user.release_username", (username, user_id), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+        )
+        await self._execute("user.release_email", (email, user_id), consistency_level=ConsistencyLevel.LOCAL_QUORUM)
 
     async def read_all_users(self) -> typing.List[UserInResponse]:  # Change return type to List[UserResponse]
-        loop = asyncio.get_event_loop()
+        # Fetch users from the database, page by page
+        users = await self._fetch_all("user.select_all")
 
-        # Fetch users from the database
-        users = await loop.run_in_executor(None, lambda: list(User.objects.all()))
+        # Convert Cassandra rows to Pydantic models, excluding the hashed password
+        return _USER_LIST_ADAPTER.validate_python(users)
 
-        # Convert Cassandra models to Pydantic models, excluding the hashed password
-        return [
-            UserInResponse(user_id=user["user_id"], username=user["username"], email=user["email"]) for user in users
-        ]
+    async def read_users_page(self, limit: int, cursor: str | None = None) -> UserPageInResponse:
+        users, next_cursor = await self._fetch_page("user.select_all", limit=limit, cursor=cursor)
 
-    # async def read_account_by_id(self, id: int) -> Account:
-    #     stmt = sqlalchemy.select(Account).where(Account.id == id)
-    #     query = await self.async_session.execute(statement=stmt)
+        return UserPageInResponse(users=_USER_LIST_ADAPTER.validate_python(users), next_cursor=next_cursor)
 
-    #     if not query:
-    #         raise EntityDoesNotExist("Account with id `{id}` does not exist!")
+    async def stream_users(self, fetch_size: int) -> typing.AsyncIterator[list[UserInResponse]]:
+        # Yield every page as soon as Cassandra returns it, so only one page is held in memory at a time
+        async for users in self.storage.iterate_prepared_pages("user.select_all", fetch_size=fetch_size):
+            yield _USER_LIST_ADAPTER.validate_python(users)
 
-    #     return query.scalar()  # type: ignore
+    @coalesce_reads
+    async def read_account_by_id(self, user_id: UUID) -> UserInResponse:
+        user = await self._read_user_through_cache(
+            cache_key=self._user_id_cache_key(user_id), statement_name="user.select_by_id", parameter=user_id
+        )
 
-    async def read_account_by_username(self, username: str) -> UserInResponse:
-        loop = asyncio.get_event_loop()
+        if not user:
+            raise EntityDoesNotExist(f"Account with id `{user_id}` does not exist!")
 
-        # Fetch users from the database
-        user = await loop.run_in_executor(None, lambda: User.objects.filter(username=username).first())
+        return user
+
+    @coalesce_reads
+    async def read_account_by_username(self, username: str) -> UserInResponse:
+        # Fetch the user from the cache, falling back to the database
+        user = await self._read_user_through_cache(
+            cache_key=self._username_cache_key(username), statement_name="user.select_by_username", parameter=username
+        )
 
         if not user:
             raise EntityDoesNotExist(f"Account with username `{username}` does not exist!")
 
-        return UserInResponse(user_id=user["user_id"], username=user["username"], email=user["email"])
+        return user
 
-    # async def read_account_by_email(self, email: str) -> Account:
-    #     stmt = sqlalchemy.select(Account).where(Account.email == email)
-    #     query = await self.async_session.execute(statement=stmt)
+    @coalesce_reads
+    async def read_account_by_email(self, email: str) -> UserInResponse:
+        user = await self._read_user_through_cache(
+            cache_key=self._email_cache_key(email), statement_name="user.select_by_email", parameter=email
+        )
+
+        if not user:
+            raise EntityDoesNotExist(f"Account with email `{email}` does not exist!")
+
+        return user
+
+    async def read_accounts(
+        self, user_ids: typing.Sequence[UUID], usernames: typing.Sequence[str]
+    ) -> UserBatchInResponse:
+        """
+        Resolve a batch of ids and usernames: cached users come from one MGET, the others are read concurrently.
+
+        Users are returned once each, in the order they were first asked for; ids and usernames without an
+        account are reported as missing.
+        """
+        loaders = {
+            **{
+                self._user_id_cache_key(user_id): functools.partial(self._load_user, "user.select_by_id", user_id)
+                for user_id in user_ids
+            },
+            **{
+                self._username_cache_key(username): functools.partial(
+                    self._load_user, "user.select_by_username", username
+                )
+                for username in usernames
+            },
+        }
+        cached_users = await self._read_many_through(
+            loaders=loaders, ttl=settings.USER_CACHE_TTL, negative_ttl=settings.USER_CACHE_NEGATIVE_TTL
+        )
 
-    #     if not query:
-    #         raise EntityDoesNotExist("Account with email `{email}` does not exist!")
+        found_users = [cached_user for cached_user in cached_users.values() if cached_user is not None]
+        users = {user.user_id: user for user in _USER_LIST_ADAPTER.validate_json(f"[{','.join(found_users)}]")}
+        return UserBatchInResponse(
+            users=list(users.values()),
+            missing_user_ids=list(
+                dict.fromkeys(user_id for user_id in user_ids if not cached_users[self._user_id_cache_key(user_id)])
+            ),
+            missing_usernames=list(
+                dict.fromkeys(
+                    username for username in usernames if not cached_users[self._username_cache_key(username)]
+                )
+            ),
+        )
 
-    #     return query.scalar()  # type: ignore
+    async def _load_user(self, statement_name: str, parameter: typing.Any) -> str | None:
+        user = await self._fetch_one(statement_name, (parameter,))
+        if not user:
+            return None
+        return UserInResponse(
+            user_id=user["user_id"], username=user["username"], email=user["email"]
+        ).model_dump_json()
+
+    async def _read_user_through_cache(
+        self, cache_key: str, statement_name: str, parameter: typing.Any
+    ) -> UserInResponse | None:
+        cached_user = await self._read_through(
+            cache_key=cache_key,
+            loader=functools.partial(self._load_user, statement_name, parameter),
+            ttl=settings.USER_CACHE_TTL,
+            negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+        )
+        return UserInResponse.model_validate_json(cached_user) if cached_user else None
+
+    @staticmethod
+    def _user_id_cache_key(user_id: UUID) -> str:
+        return f"user:id:{user_id}"
+
+    @staticmethod
+    def _username_cache_key(username: str) -> str:
+        return f"user:username:{username}"
+
+    @staticmethod
+    def _email_cache_key(email: str) -> str:
+        return f"user:email:{email}"
+
+    async def _invalidate_user_cache(
+        self, user_id: UUID, usernames: typing.Iterable[str], emails: typing.Iterable[str]
+    ) -> None:
+        await self.redis_cache.invalidate(
+            self._user_id_cache_key(user_id),
+            *{self._username_cache_key(username) for username in usernames},
+            *{self._email_cache_key(email) for email in emails},
+        )
 
     # async def read_user_by_password_authentication(self, account_login: AccountInLogin) -> Account:
     #     stmt = sqlalchemy.select(Account).where(
@@ -99,48 +296,80 @@ class UserCRUDRepository(BaseCRUDRepository):
 
     #     return db_account  # type: ignore
 
-    # async def update_account_by_id(self, id: int, account_update: AccountInUpdate) -> Account:
-    #     new_account_data = account_update.dict()
-
-    #     select_stmt = sqlalchemy.select(Account).where(Account.id == id)
-    #     query = await self.async_session.execute(statement=select_stmt)
-    #     update_account = query.scalar()
-
-    #     if not update_account:
-    #         raise EntityDoesNotExist(f"Account with id `{id}` does not exist!")  # type: ignore
-
-    #     update_stmt = sqlalchemy.update(table=Account).where(Account.id == update_account.id).values(updated_at=sqlalchemy_functions.now())  # type: ignore
-
-    #     if new_account_data["username"]:
-    #         update_stmt = update_stmt.values(username=new_account_data["username"])
-
-    #     if new_account_data["email"]:
-    #         update_stmt = update_stmt.values(username=new_account_data["email"])
-
-    #     if new_account_data["password"]:
-    #         update_account.set_hash_salt(hash_salt=pwd_generator.generate_salt)  # type: ignore
-    #         update_account.set_hashed_password(hashed_password=pwd_generator.generate_hashed_password(hash_salt=update_account.hash_salt, new_password=new_account_data["password"]))  # type: ignore
-
-    #     await self.async_session.execute(statement=update_stmt)
-    #     await self.async_session.commit()
-    #     await self.async_session.refresh(instance=update_account)
-
-    #     return update_account  # type: ignore
+    async def update_account_by_id(self, user_id: UUID, account_update: AccountInUpdate) -> UserInResponse:
+        current_user = await self._fetch_one("user.select_by_id", (user_id,))
+
+        if not current_user:
+            raise EntityDoesNotExist(f"Account with id `{user_id}` does not exist!")
+
+        username = account_update.username or current_user["username"]
+        email = account_update.email or current_user["email"]
+        is_username_changed = username != current_user["username"]
+        is_email_changed = email != current_user["email"]
+
+        # Claim the new credentials first; the old ones are only released once the user row points away from them
+        if is_username_changed:
+            username_claim = await self.storage.execute_prepared(
+                "user.claim_username", (username, user_id, email), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+            )
+            if not username_claim.was_applied:
+                raise EntityAlreadyExists(f"User with username '{username}' already exists.")
+
+        if is_email_changed:
+            email_claim = await self.storage.execute_prepared(
+                "user.claim_email", (email, user_id, username), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+            )
+            if not email_claim.was_applied:
+                if is_username_changed:
+                    await self._execute(
+                        "user.release_username", (username, user_id), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+                    )
+                raise EntityAlreadyExists(f"User with email '{email}' already exists.")
+
+        if is_username_changed or is_email_changed:
+            await self._execute("user.update_profile", (username, email, user_id))
+
+        if is_username_changed:
+            await self._execute(
+                "user.release_username",
+                (current_user["username"], user_id),
+                consistency_level=ConsistencyLevel.LOCAL_QUORUM,
+            )
+        elif is_email_changed:
+            await self._execute("user.set_username_lookup_email", (email, username))
+
+        if is_email_changed:
+            await self._execute(
+                "user.release_email", (current_user["email"], user_id), consistency_level=ConsistencyLevel.LOCAL_QUORUM
+            )
+        elif is_username_changed:
+            await self._execute("user.set_email_lookup_username", (username, email))
+
+        if account_update.password:
+            hashed_password = await pwd_generator.generate_hashed_password_async(new_password=account_update.password)
+            await self._execute("user.update_password", (hashed_password, user_id))
+
+        await self._invalidate_user_cache(
+            user_id=user_id, usernames=(current_user["username"], username), emails=(current_user["email"], email)
+        )
 
-    # async def delete_account_by_id(self, id: int) -> str:
-    #     select_stmt = sqlalchemy.select(Account).where(Account.id == id)
-    #     query = await self.async_session.execute(statement=select_stmt)
-    #     delete_account = query.scalar()
+        return UserInResponse(user_id=user_id, username=username, email=email)
 
-    #     if not delete_account:
-    #         raise EntityDoesNotExist(f"Account with id `{id}` does not exist!")  # type: ignore
+    async def delete_account_by_id(self, user_id: UUID) -> str:
+        deleted_user = await self._fetch_one("user.select_by_id", (user_id,))
 
-    #     stmt = sqlalchemy.delete(table=Account).where(Account.id == delete_account.id)
+        if not deleted_user:
+            raise EntityDoesNotExist(f"Account with id `{user_id}` does not exist!")
 
-    #     await self.async_session.execute(statement=stmt)
-    #     await self.async_session.commit()
+        await self._execute("user.delete", (user_id,))
+        await self._release_credentials(
+            user_id=user_id, username=deleted_user["username"], email=deleted_user["email"]
+        )
+        await self._invalidate_user_cache(
+            user_id=user_id, usernames=(deleted_user["username"],), emails=(deleted_user["email"],)
+        )
 
-    #     return f"Account with id '{id}' is successfully deleted!"
+        return f"Account with id '{user_id}' is successfully deleted!"
 
     # async def is_username_taken(self, username: str) -> bool:
     #     username_stmt = sqlalchemy.select(Account.username).select_from(Account).where(Account.username == username)
@@ -1,26 +1,109 @@
+import asyncio
 import time
+import typing
 
 import loguru
+from cassandra import ConsistencyLevel
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.cluster import Cluster, Session
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, Cluster, ExecutionProfile, ResponseFuture, ResultSet, Session
+from cassandra.metadata import TableMetadata
+from cassandra.policies import ConstantSpeculativeExecutionPolicy, DCAwareRoundRobinPolicy, TokenAwarePolicy
 from cassandra.cqlengine import connection
+from cassandra.query import BatchStatement, BatchType, BoundStatement, SimpleStatement, Statement
 from src.config.manager import settings
+from src.repository.statements import CQL_STATEMENTS, PreparedStatementRegistry
+from src.repository.storage.base import StorageEngine
+from src.utilities.metrics import metrics_registry
 
+cassandra_query_duration_seconds = metrics_registry.histogram(
+    "cassandra_query_duration_seconds", "Cassandra request latency by registered statement name.", ("statement",)
+)
+cassandra_query_errors_total = metrics_registry.counter(
+    "cassandra_query_errors_total",
+    "Failed Cassandra requests by statement name and error type.",
+    ("statement", "error"),
+)
 
-class CassandraDatabase:
+
+def _set_future_result(future: asyncio.Future, result: typing.Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: asyncio.Future, exception: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exception)
+
+
+def bridge_response_future(response_future: ResponseFuture) -> asyncio.Future:
+    """
+    Bridge a driver `ResponseFuture` into an asyncio future resolved on the running event loop.
+
+    The driver invokes the callbacks from its own I/O thread, so the result is handed over with
+    `call_soon_threadsafe` and no executor thread is held while the query is in flight.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _on_result(rows: typing.Any) -> None:
+        loop.call_soon_threadsafe(_set_future_result, future, ResultSet(response_future, rows))
+
+    def _on_error(exception: BaseException) -> None:
+        loop.call_soon_threadsafe(_set_future_exception, future, exception)
+
+    response_future.add_callbacks(callback=_on_result, errback=_on_error)
+    return future
+
+
+class CassandraDatabase(StorageEngine):
     def __init__(self):
         """Initialize the Cassandra database connection attributes."""
         self.cluster: Cluster | None = None
         self.session: Session | None = None
+        self.statements: PreparedStatementRegistry = PreparedStatementRegistry(statements=CQL_STATEMENTS)
+        self._in_flight: asyncio.Semaphore | None = None
+        self._requests_in_flight: int = 0
 
-    def connect(self, retries=5, delay=30):
-        for attempt in range(retries):
-            try:
-                database._connect()
-                break
-            except:
-                print("Cassandra connection failed, retrying")
-                time.sleep(delay)
+    async def connect(self) -> None:
+        """
+        Connect to Cassandra on a worker thread, so the blocking driver handshake never stalls the event loop.
+        """
+        await asyncio.to_thread(self._connect)
+
+    @staticmethod
+    def build_cluster(auth_provider: PlainTextAuthProvider) -> Cluster:
+        """
+        Build a `Cluster` from the settings.
+
+        Requests are routed token-aware to a replica of the local data center, so a prepared statement goes
+        straight to a node owning its partition. Idempotent statements may be speculatively retried on the
+        next replica when `SPECULATIVE_DELAY_MS` is set.
+        """
+        speculative_execution_policy = (
+            ConstantSpeculativeExecutionPolicy(
+                delay=settings.SPECULATIVE_DELAY_MS / 1000, max_attempts=settings.SPECULATIVE_ATTEMPTS
+            )
+            if settings.SPECULATIVE_DELAY_MS > 0
+            else None
+        )
+        default_profile = ExecutionProfile(
+            load_balancing_policy=TokenAwarePolicy(
+                DCAwareRoundRobinPolicy(local_dc=settings.CASSANDRA_LOCAL_DC or None), shuffle_replicas=True
+            ),
+            consistency_level=ConsistencyLevel.name_to_value[settings.CONSISTENCY_LEVEL],
+            serial_consistency_level=ConsistencyLevel.LOCAL_SERIAL,
+            request_timeout=settings.DB_TIMEOUT,
+            speculative_execution_policy=speculative_execution_policy,
+        )
+
+        return Cluster(
+            contact_points=[host.strip() for host in settings.CASSANDRA_HOSTS.split(",") if host.strip()],
+            port=settings.CASSANDRA_PORT,
+            auth_provider=auth_provider,
+            execution_profiles={EXEC_PROFILE_DEFAULT: default_profile},
+            prepare_on_all_hosts=True,
+            reprepare_on_up=True,
+        )
 
     def _connect(self) -> None:
         """Initiate Cassandra connection using environment settings."""
@@ -28,14 +111,12 @@ class CassandraDatabase:
             username=settings.CASSANDRA_USERNAME, password=settings.CASSANDRA_PASSWORD
         )
         try:
-            self.cluster = Cluster(
-                contact_points=[settings.CASSANDRA_HOST], port=settings.CASSANDRA_PORT, auth_provider=auth_provider
-            )
+            self.cluster = self.build_cluster(auth_provider=auth_provider)
             self.session = self.cluster.connect(keyspace=settings.CASSANDRA_KEYSPACE)
             connection.register_connection(name="default", session=self.session, default=True)  # Register connection
 
             loguru.logger.info(
-                f"Database Connection -- Successfully connected ({settings.CASSANDRA_HOST}:{settings.CASSANDRA_PORT}), keyspace={settings.CASSANDRA_KEYSPACE}"
+                f"Database Connection -- Successfully connected ({settings.CASSANDRA_HOSTS}:{settings.CASSANDRA_PORT}), keyspace={settings.CASSANDRA_KEYSPACE}"
             )
 
         except Exception as e:
@@ -48,9 +129,7 @@ class CassandraDatabase:
         """Connect to Cassandra using default credentials and set up keyspace and user."""
         auth_provider = PlainTextAuthProvider(username="cassandra", password="cassandra")
         try:
-            self.cluster = Cluster(
-                contact_points=[settings.CASSANDRA_HOST], port=settings.CASSANDRA_PORT, auth_provider=auth_provider
-            )
+            self.cluster = self.build_cluster(auth_provider=auth_provider)
             self.session = self.cluster.connect()
 
             # Create keyspace and user if necessary
@@ -73,14 +152,185 @@ class CassandraDatabase:
             self.session = None
             raise
 
+    def table_metadata(self, table_name: str) -> TableMetadata | None:
+        """Return the driver's schema metadata of a table of the keyspace, `None` if it does not exist."""
+        keyspace = self.cluster.metadata.keyspaces.get(settings.CASSANDRA_KEYSPACE)  # type: ignore
+        return keyspace.tables.get(table_name) if keyspace else None
+
+    def prepare_statements(self) -> None:
+        """Prepare the statement registry; must run once the tables exist."""
+        self.statements.prepare_all(session=self.session)  # type: ignore
+
+    async def execute_async(
+        self,
+        statement: str | Statement,
+        parameters: typing.Sequence[typing.Any] | dict[str, typing.Any] | None = None,
+        *,
+        paging_state: bytes | None = None,
+    ) -> ResultSet:
+        """
+        Execute a statement without blocking the event loop and return its first page.
+
+        Only `ResultSet.current_rows`, `ResultSet.one()` and `ResultSet.paging_state` should be used on the
+        returned result: iterating it past the first page makes the driver fetch the next page synchronously.
+        """
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(settings.CASSANDRA_MAX_IN_FLIGHT)
+
+        # Past the in-flight limit requests wait here instead of piling up in the driver until they time out
+        async with self._in_flight:
+            statement_label = self._statement_label(statement)
+            started_at = time.perf_counter()
+            self._requests_in_flight += 1
+            try:
+                response_future = self.session.execute_async(  # type: ignore
+                    statement, parameters, paging_state=paging_state
+                )
+                return await bridge_response_future(response_future)
+            except Exception as e:
+                cassandra_query_errors_total.inc((statement_label, type(e).__name__))
+                raise
+            finally:
+                self._requests_in_flight -= 1
+                cassandra_query_duration_seconds.observe(time.perf_counter() - started_at, (statement_label,))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding an in-flight slot."""
+        return self._requests_in_flight
+
+    def _statement_label(self, statement: str | Statement) -> str:
+        if isinstance(statement, BoundStatement):
+            return self.statements.name_of(statement.prepared_statement) or "prepared"
+        if isinstance(statement, BatchStatement):
+            return "batch"
+        return "simple"
+
+    async def execute_prepared(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        paging_state: bytes | None = None,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> ResultSet:
+        """
+        Bind the registered statement `name` and execute it asynchronously.
+
+        `consistency_level` overrides the configured `CONSISTENCY_LEVEL` for this execution only.
+        """
+        bound_statement = self.statements[name].bind(parameters or ())
+        if fetch_size is not None:
+            bound_statement.fetch_size = fetch_size
+        if consistency_level is not None:
+            bound_statement.consistency_level = consistency_level
+        return await self.execute_async(bound_statement, paging_state=paging_state)
+
+    async def execute_concurrent(
+        self,
+        statements: typing.Iterable[Statement],
+        concurrency: int,
+        raise_on_first_error: bool = True,
+    ) -> list[ResultSet | Exception]:
+        """
+        Execute statements with at most `concurrency` of them in flight, returning results in input order.
+
+        `statements` is consumed lazily, so a generator keeps memory bounded by the in-flight window. With
+        `raise_on_first_error=False` failures are returned in place of their result instead of raised.
+        """
+        indexed_statements = enumerate(statements)
+        results: dict[int, ResultSet | Exception] = {}
+
+        async def _execute_next() -> None:
+            for index, statement in indexed_statements:
+                try:
+                    results[index] = await self.execute_async(statement)
+                except Exception as e:
+                    if raise_on_first_error:
+                        raise
+                    results[index] = e
+
+        await asyncio.gather(*(_execute_next() for _ in range(concurrency)))
+        return [results[index] for index in range(len(results))]
+
+    async def execute_prepared_batch(
+        self, name: str, parameter_rows: typing.Sequence[typing.Sequence[typing.Any]]
+    ) -> None:
+        """
+        Execute the registered statement `name` once per parameter row as a single unlogged batch.
+
+        Rows sharing a partition make the batch one atomic mutation on one replica set.
+        """
+        prepared_statement = self.statements[name]
+        batch_statement = BatchStatement(batch_type=BatchType.UNLOGGED)
+        for parameters in parameter_rows:
+            batch_statement.add(prepared_statement, parameters)
+        await self.execute_async(batch_statement)
+
+    async def execute_prepared_concurrent(
+        self, statements: typing.Iterable[tuple[str, typing.Sequence[typing.Any]]], concurrency: int
+    ) -> None:
+        await self.execute_concurrent(
+            (self.statements[name].bind(parameters) for name, parameters in statements), concurrency=concurrency
+        )
+
+    async def iterate_pages(
+        self,
+        statement: str | Statement,
+        parameters: typing.Sequence[typing.Any] | dict[str, typing.Any] | None = None,
+        *,
+        fetch_size: int | None = None,
+    ) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+        """
+        Yield the rows of a query page by page, awaiting each page as it arrives.
+        """
+        if isinstance(statement, str):
+            statement = SimpleStatement(statement, fetch_size=fetch_size)
+        elif fetch_size is not None:
+            statement.fetch_size = fetch_size
+
+        paging_state: bytes | None = None
+        while True:
+            result = await self.execute_async(statement, parameters, paging_state=paging_state)
+            yield result.current_rows
+            paging_state = result.paging_state
+            if not paging_state:
+                break
+
+    async def iterate_prepared_pages(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+        """
+        Yield the rows of the registered statement `name` page by page.
+        """
+        bound_statement = self.statements[name].bind(parameters or ())
+        if consistency_level is not None:
+            bound_statement.consistency_level = consistency_level
+        async for page in self.iterate_pages(bound_statement, fetch_size=fetch_size):
+            yield page
+
     def shutdown(self) -> None:
         """Shutdown the Cassandra connection."""
         if self.cluster:
             try:
                 self.cluster.shutdown()
+                self.statements.clear()
             except Exception as e:
                 print(f"Error shutting down Cassandra connection: {e}")
 
 
 # Singleton instance of CassandraDatabase
 database: CassandraDatabase = CassandraDatabase()
+
+metrics_registry.gauge(
+    "cassandra_requests_in_flight",
+    "Cassandra requests of this worker holding an in-flight slot.",
+    (),
+    callback=lambda: {(): database.in_flight},
+)
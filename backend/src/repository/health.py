@@ -0,0 +1,38 @@
+import typing
+
+from src.config.manager import settings
+
+DependencyState = typing.Literal["starting", "ready", "failed"]
+
+
+class DependencyHealth:
+    def __init__(self, dependencies: typing.Iterable[str]):
+        """Track the initialization state of every backing service the application needs to serve traffic."""
+        self._states: dict[str, DependencyState] = {dependency: "starting" for dependency in dependencies}
+        self._errors: dict[str, str] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return all(state == "ready" for state in self._states.values())
+
+    def mark_starting(self, dependency: str) -> None:
+        self._states[dependency] = "starting"
+        self._errors.pop(dependency, None)
+
+    def mark_ready(self, dependency: str) -> None:
+        self._states[dependency] = "ready"
+        self._errors.pop(dependency, None)
+
+    def mark_failed(self, dependency: str, error: BaseException) -> None:
+        self._states[dependency] = "failed"
+        self._errors[dependency] = repr(error)
+
+    def report(self) -> dict[str, dict[str, str | None]]:
+        return {
+            dependency: {"status": state, "error": self._errors.get(dependency)}
+            for dependency, state in self._states.items()
+        }
+
+
+# Singleton instance of DependencyHealth
+dependency_health: DependencyHealth = DependencyHealth(dependencies=("redis", settings.STORAGE_BACKEND))
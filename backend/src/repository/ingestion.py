@@ -0,0 +1,180 @@
+import asyncio
+import collections
+import typing
+from datetime import datetime
+from uuid import UUID
+
+import loguru
+from src.config.manager import settings
+from src.repository.search import IndexedMessage, message_search_indexer
+from src.repository.storage.base import StorageEngine
+from src.repository.storage.engine import storage
+from src.utilities.metrics import metrics_registry
+
+# How many (chatroom, bucket) pairs a worker remembers as already indexed before it forgets the oldest
+_KNOWN_BUCKETS_MAX_SIZE: int = 10_000
+# Bytes a message row takes besides its text: ids, bucket, timestamp and per-cell overhead, rounded up
+_MESSAGE_ROW_OVERHEAD_BYTES: int = 128
+
+
+class PendingMessage(typing.NamedTuple):
+    chatroom_id: UUID
+    bucket: int
+    message_id: UUID
+    message_text: str
+    user_id: UUID
+    created_at: datetime
+
+
+class MessageIngestionBuffer:
+    def __init__(self, storage: StorageEngine):
+        """
+        Write-behind buffer in front of `Message` inserts.
+
+        Messages are collected for up to `MESSAGE_BATCH_DELAY_MS` or `MESSAGE_BATCH_MAX_SIZE` items, grouped
+        by partition and written as unlogged batches of at most `MESSAGE_BATCH_MAX_BYTES` per partition. With
+        `MESSAGE_ACK_MODE="flush"` `submit` returns once the message is persisted; with `"enqueue"` it returns
+        as soon as it is buffered, trading durability on crash for latency.
+        """
+        self.storage: StorageEngine = storage
+        self._queue: asyncio.Queue[tuple[PendingMessage, asyncio.Future | None] | None] | None = None
+        self._flusher_task: asyncio.Task | None = None
+        self._is_closing: bool = False
+        self._known_buckets: collections.OrderedDict[tuple[UUID, int], None] = collections.OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """Number of messages buffered and not yet handed to storage."""
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        if self._flusher_task is None or self._flusher_task.done():
+            self._is_closing = False
+            self._queue = asyncio.Queue(maxsize=settings.MESSAGE_BUFFER_SIZE)
+            self._flusher_task = asyncio.create_task(self._flush_continuously())
+
+    async def submit(self, message: PendingMessage) -> None:
+        """
+        Buffer a message for writing; waits while the buffer is full, which pushes back on producers.
+        """
+        if self._is_closing:
+            raise RuntimeError("Message ingestion buffer is closed!")
+        self.start()
+
+        acknowledgement = asyncio.get_running_loop().create_future() if settings.MESSAGE_ACK_MODE == "flush" else None
+        await self._queue.put((message, acknowledgement))  # type: ignore
+        if acknowledgement:
+            await acknowledgement
+
+    async def close(self) -> None:
+        """Stop accepting messages and flush everything still buffered."""
+        if self._flusher_task is None or self._is_closing:
+            return
+
+        self._is_closing = True
+        await self._queue.put(None)  # type: ignore
+        await self._flusher_task
+        self._flusher_task = None
+
+    async def _flush_continuously(self) -> None:
+        loop = asyncio.get_running_loop()
+        max_delay = settings.MESSAGE_BATCH_DELAY_MS / 1000
+        is_draining = False
+
+        while not is_draining:
+            first_item = await self._queue.get()  # type: ignore
+            if first_item is None:
+                break
+
+            batch = [first_item]
+            deadline = loop.time() + max_delay
+            while len(batch) < settings.MESSAGE_BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)  # type: ignore
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    is_draining = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[PendingMessage, asyncio.Future | None]]) -> None:
+        partitions: dict[tuple[UUID, int], list[tuple[PendingMessage, asyncio.Future | None]]] = {}
+        for item in batch:
+            partitions.setdefault((item[0].chatroom_id, item[0].bucket), []).append(item)
+
+        results = await asyncio.gather(
+            *(self._write_partition(partition, items) for partition, items in partitions.items()),
+            return_exceptions=True,
+        )
+
+        for (partition, items), result in zip(partitions.items(), results):
+            if isinstance(result, BaseException):
+                loguru.logger.error(
+                    f"Message Ingestion -- Failed to write {len(items)} messages of {partition}: {result}"
+                )
+            for _, acknowledgement in items:
+                if acknowledgement is None or acknowledgement.done():
+                    continue
+                if isinstance(result, BaseException):
+                    acknowledgement.set_exception(result)
+                else:
+                    acknowledgement.set_result(None)
+
+    async def _write_partition(
+        self, partition: tuple[UUID, int], items: list[tuple[PendingMessage, asyncio.Future | None]]
+    ) -> None:
+        # The index row comes first: one pointing at an empty bucket is harmless, messages it misses are not
+        await self._index_bucket(partition)
+        # All rows share the partition, so every batch is a single atomic mutation on one replica set
+        for messages in self._split_by_size([message for message, _ in items]):
+            await self.storage.execute_prepared_batch("message.insert", messages)
+        # Search postings are written in the background, once the messages they point to exist
+        message_search_indexer.enqueue(
+            IndexedMessage(message.chatroom_id, message.bucket, message.message_id, message.message_text)
+            for message, _ in items
+        )
+
+    @staticmethod
+    def _split_by_size(messages: list[PendingMessage]) -> typing.Iterator[list[PendingMessage]]:
+        """Split messages into batches of up to `MESSAGE_BATCH_MAX_SIZE` rows and `MESSAGE_BATCH_MAX_BYTES`."""
+        batch: list[PendingMessage] = []
+        batch_bytes = 0
+        for message in messages:
+            message_bytes = len(message.message_text.encode()) + _MESSAGE_ROW_OVERHEAD_BYTES
+            if batch and (
+                len(batch) >= settings.MESSAGE_BATCH_MAX_SIZE
+                or batch_bytes + message_bytes > settings.MESSAGE_BATCH_MAX_BYTES
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(message)
+            batch_bytes += message_bytes
+        if batch:
+            yield batch
+
+    async def _index_bucket(self, partition: tuple[UUID, int]) -> None:
+        # The bucket index is written once per bucket and worker instead of once per message
+        if partition in self._known_buckets:
+            return
+
+        await self.storage.execute_prepared("message_bucket.insert", partition)
+        self._known_buckets[partition] = None
+        if len(self._known_buckets) > _KNOWN_BUCKETS_MAX_SIZE:
+            self._known_buckets.popitem(last=False)
+
+
+# Singleton instance of MessageIngestionBuffer
+message_ingestion_buffer: MessageIngestionBuffer = MessageIngestionBuffer(storage=storage)
+
+metrics_registry.gauge(
+    "message_ingestion_pending",
+    "Messages buffered and not yet handed to storage.",
+    (),
+    callback=lambda: {(): message_ingestion_buffer.pending},
+)
@@ -0,0 +1,289 @@
+import asyncio
+import collections
+import json
+import time
+import typing
+from uuid import UUID
+
+import loguru
+from redis.exceptions import RedisError
+from src.config.manager import settings
+from src.repository.cache import RedisCache, cache, redis_command_errors_total
+from src.utilities.metrics import metrics_registry
+
+# Sorted set of every online user id, scored by the unix time its presence expires at
+ONLINE_USERS_KEY: str = "presence:online"
+# Pub/sub channel of `{"status": "online" | "offline", "user_ids": [...]}` transitions
+PRESENCE_CHANNEL: str = "presence"
+# Member of a cached room membership set, present once the set was filled from the database
+MEMBERS_COMPLETE_ENTRY: str = "__complete__"
+
+# Refresh the expiry of every given user, returning those that were not online before
+_HEARTBEAT_SCRIPT: str = """
+local came_online = {}
+for index = 2, #ARGV do
+    if not redis.call('ZSCORE', KEYS[1], ARGV[index]) then
+        came_online[#came_online + 1] = ARGV[index]
+    end
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[index])
+end
+return came_online
+"""
+
+# Remove up to ARGV[2] users expired at ARGV[1] and return them; each user is popped by exactly one caller
+_SWEEP_SCRIPT: str = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+end
+return expired
+"""
+
+# Members of the set KEYS[1] online at ARGV[1], or nil when the membership is not cached
+_ONLINE_MEMBERS_SCRIPT: str = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[2]) == 0 then
+    return false
+end
+local online = {}
+for _, member in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local expires_at = redis.call('ZSCORE', KEYS[2], member)
+    if expires_at and tonumber(expires_at) > tonumber(ARGV[1]) then
+        online[#online + 1] = member
+    end
+end
+return online
+"""
+
+# Cache the membership ARGV[5..] in the set KEYS[1], unless the room's membership version KEYS[2] moved past
+# ARGV[1] while it was read or the set was filled meanwhile; either way return the members online at ARGV[3]
+_FILL_MEMBERS_SCRIPT: str = """
+local online = {}
+for index = 5, #ARGV do
+    local expires_at = redis.call('ZSCORE', KEYS[3], ARGV[index])
+    if expires_at and tonumber(expires_at) > tonumber(ARGV[3]) then
+        online[#online + 1] = ARGV[index]
+    end
+end
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] and redis.call('EXISTS', KEYS[1]) == 0 then
+    for start = 4, #ARGV, 1000 do
+        redis.call('SADD', KEYS[1], unpack(ARGV, start, math.min(start + 999, #ARGV)))
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return online
+"""
+
+presence_transitions_total = metrics_registry.counter(
+    "presence_transitions_total", "Users seen coming online or going offline by this worker.", ("status",)
+)
+
+
+def room_members_cache_key(chatroom_id: UUID) -> str:
+    return f"chatroom:members:{chatroom_id}"
+
+
+def room_members_version_key(chatroom_id: UUID) -> str:
+    return f"chatroom:members_version:{chatroom_id}"
+
+
+class PresenceTracker:
+    def __init__(self, redis_cache: RedisCache):
+        """
+        Keep the online set of `ONLINE_USERS_KEY` up to date from this worker's users.
+
+        Heartbeats and users connected to this worker are not written one by one: every
+        `PRESENCE_FLUSH_SECONDS` seconds new heartbeats, and connected users whose presence is due for a
+        refresh, are sent in scripts of up to `PRESENCE_BATCH_SIZE` users, then expired users are swept. A user
+        is online while their entry has not expired, `PRESENCE_TTL` seconds after their last heartbeat, so a
+        crashed worker's users go offline on their own. Transitions are published on `PRESENCE_CHANNEL` once
+        per flush; since only a new entry counts as coming online and only a swept one as going offline,
+        every worker publishing its own share still yields one event per transition.
+        """
+        self.redis_cache: RedisCache = redis_cache
+        self._connections: collections.Counter[UUID] = collections.Counter()
+        self._pending: set[UUID] = set()
+        self._refreshed_at: dict[UUID, float] = {}
+        self._flusher_task: asyncio.Task | None = None
+
+    @property
+    def connected_users(self) -> int:
+        """Number of distinct users with a connection to this worker."""
+        return len(self._connections)
+
+    def start(self) -> None:
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_continuously())
+
+    def heartbeat(self, user_id: UUID) -> None:
+        """Mark `user_id` online at the next flush."""
+        self._pending.add(user_id)
+
+    def track(self, user_id: UUID) -> None:
+        """Keep `user_id` online for as long as they hold a connection to this worker."""
+        self._connections[user_id] += 1
+        self._pending.add(user_id)
+
+    def untrack(self, user_id: UUID) -> None:
+        # The entry is left to expire, since the user may still be connected to another worker
+        self._connections[user_id] -= 1
+        if self._connections[user_id] <= 0:
+            del self._connections[user_id]
+            self._refreshed_at.pop(user_id, None)
+
+    def collect_due_users(self, now: float) -> list[UUID]:
+        """Take the users to write this flush: new heartbeats and connected users refreshed too long ago."""
+        refresh_before = now - settings.PRESENCE_TTL / 3
+        due_users = self._pending | {
+            user_id for user_id in self._connections if self._refreshed_at.get(user_id, 0.0) <= refresh_before
+        }
+        self._pending = set()
+        for user_id in due_users:
+            if user_id in self._connections:
+                self._refreshed_at[user_id] = now
+        return list(due_users)
+
+    async def close(self) -> None:
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            await asyncio.gather(self._flusher_task, return_exceptions=True)
+            self._flusher_task = None
+
+    async def _flush_continuously(self) -> None:
+        while True:
+            await asyncio.sleep(settings.PRESENCE_FLUSH_SECONDS)
+            if not self.redis_cache.redis:
+                continue
+            try:
+                await self.flush(now=time.time())
+            except RedisError as e:
+                redis_command_errors_total.inc(("PRESENCE",))
+                loguru.logger.warning(f"Presence -- Flush failed, retrying next interval: {e}")
+
+    async def flush(self, now: float) -> None:
+        due_users = self.collect_due_users(now=now)
+        came_online: list[str] = []
+        try:
+            for start in range(0, len(due_users), settings.PRESENCE_BATCH_SIZE):
+                came_online.extend(
+                    await self.redis_cache.run_script(
+                        _HEARTBEAT_SCRIPT,
+                        keys=(ONLINE_USERS_KEY,),
+                        arguments=(
+                            now + settings.PRESENCE_TTL,
+                            *due_users[start : start + settings.PRESENCE_BATCH_SIZE],
+                        ),
+                        command="PRESENCE",
+                    )
+                )
+        except RedisError:
+            # Rewriting a heartbeat is harmless, so the whole flush is retried
+            self._pending.update(due_users)
+            raise
+
+        went_offline: list[str] = []
+        while True:
+            expired = await self.redis_cache.run_script(
+                _SWEEP_SCRIPT,
+                keys=(ONLINE_USERS_KEY,),
+                arguments=(now, settings.PRESENCE_BATCH_SIZE),
+                command="PRESENCE",
+            )
+            went_offline.extend(expired)
+            if len(expired) < settings.PRESENCE_BATCH_SIZE:
+                break
+
+        for status, user_ids in (("online", came_online), ("offline", went_offline)):
+            if user_ids:
+                presence_transitions_total.inc((status,), amount=len(user_ids))
+                await self.redis_cache.redis.publish(  # type: ignore
+                    PRESENCE_CHANNEL, json.dumps({"status": status, "user_ids": user_ids})
+                )
+
+    async def read_online_members(self, members_key: str) -> list[UUID] | None:
+        """
+        Return the members of the cached membership set `members_key` that are online, in one Redis call.
+
+        `None` means the membership is not cached; an unavailable Redis reads as nobody being online.
+        """
+        if not self.redis_cache.redis:
+            return []
+        try:
+            online_members = await self.redis_cache.run_script(
+                _ONLINE_MEMBERS_SCRIPT,
+                keys=(members_key, ONLINE_USERS_KEY),
+                arguments=(time.time(), MEMBERS_COMPLETE_ENTRY),
+                command="PRESENCE",
+            )
+        except RedisError as e:
+            redis_command_errors_total.inc(("PRESENCE",))
+            loguru.logger.warning(f"Presence -- Reading the online members of {members_key} failed: {e}")
+            return []
+        return None if online_members is None else [UUID(member) for member in online_members]
+
+    async def read_members_version(self, version_key: str) -> str:
+        """Return the membership version of `version_key`, to be read before the membership it guards."""
+        if not self.redis_cache.redis:
+            return "0"
+        try:
+            return await self.redis_cache.redis.get(version_key) or "0"
+        except RedisError as e:
+            redis_command_errors_total.inc(("PRESENCE",))
+            loguru.logger.warning(f"Presence -- Reading the membership version {version_key} failed: {e}")
+            return "0"
+
+    async def fill_online_members(
+        self, members_key: str, version_key: str, members_version: str, user_ids: typing.Iterable[UUID]
+    ) -> list[UUID]:
+        """
+        Cache a room's full membership as the set `members_key` and return the members that are online.
+
+        The set is only written when the membership version is still `members_version`, read before the
+        membership was: a change that landed in between bumped it, and caching what was read would serve the
+        outdated membership for `ROOM_MEMBERS_CACHE_TTL` seconds.
+        """
+        if not self.redis_cache.redis:
+            return []
+        try:
+            online_members = await self.redis_cache.run_script(
+                _FILL_MEMBERS_SCRIPT,
+                keys=(members_key, version_key, ONLINE_USERS_KEY),
+                arguments=(
+                    members_version,
+                    settings.ROOM_MEMBERS_CACHE_TTL,
+                    time.time(),
+                    MEMBERS_COMPLETE_ENTRY,
+                    *user_ids,
+                ),
+                command="PRESENCE",
+            )
+        except RedisError as e:
+            redis_command_errors_total.inc(("PRESENCE",))
+            loguru.logger.warning(f"Presence -- Caching the membership {members_key} failed: {e}")
+            return []
+        return [UUID(member) for member in online_members]
+
+    async def invalidate_members(self, members_key: str, version_key: str) -> None:
+        """Drop a cached membership after it changed, and bump its version so no fill in flight restores it."""
+        if not self.redis_cache.redis:
+            return
+        try:
+            async with self.redis_cache.redis.pipeline(transaction=True) as pipeline:
+                pipeline.incr(version_key)
+                # Outlives any fill in flight, after which a reset version can no longer be mistaken
+                pipeline.expire(version_key, settings.ROOM_MEMBERS_CACHE_TTL)
+                pipeline.delete(members_key)
+                await pipeline.execute()
+        except RedisError as e:
+            redis_command_errors_total.inc(("PRESENCE",))
+            loguru.logger.warning(f"Presence -- Invalidating the membership {members_key} failed: {e}")
+
+
+# Singleton instance of PresenceTracker
+presence_tracker: PresenceTracker = PresenceTracker(redis_cache=cache)
+
+metrics_registry.gauge(
+    "presence_connected_users",
+    "Distinct users connected to this worker.",
+    (),
+    callback=lambda: {(): presence_tracker.connected_users},
+)
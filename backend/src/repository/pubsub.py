@@ -0,0 +1,94 @@
+import asyncio
+import typing
+
+import loguru
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+from src.repository.cache import RedisCache, cache
+
+ChannelListener = typing.Callable[[str], None]
+
+
+class RedisPubSubHub:
+    def __init__(self, redis_cache: RedisCache):
+        """
+        Multiplex Redis pub/sub channels onto in-process listeners.
+
+        A worker holds a single pub/sub connection and one Redis subscription per channel, however many local
+        listeners (e.g. WebSocket connections) follow that channel.
+        """
+        self.redis_cache: RedisCache = redis_cache
+        self._pubsub: PubSub | None = None
+        self._listeners: dict[str, set[ChannelListener]] = {}
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def channels(self) -> int:
+        """Number of channels this worker is subscribed to on Redis."""
+        return len(self._listeners)
+
+    async def subscribe(self, channel: str, listener: ChannelListener) -> None:
+        async with self._lock:
+            listeners = self._listeners.get(channel)
+            if listeners is not None:
+                listeners.add(listener)
+                return
+
+            if self._pubsub is None:
+                self._pubsub = self.redis_cache.redis.pubsub(ignore_subscribe_messages=True)  # type: ignore
+            await self._pubsub.subscribe(channel)
+            self._listeners[channel] = {listener}
+
+            if self._reader_task is None or self._reader_task.done():
+                self._reader_task = asyncio.create_task(self._dispatch_messages())
+
+    async def unsubscribe(self, channel: str, listener: ChannelListener) -> None:
+        async with self._lock:
+            listeners = self._listeners.get(channel)
+            if listeners is None:
+                return
+
+            listeners.discard(listener)
+            if not listeners:
+                del self._listeners[channel]
+                await self._pubsub.unsubscribe(channel)  # type: ignore
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.redis_cache.redis.publish(channel, message)  # type: ignore
+
+    async def _dispatch_messages(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)  # type: ignore
+            except RedisError as e:
+                # redis-py reconnects and re-subscribes every channel on the next read
+                loguru.logger.warning(f"Redis pub/sub read failed, retrying: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if not message or message["type"] != "message":
+                continue
+
+            for listener in tuple(self._listeners.get(message["channel"], ())):
+                try:
+                    listener(message["data"])
+                except Exception as e:
+                    loguru.logger.error(f"Pub/sub listener of {message['channel']} failed: {e}")
+
+    async def close(self) -> None:
+        if self._reader_task:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except RedisError as e:
+                loguru.logger.warning(f"Error closing Redis pub/sub connection: {e}")
+            self._pubsub = None
+        self._listeners.clear()
+
+
+# Singleton instance of RedisPubSubHub
+pubsub_hub: RedisPubSubHub = RedisPubSubHub(redis_cache=cache)
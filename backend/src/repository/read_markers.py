@@ -0,0 +1,223 @@
+import asyncio
+import typing
+from uuid import UUID
+
+import loguru
+from redis.exceptions import RedisError
+from src.config.manager import settings
+from src.repository.cache import WINDOW_COMPLETE_ENTRY, RedisCache, cache, redis_command_errors_total
+from src.repository.storage.base import StorageEngine
+from src.repository.storage.engine import storage
+from src.utilities.metrics import metrics_registry
+
+# Set of `<user_id>:<chatroom_id>` pairs whose marker changed since it was last written to storage
+DIRTY_MARKERS_KEY: str = "read_markers:dirty"
+# Field of a user's marker hash, present once the hash holds every marker stored for the user
+MARKERS_LOADED_FIELD: str = "__loaded__"
+
+# Move the markers of ARGV[3..] (room, score, marker triples) forward, never back; ARGV[1] is the hash TTL and
+# ARGV[2] the dirty set member prefix, empty when the markers come from storage and need no write back
+_ADVANCE_MARKERS_SCRIPT: str = """
+local advanced = 0
+for index = 3, #ARGV, 3 do
+    local current = redis.call('HGET', KEYS[1], ARGV[index])
+    if not current or tonumber(string.match(current, '^%d+')) < tonumber(ARGV[index + 1]) then
+        redis.call('HSET', KEYS[1], ARGV[index], ARGV[index + 2])
+        if ARGV[2] ~= '' then
+            redis.call('SADD', KEYS[2], ARGV[2] .. ARGV[index])
+        end
+        advanced = advanced + 1
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return advanced
+"""
+
+# Whether the marker hash KEYS[1] is loaded, then the marker of every room ARGV[i] and the number of messages
+# past it in the recent window KEYS[i + 1], -1 when that window is not filled
+_UNREAD_COUNTS_SCRIPT: str = """
+local result = {redis.call('HEXISTS', KEYS[1], ARGV[#ARGV])}
+for index = 1, #ARGV - 2 do
+    local marker = redis.call('HGET', KEYS[1], ARGV[index]) or ''
+    local unread_count = -1
+    if redis.call('ZSCORE', KEYS[index + 1], ARGV[#ARGV - 1]) then
+        local after = marker ~= '' and '(' .. string.match(marker, '^%d+') or '-inf'
+        unread_count = redis.call('ZCOUNT', KEYS[index + 1], after, '(inf')
+    end
+    result[#result + 1] = marker
+    result[#result + 1] = unread_count
+end
+return result
+"""
+
+read_markers_flushed_total = metrics_registry.counter(
+    "read_markers_flushed_total", "Read markers written from Redis to storage."
+)
+
+
+def read_markers_cache_key(user_id: UUID) -> str:
+    return f"read_markers:{user_id}"
+
+
+def encode_read_marker(score: int, message_id: UUID) -> str:
+    # The score prefix lets the scripts compare positions without parsing time UUIDs
+    return f"{score}:{message_id}"
+
+
+def decode_read_marker(marker: str) -> UUID:
+    return UUID(marker.partition(":")[2])
+
+
+class ReadMarkerStore:
+    def __init__(self, redis_cache: RedisCache, storage: StorageEngine):
+        """
+        Keep every user's last-read position per room hot in Redis and write it behind to storage.
+
+        A position only ever moves forward, so reading a room twice, or out of order, changes nothing. Changed
+        markers are flagged in `DIRTY_MARKERS_KEY` and written every `READ_FLUSH_SECONDS` by whichever
+        worker pops them, so any number of reads between two flushes cost one write. Writes carry the message
+        time as their timestamp, so a flush that lands late cannot move a stored marker back.
+        """
+        self.redis_cache: RedisCache = redis_cache
+        self.storage: StorageEngine = storage
+        self._flusher_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_continuously())
+
+    async def close(self) -> None:
+        """Stop flushing periodically, then write what is still dirty."""
+        if self._flusher_task is None:
+            return
+
+        self._flusher_task.cancel()
+        await asyncio.gather(self._flusher_task, return_exceptions=True)
+        self._flusher_task = None
+        if self.redis_cache.redis:
+            try:
+                await self.flush()
+            except Exception as e:
+                loguru.logger.warning(f"Read Markers -- Final flush failed, markers stay dirty in Redis: {e!r}")
+
+    async def advance(self, user_id: UUID, chatroom_id: UUID, message_id: UUID, score: int) -> bool:
+        """
+        Move the user's marker of a room to `message_id`, unless it already is at or past it.
+
+        `False` means Redis is unavailable and the marker is left for the caller to write through.
+        """
+        if not self.redis_cache.redis:
+            return False
+        try:
+            await self.redis_cache.run_script(
+                _ADVANCE_MARKERS_SCRIPT,
+                keys=(read_markers_cache_key(user_id), DIRTY_MARKERS_KEY),
+                arguments=(
+                    settings.READ_MARKER_CACHE_TTL,
+                    f"{user_id}:",
+                    chatroom_id,
+                    score,
+                    encode_read_marker(score=score, message_id=message_id),
+                ),
+                command="READ_MARKERS",
+            )
+        except RedisError as e:
+            redis_command_errors_total.inc(("READ_MARKERS",))
+            loguru.logger.warning(f"Read Markers -- Redis unavailable, writing the marker through: {e}")
+            return False
+        return True
+
+    async def load(self, user_id: UUID, markers: typing.Iterable[tuple[UUID, UUID, int]]) -> None:
+        """Merge stored `(chatroom_id, message_id, score)` markers into the user's hash and mark it loaded."""
+        if not self.redis_cache.redis:
+            return
+
+        arguments: list[typing.Any] = [settings.READ_MARKER_CACHE_TTL, ""]
+        for chatroom_id, message_id, score in markers:
+            arguments.extend((chatroom_id, score, encode_read_marker(score=score, message_id=message_id)))
+        arguments.extend((MARKERS_LOADED_FIELD, 0, "0:"))
+        try:
+            await self.redis_cache.run_script(
+                _ADVANCE_MARKERS_SCRIPT,
+                keys=(read_markers_cache_key(user_id), DIRTY_MARKERS_KEY),
+                arguments=tuple(arguments),
+                command="READ_MARKERS",
+            )
+        except RedisError as e:
+            redis_command_errors_total.inc(("READ_MARKERS",))
+            loguru.logger.warning(f"Read Markers -- Caching the markers of {user_id} failed: {e}")
+
+    async def read_unread_counts(
+        self, user_id: UUID, chatroom_ids: typing.Sequence[UUID], window_keys: typing.Sequence[str]
+    ) -> tuple[bool, list[tuple[UUID | None, int | None]]] | None:
+        """
+        Read, in one call, the user's marker of every room and how many messages of the room's recent window
+        are past it, or `None` for the count when that window is not filled.
+
+        The flag tells whether the marker hash was loaded from storage; `None` means Redis is unavailable.
+        """
+        if not self.redis_cache.redis:
+            return None
+        try:
+            result = await self.redis_cache.run_script(
+                _UNREAD_COUNTS_SCRIPT,
+                keys=(read_markers_cache_key(user_id), *window_keys),
+                arguments=(*chatroom_ids, WINDOW_COMPLETE_ENTRY, MARKERS_LOADED_FIELD),
+                command="READ_MARKERS",
+            )
+        except RedisError as e:
+            redis_command_errors_total.inc(("READ_MARKERS",))
+            loguru.logger.warning(f"Read Markers -- Reading the unread counts of {user_id} failed: {e}")
+            return None
+
+        is_loaded, markers, unread_counts = bool(result[0]), result[1::2], result[2::2]
+        return is_loaded, [
+            (decode_read_marker(marker) if marker else None, unread_count if unread_count >= 0 else None)
+            for marker, unread_count in zip(markers, unread_counts)
+        ]
+
+    async def _flush_continuously(self) -> None:
+        while True:
+            await asyncio.sleep(settings.READ_FLUSH_SECONDS)
+            if not self.redis_cache.redis:
+                continue
+            try:
+                await self.flush()
+            except Exception as e:
+                loguru.logger.warning(f"Read Markers -- Flush failed, retrying next interval: {e!r}")
+
+    async def flush(self) -> None:
+        """Write every dirty marker to storage, `READ_FLUSH_BATCH_SIZE` at a time."""
+        redis = self.redis_cache.redis
+        while True:
+            # Popping hands every dirty marker to exactly one worker
+            dirty_members = await redis.spop(DIRTY_MARKERS_KEY, settings.READ_FLUSH_BATCH_SIZE)  # type: ignore
+            if not dirty_members:
+                return
+
+            pairs = [member.split(":") for member in dirty_members]
+            async with redis.pipeline(transaction=False) as pipeline:  # type: ignore
+                for user_id, chatroom_id in pairs:
+                    pipeline.hget(read_markers_cache_key(UUID(user_id)), chatroom_id)
+                markers = await pipeline.execute()
+
+            upserts = []
+            for (user_id, chatroom_id), marker in zip(pairs, markers):
+                if marker:
+                    score, _, message_id = marker.partition(":")
+                    upserts.append(
+                        ("read_marker.upsert", (UUID(user_id), UUID(chatroom_id), UUID(message_id), int(score)))
+                    )
+            try:
+                await self.storage.execute_prepared_concurrent(upserts, concurrency=settings.BULK_WRITE_CONCURRENCY)
+            except Exception:
+                await redis.sadd(DIRTY_MARKERS_KEY, *dirty_members)  # type: ignore
+                raise
+            read_markers_flushed_total.inc(amount=len(dirty_members))
+
+            if len(dirty_members) < settings.READ_FLUSH_BATCH_SIZE:
+                return
+
+
+# Singleton instance of ReadMarkerStore
+read_marker_store: ReadMarkerStore = ReadMarkerStore(redis_cache=cache, storage=storage)
@@ -0,0 +1,125 @@
+import importlib
+import pkgutil
+import typing
+import uuid
+from datetime import datetime
+
+import loguru
+from src.repository.database import CassandraDatabase, database
+from src.repository.schema import versions
+from src.utilities.exceptions.database import SchemaMigrationLocked, SchemaVersionMismatch
+
+# A crashed migration run releases the lock on its own after this long
+_LOCK_TTL_SECONDS: int = 900
+
+
+class Migration(typing.NamedTuple):
+    version: int
+    description: str
+    upgrade: typing.Callable[[CassandraDatabase], typing.Awaitable[None]]
+
+
+def load_migrations() -> tuple[Migration, ...]:
+    """Collect the migrations of `src.repository.schema.versions`, ordered and checked to be contiguous."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(
+            Migration(version=module.version, description=(module.__doc__ or "").strip(), upgrade=module.upgrade)
+        )
+
+    migrations.sort(key=lambda migration: migration.version)
+    if [migration.version for migration in migrations] != list(range(1, len(migrations) + 1)):
+        raise ValueError(f"Schema migrations must be numbered 1..n, got {[m.version for m in migrations]}!")
+    return tuple(migrations)
+
+
+class SchemaMigrator:
+    def __init__(self, cassandra_db: CassandraDatabase, migrations: tuple[Migration, ...] | None = None):
+        """
+        Apply versioned schema migrations to the Cassandra keyspace and record them in `schema_migrations`.
+
+        Migrations run from a one-off command once per deploy, so DDL never races between booting workers;
+        workers only `check` that the recorded version is recent enough, which is a single small read.
+        """
+        self.cassandra_db: CassandraDatabase = cassandra_db
+        self.migrations: tuple[Migration, ...] = migrations if migrations is not None else load_migrations()
+
+    @property
+    def latest_version(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    async def applied_version(self) -> int:
+        if not self.cassandra_db.table_metadata("schema_migrations"):
+            return 0
+
+        result = await self.cassandra_db.execute_async("SELECT version FROM schema_migrations")
+        return max((row["version"] for row in result.current_rows), default=0)
+
+    async def check(self) -> int:
+        """
+        Return the applied schema version, raising when it is older than the latest migration of this code.
+
+        A newer version is accepted, so workers of the previous release keep running during a rollout.
+        """
+        applied_version = await self.applied_version()
+        if applied_version < self.latest_version:
+            raise SchemaVersionMismatch(
+                f"Schema is at version {applied_version} but version {self.latest_version} is required,"
+                " run `python -m src.commands.migrate upgrade`!"
+            )
+        return applied_version
+
+    async def upgrade(self, target_version: int | None = None) -> list[Migration]:
+        """Apply every pending migration up to `target_version`, the latest by default, under a cluster-wide lock."""
+        await self._create_bookkeeping_tables()
+        owner = uuid.uuid4()
+        await self._acquire_lock(owner)
+        try:
+            applied_version = await self.applied_version()
+            pending_migrations = [
+                migration
+                for migration in self.migrations
+                if applied_version < migration.version <= (target_version or self.latest_version)
+            ]
+
+            for migration in pending_migrations:
+                loguru.logger.info(f"Schema Migration -- Applying {migration.version}: {migration.description}")
+                await migration.upgrade(self.cassandra_db)
+                await self.cassandra_db.execute_async(
+                    "INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                    (migration.version, migration.description, datetime.now()),
+                )
+        finally:
+            await self._release_lock(owner)
+
+        loguru.logger.info(f"Schema Migration -- Schema is at version {applied_version + len(pending_migrations)}")
+        return pending_migrations
+
+    async def _create_bookkeeping_tables(self) -> None:
+        await self.cassandra_db.execute_async(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version int PRIMARY KEY, description text, applied_at timestamp)"
+        )
+        await self.cassandra_db.execute_async(
+            "CREATE TABLE IF NOT EXISTS schema_migration_lock ("
+            " lock_id text PRIMARY KEY, owner uuid, acquired_at timestamp)"
+        )
+
+    async def _acquire_lock(self, owner: uuid.UUID) -> None:
+        lock = await self.cassandra_db.execute_async(
+            "INSERT INTO schema_migration_lock (lock_id, owner, acquired_at) VALUES ('schema', %s, %s)"
+            f" IF NOT EXISTS USING TTL {_LOCK_TTL_SECONDS}",
+            (owner, datetime.now()),
+        )
+        if not lock.was_applied:
+            raise SchemaMigrationLocked(f"Schema migrations are already running: {lock.one()}")
+
+    async def _release_lock(self, owner: uuid.UUID) -> None:
+        await self.cassandra_db.execute_async(
+            "DELETE FROM schema_migration_lock WHERE lock_id = 'schema' IF owner = %s", (owner,)
+        )
+
+
+# Singleton instance of SchemaMigrator
+schema_migrator: SchemaMigrator = SchemaMigrator(cassandra_db=database)
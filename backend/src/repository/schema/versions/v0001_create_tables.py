@@ -0,0 +1,31 @@
+"""Create every table and index of the current data model."""
+
+from src.repository.database import CassandraDatabase
+
+version = 1
+
+STATEMENTS: tuple[str, ...] = (
+    "CREATE TABLE IF NOT EXISTS users (user_id uuid PRIMARY KEY, username text, email text, hashed_password text)"
+    " WITH compaction = {'class': 'LeveledCompactionStrategy'}",
+    "CREATE TABLE IF NOT EXISTS users_by_username (username text PRIMARY KEY, user_id uuid, email text)",
+    "CREATE TABLE IF NOT EXISTS users_by_email (email text PRIMARY KEY, user_id uuid, username text)",
+    "CREATE TABLE IF NOT EXISTS chatroom_messages ("
+    " chatroom_id uuid, bucket int, message_id timeuuid, message_text text, user_id uuid, created_at timestamp,"
+    " PRIMARY KEY ((chatroom_id, bucket), message_id)"
+    ") WITH CLUSTERING ORDER BY (message_id DESC)",
+    "CREATE TABLE IF NOT EXISTS chatroom_message_buckets ("
+    " chatroom_id uuid, bucket int, PRIMARY KEY (chatroom_id, bucket)"
+    ") WITH CLUSTERING ORDER BY (bucket DESC)",
+    "CREATE TABLE IF NOT EXISTS chatrooms (chatroom_id uuid PRIMARY KEY, chatroom_name text, created_at timestamp)",
+    "CREATE INDEX IF NOT EXISTS chatrooms_chatroom_name_idx ON chatrooms (chatroom_name)",
+    "CREATE TABLE IF NOT EXISTS room_members ("
+    " chatroom_id uuid, user_id uuid, joined_at timestamp, PRIMARY KEY (chatroom_id, user_id))",
+    "CREATE TABLE IF NOT EXISTS rooms_by_user ("
+    " user_id uuid, chatroom_id uuid, joined_at timestamp, PRIMARY KEY (user_id, chatroom_id))",
+)
+
+
+async def upgrade(cassandra_db: CassandraDatabase) -> None:
+    # DDL runs one statement at a time, each waiting for schema agreement before the next
+    for statement in STATEMENTS:
+        await cassandra_db.execute_async(statement)
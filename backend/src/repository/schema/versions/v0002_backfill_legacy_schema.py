@@ -0,0 +1,160 @@
+"""Move data of deployments created by `sync_table` at boot onto the current tables."""
+
+import asyncio
+import itertools
+import typing
+from datetime import datetime
+
+import loguru
+from cassandra.util import uuid_from_time
+from src.config.manager import settings
+from src.repository.crud.message import compute_message_bucket
+from src.repository.database import CassandraDatabase
+
+version = 2
+
+# Rows read per page while copying a legacy table
+_FETCH_SIZE: int = 1000
+
+
+async def upgrade(cassandra_db: CassandraDatabase) -> None:
+    # Every step checks the live schema first, so fresh installs skip them and a re-run resumes safely
+    await backfill_user_lookups(cassandra_db)
+    await backfill_room_members(cassandra_db)
+    await backfill_bucketed_messages(cassandra_db)
+
+
+async def backfill_user_lookups(cassandra_db: CassandraDatabase) -> None:
+    """Copy `users` into the lookup tables, then drop the secondary indexes they replace."""
+    users_table = cassandra_db.table_metadata("users")
+    legacy_indexes = [index.name for index in users_table.indexes.values()] if users_table else []
+    if not legacy_indexes:
+        return
+
+    claim_username = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO users_by_username (username, user_id, email) VALUES (?, ?, ?) IF NOT EXISTS",
+    )
+    claim_email = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO users_by_email (email, user_id, username) VALUES (?, ?, ?) IF NOT EXISTS",
+    )
+
+    copied_users = 0
+    async for users in cassandra_db.iterate_pages(
+        "SELECT user_id, username, email FROM users", fetch_size=_FETCH_SIZE
+    ):
+        results = await cassandra_db.execute_concurrent(
+            itertools.chain(
+                (claim_username.bind((user["username"], user["user_id"], user["email"])) for user in users),
+                (claim_email.bind((user["email"], user["user_id"], user["username"])) for user in users),
+            ),
+            concurrency=settings.BULK_WRITE_CONCURRENCY,
+        )
+        # Legacy data never enforced uniqueness; the first user to claim a duplicate keeps it
+        for result in results:
+            if not result.was_applied:  # type: ignore
+                loguru.logger.warning(
+                    f"Schema Migration -- Duplicate credential left to its first owner: {result.one()}"  # type: ignore
+                )
+        copied_users += len(users)
+
+    for index_name in legacy_indexes:
+        await cassandra_db.execute_async(f"DROP INDEX IF EXISTS {index_name}")
+    loguru.logger.info(f"Schema Migration -- Copied {copied_users} users into the lookup tables")
+
+
+async def backfill_room_members(cassandra_db: CassandraDatabase) -> None:
+    """Copy the `chatrooms.users` sets into the membership tables, then drop the column."""
+    chatrooms_table = cassandra_db.table_metadata("chatrooms")
+    if not chatrooms_table or "users" not in chatrooms_table.columns:
+        return
+
+    insert_member = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO room_members (chatroom_id, user_id, joined_at) VALUES (?, ?, ?)",
+    )
+    insert_room = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO rooms_by_user (user_id, chatroom_id, joined_at) VALUES (?, ?, ?)",
+    )
+
+    copied_memberships = 0
+    async for chatrooms in cassandra_db.iterate_pages(
+        "SELECT chatroom_id, users, created_at FROM chatrooms", fetch_size=_FETCH_SIZE
+    ):
+        memberships = [
+            (chatroom["chatroom_id"], user_id, chatroom["created_at"] or datetime.now())
+            for chatroom in chatrooms
+            for user_id in chatroom["users"] or ()
+        ]
+        await cassandra_db.execute_concurrent(
+            itertools.chain(
+                (insert_member.bind(membership) for membership in memberships),
+                (
+                    insert_room.bind((user_id, chatroom_id, joined_at))
+                    for chatroom_id, user_id, joined_at in memberships
+                ),
+            ),
+            concurrency=settings.BULK_WRITE_CONCURRENCY,
+        )
+        copied_memberships += len(memberships)
+
+    await cassandra_db.execute_async("ALTER TABLE chatrooms DROP users")
+    loguru.logger.info(f"Schema Migration -- Copied {copied_memberships} chatroom memberships")
+
+
+async def backfill_bucketed_messages(cassandra_db: CassandraDatabase) -> None:
+    """
+    Copy the legacy `messages` table into the time-bucketed `chatroom_messages`.
+
+    The legacy table is left in place, so it can be checked and dropped by hand once the copy is verified.
+    """
+    if not cassandra_db.table_metadata("messages"):
+        return
+
+    insert_message = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO chatroom_messages (chatroom_id, bucket, message_id, message_text, user_id, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+    )
+    insert_bucket = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO chatroom_message_buckets (chatroom_id, bucket) VALUES (?, ?)",
+    )
+
+    copied_messages = 0
+    indexed_buckets: set[tuple[typing.Any, int]] = set()
+    async for messages in cassandra_db.iterate_pages(
+        "SELECT chatroom_id, created_at, message_id, message_text, user_id FROM messages", fetch_size=_FETCH_SIZE
+    ):
+        rows = []
+        for message in messages:
+            # Legacy ids were time based by default, but the column accepted any UUID
+            message_id = message["message_id"]
+            if not message_id or message_id.version != 1:
+                message_id = uuid_from_time(message["created_at"])
+            bucket = compute_message_bucket(message_id)
+            rows.append(
+                (
+                    message["chatroom_id"],
+                    bucket,
+                    message_id,
+                    message["message_text"],
+                    message["user_id"],
+                    message["created_at"],
+                )
+            )
+
+        new_buckets = {(row[0], row[1]) for row in rows} - indexed_buckets
+        await cassandra_db.execute_concurrent(
+            itertools.chain(
+                (insert_message.bind(row) for row in rows),
+                (insert_bucket.bind(bucket) for bucket in new_buckets),
+            ),
+            concurrency=settings.BULK_WRITE_CONCURRENCY,
+        )
+        indexed_buckets |= new_buckets
+        copied_messages += len(rows)
+
+    loguru.logger.info(f"Schema Migration -- Copied {copied_messages} legacy messages into chatroom_messages")
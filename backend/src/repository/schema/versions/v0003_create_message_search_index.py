@@ -0,0 +1,51 @@
+"""Create the inverted index of message search and fill it from the stored messages."""
+
+import asyncio
+
+import loguru
+from src.config.manager import settings
+from src.repository.database import CassandraDatabase
+from src.repository.search import tokenize_message_text
+
+version = 3
+
+# Rows read per page while indexing the stored messages
+_FETCH_SIZE: int = 1000
+
+# Postings of a term are bucketed like the messages they point to, so no partition outgrows a message bucket
+STATEMENTS: tuple[str, ...] = (
+    "CREATE TABLE IF NOT EXISTS message_search_postings ("
+    " chatroom_id uuid, term text, bucket int, message_id timeuuid,"
+    " PRIMARY KEY ((chatroom_id, term, bucket), message_id)"
+    ") WITH CLUSTERING ORDER BY (message_id DESC)",
+)
+
+
+async def upgrade(cassandra_db: CassandraDatabase) -> None:
+    for statement in STATEMENTS:
+        await cassandra_db.execute_async(statement)
+    await backfill_message_search_index(cassandra_db)
+
+
+async def backfill_message_search_index(cassandra_db: CassandraDatabase) -> None:
+    """Index every stored message; postings are idempotent upserts, so a re-run only rewrites them."""
+    insert_posting = await asyncio.to_thread(
+        cassandra_db.session.prepare,  # type: ignore
+        "INSERT INTO message_search_postings (chatroom_id, term, bucket, message_id) VALUES (?, ?, ?, ?)",
+    )
+
+    indexed_messages = 0
+    async for messages in cassandra_db.iterate_pages(
+        "SELECT chatroom_id, bucket, message_id, message_text FROM chatroom_messages", fetch_size=_FETCH_SIZE
+    ):
+        await cassandra_db.execute_concurrent(
+            (
+                insert_posting.bind((message["chatroom_id"], term, message["bucket"], message["message_id"]))
+                for message in messages
+                for term in tokenize_message_text(message["message_text"] or "", settings.SEARCH_MESSAGE_MAX_TERMS)
+            ),
+            concurrency=settings.BULK_WRITE_CONCURRENCY,
+        )
+        indexed_messages += len(messages)
+
+    loguru.logger.info(f"Schema Migration -- Indexed {indexed_messages} messages for search")
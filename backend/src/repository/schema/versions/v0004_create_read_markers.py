@@ -0,0 +1,16 @@
+"""Create the table of per-user, per-room last-read markers."""
+
+from src.repository.database import CassandraDatabase
+
+version = 4
+
+# One partition per user, so every marker of a user is loaded with a single read
+STATEMENTS: tuple[str, ...] = (
+    "CREATE TABLE IF NOT EXISTS read_markers ("
+    " user_id uuid, chatroom_id uuid, message_id timeuuid, PRIMARY KEY (user_id, chatroom_id))",
+)
+
+
+async def upgrade(cassandra_db: CassandraDatabase) -> None:
+    for statement in STATEMENTS:
+        await cassandra_db.execute_async(statement)
@@ -0,0 +1,119 @@
+import asyncio
+import re
+import typing
+from uuid import UUID
+
+import loguru
+from src.config.manager import settings
+from src.repository.storage.base import StorageEngine
+from src.repository.storage.engine import storage
+from src.utilities.metrics import metrics_registry
+
+# Words of letters and digits; punctuation and whitespace separate terms
+_TERM_PATTERN: re.Pattern = re.compile(r"\w+")
+# Single characters match too much to be useful, overlong tokens are mostly pasted junk
+_MIN_TERM_LENGTH: int = 2
+_MAX_TERM_LENGTH: int = 64
+
+search_index_dropped_total = metrics_registry.counter(
+    "search_index_dropped_total", "Messages left out of the search index because its queue was full."
+)
+
+
+class IndexedMessage(typing.NamedTuple):
+    chatroom_id: UUID
+    bucket: int
+    message_id: UUID
+    message_text: str
+
+
+def tokenize_message_text(text: str, max_terms: int | None = None) -> list[str]:
+    """Return the distinct search terms of `text`, case-folded, in order of first appearance."""
+    terms = dict.fromkeys(
+        term for term in _TERM_PATTERN.findall(text.casefold()) if _MIN_TERM_LENGTH <= len(term) <= _MAX_TERM_LENGTH
+    )
+    return list(terms)[:max_terms]
+
+
+class MessageSearchIndexer:
+    def __init__(self, storage: StorageEngine):
+        """
+        Background writer of the `message_search_postings` inverted index.
+
+        Messages are handed over once persisted and tokenized here, off the write path: `enqueue` never waits,
+        and when the queue is full the message is left unindexed rather than slowing ingestion down. Postings
+        of up to `SEARCH_INDEX_BATCH_SIZE` messages are written concurrently per round.
+        """
+        self.storage: StorageEngine = storage
+        self._queue: asyncio.Queue[IndexedMessage | None] | None = None
+        self._indexer_task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be indexed."""
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self) -> None:
+        if self._indexer_task is None or self._indexer_task.done():
+            self._queue = asyncio.Queue(maxsize=settings.SEARCH_INDEX_QUEUE_SIZE)
+            self._indexer_task = asyncio.create_task(self._index_continuously())
+
+    def enqueue(self, messages: typing.Iterable[IndexedMessage]) -> None:
+        self.start()
+        for message in messages:
+            try:
+                self._queue.put_nowait(message)  # type: ignore
+            except asyncio.QueueFull:
+                search_index_dropped_total.inc()
+                loguru.logger.warning(f"Search Index -- Queue full, message {message.message_id} left unindexed")
+
+    async def close(self) -> None:
+        """Index everything still queued and stop."""
+        if self._indexer_task is None:
+            return
+
+        await self._queue.put(None)  # type: ignore
+        await self._indexer_task
+        self._indexer_task = None
+
+    async def _index_continuously(self) -> None:
+        is_draining = False
+        while not is_draining:
+            first_message = await self._queue.get()  # type: ignore
+            if first_message is None:
+                break
+
+            # Only what is already queued joins the round, so a lone message is indexed right away
+            messages = [first_message]
+            while len(messages) < settings.SEARCH_INDEX_BATCH_SIZE and not self._queue.empty():  # type: ignore
+                message = self._queue.get_nowait()  # type: ignore
+                if message is None:
+                    is_draining = True
+                    break
+                messages.append(message)
+
+            try:
+                await self.index_messages(messages)
+            except Exception as e:
+                loguru.logger.error(f"Search Index -- Failed to index {len(messages)} messages: {e!r}")
+
+    async def index_messages(self, messages: typing.Iterable[IndexedMessage]) -> None:
+        await self.storage.execute_prepared_concurrent(
+            (
+                ("message_search.insert", (message.chatroom_id, term, message.bucket, message.message_id))
+                for message in messages
+                for term in tokenize_message_text(message.message_text, settings.SEARCH_MESSAGE_MAX_TERMS)
+            ),
+            concurrency=settings.BULK_WRITE_CONCURRENCY,
+        )
+
+
+# Singleton instance of MessageSearchIndexer
+message_search_indexer: MessageSearchIndexer = MessageSearchIndexer(storage=storage)
+
+metrics_registry.gauge(
+    "search_index_pending",
+    "Messages persisted and waiting to be indexed for search.",
+    (),
+    callback=lambda: {(): message_search_indexer.pending},
+)
@@ -0,0 +1,117 @@
+import typing
+
+import loguru
+from cassandra.cluster import Session
+from cassandra.query import PreparedStatement
+
+# Hot-path CQL for every table, keyed by the name repositories use to look them up. Columns are always listed
+# explicitly so a schema change never alters the result metadata of an already prepared statement.
+CQL_STATEMENTS: dict[str, str] = {
+    # User
+    "user.insert": "INSERT INTO users (user_id, username, email, hashed_password) VALUES (?, ?, ?, ?)",
+    "user.update_profile": "UPDATE users SET username = ?, email = ? WHERE user_id = ?",
+    "user.update_password": "UPDATE users SET hashed_password = ? WHERE user_id = ?",
+    "user.delete": "DELETE FROM users WHERE user_id = ?",
+    "user.select_all": "SELECT user_id, username, email FROM users",
+    "user.select_by_id": "SELECT user_id, username, email FROM users WHERE user_id = ?",
+    "user.select_by_username": "SELECT user_id, username, email FROM users_by_username WHERE username = ?",
+    "user.select_by_email": "SELECT user_id, username, email FROM users_by_email WHERE email = ?",
+    "user.claim_username": "INSERT INTO users_by_username (username, user_id, email) VALUES (?, ?, ?) IF NOT EXISTS",
+    "user.claim_email": "INSERT INTO users_by_email (email, user_id, username) VALUES (?, ?, ?) IF NOT EXISTS",
+    "user.release_username": "DELETE FROM users_by_username WHERE username = ? IF user_id = ?",
+    "user.release_email": "DELETE FROM users_by_email WHERE email = ? IF user_id = ?",
+    "user.set_username_lookup_email": "UPDATE users_by_username SET email = ? WHERE username = ?",
+    "user.set_email_lookup_username": "UPDATE users_by_email SET username = ? WHERE email = ?",
+    # Message
+    "message.insert": (
+        "INSERT INTO chatroom_messages (chatroom_id, bucket, message_id, message_text, user_id, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)"
+    ),
+    "message.select_latest": (
+        "SELECT chatroom_id, bucket, message_id, message_text, user_id, created_at FROM chatroom_messages"
+        " WHERE chatroom_id = ? AND bucket = ? LIMIT ?"
+    ),
+    "message.select_before": (
+        "SELECT chatroom_id, bucket, message_id, message_text, user_id, created_at FROM chatroom_messages"
+        " WHERE chatroom_id = ? AND bucket = ? AND message_id < ? LIMIT ?"
+    ),
+    "message_bucket.insert": "INSERT INTO chatroom_message_buckets (chatroom_id, bucket) VALUES (?, ?)",
+    "message_bucket.select_latest": "SELECT bucket FROM chatroom_message_buckets WHERE chatroom_id = ? LIMIT 1",
+    "message_bucket.select_before": (
+        "SELECT bucket FROM chatroom_message_buckets WHERE chatroom_id = ? AND bucket < ? LIMIT 1"
+    ),
+    # Message search
+    "message_search.insert": (
+        "INSERT INTO message_search_postings (chatroom_id, term, bucket, message_id) VALUES (?, ?, ?, ?)"
+    ),
+    "message_search.select_latest": (
+        "SELECT message_id FROM message_search_postings WHERE chatroom_id = ? AND term = ? AND bucket = ? LIMIT ?"
+    ),
+    "message_search.select_before": (
+        "SELECT message_id FROM message_search_postings"
+        " WHERE chatroom_id = ? AND term = ? AND bucket = ? AND message_id < ? LIMIT ?"
+    ),
+    "message_search.select_matching": (
+        "SELECT message_id FROM message_search_postings"
+        " WHERE chatroom_id = ? AND term = ? AND bucket = ? AND message_id IN ?"
+    ),
+    # Chatroom
+    "chatroom.insert": "INSERT INTO chatrooms (chatroom_id, chatroom_name, created_at) VALUES (?, ?, ?)",
+    "chatroom.select_by_id": "SELECT chatroom_id, chatroom_name, created_at FROM chatrooms WHERE chatroom_id = ?",
+    "room_member.insert": "INSERT INTO room_members (chatroom_id, user_id, joined_at) VALUES (?, ?, ?)",
+    "room_member.delete": "DELETE FROM room_members WHERE chatroom_id = ? AND user_id = ?",
+    "room_member.select": "SELECT user_id FROM room_members WHERE chatroom_id = ? AND user_id = ?",
+    "room_member.select_all": "SELECT user_id, joined_at FROM room_members WHERE chatroom_id = ?",
+    "room_by_user.insert": "INSERT INTO rooms_by_user (user_id, chatroom_id, joined_at) VALUES (?, ?, ?)",
+    "room_by_user.delete": "DELETE FROM rooms_by_user WHERE user_id = ? AND chatroom_id = ?",
+    "room_by_user.select_all": "SELECT chatroom_id, joined_at FROM rooms_by_user WHERE user_id = ?",
+    # Read marker; the write timestamp is the marker's message time, so the latest position wins whatever the order
+    "read_marker.upsert": (
+        "INSERT INTO read_markers (user_id, chatroom_id, message_id) VALUES (?, ?, ?) USING TIMESTAMP ?"
+    ),
+    "read_marker.select_all": "SELECT chatroom_id, message_id FROM read_markers WHERE user_id = ?",
+}
+
+
+class PreparedStatementRegistry:
+    def __init__(self, statements: dict[str, str]):
+        """Hold the CQL of every named statement and its prepared counterpart once prepared."""
+        self._statements: dict[str, str] = statements
+        self._prepared: dict[str, PreparedStatement] = {}
+        self._names_by_query_id: dict[bytes, str] = {}
+
+    def prepare_all(self, session: Session) -> None:
+        """
+        Prepare every registered statement on `session`.
+
+        The driver keeps them prepared afterwards: they are re-prepared on hosts that come back up or join
+        (`reprepare_on_up`), and transparently when a node answers UNPREPARED after a restart or schema change.
+        """
+        self._prepared = {name: session.prepare(cql) for name, cql in self._statements.items()}
+        # Only reads may be speculatively sent to a second replica; writes such as LWTs must not be repeated
+        for name, prepared_statement in self._prepared.items():
+            prepared_statement.is_idempotent = self._statements[name].lstrip().upper().startswith("SELECT")
+        self._names_by_query_id = {prepared.query_id: name for name, prepared in self._prepared.items()}
+        loguru.logger.info(f"Prepared Statements -- {len(self._prepared)} statements prepared")
+
+    def clear(self) -> None:
+        self._prepared = {}
+        self._names_by_query_id = {}
+
+    def name_of(self, prepared_statement: PreparedStatement) -> str | None:
+        """Return the registered name a prepared statement was prepared under, if any."""
+        return self._names_by_query_id.get(prepared_statement.query_id)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._prepared
+
+    def __getitem__(self, name: str) -> PreparedStatement:
+        try:
+            return self._prepared[name]
+        except KeyError:
+            if name in self._statements:
+                raise LookupError(f"Statement `{name}` has not been prepared yet!") from None
+            raise LookupError(f"Statement `{name}` is not registered!") from None
+
+    def names(self) -> typing.KeysView[str]:
+        return self._statements.keys()
@@ -0,0 +1,64 @@
+import abc
+import typing
+
+
+class StorageResult(typing.Protocol):
+    """First page of a query result, as returned by the driver's `ResultSet`."""
+
+    current_rows: list[dict[str, typing.Any]]
+    paging_state: bytes | None
+    was_applied: bool
+
+    def one(self) -> dict[str, typing.Any] | None: ...
+
+
+class StorageEngine(abc.ABC):
+    """
+    Backend the repositories read and write through.
+
+    Queries are addressed by their name in `CQL_STATEMENTS`, so every engine answers the same set of queries
+    with the same ordering, paging and conditional-write (`IF [NOT] EXISTS`) semantics.
+    """
+
+    @abc.abstractmethod
+    async def connect(self) -> None:
+        """Make the engine usable; called once at startup."""
+
+    @abc.abstractmethod
+    async def execute_prepared(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        paging_state: bytes | None = None,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> StorageResult:
+        """Execute the registered statement `name` and return its first page, starting at `paging_state`."""
+
+    @abc.abstractmethod
+    def iterate_prepared_pages(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+        """Yield the rows of the registered statement `name` page by page."""
+
+    @abc.abstractmethod
+    async def execute_prepared_batch(
+        self, name: str, parameter_rows: typing.Sequence[typing.Sequence[typing.Any]]
+    ) -> None:
+        """Apply the registered write `name` once per parameter row, atomically; every row must share a partition."""
+
+    @abc.abstractmethod
+    async def execute_prepared_concurrent(
+        self, statements: typing.Iterable[tuple[str, typing.Sequence[typing.Any]]], concurrency: int
+    ) -> None:
+        """Apply `(name, parameters)` writes with at most `concurrency` of them in flight."""
+
+    @abc.abstractmethod
+    def shutdown(self) -> None:
+        """Release the engine's connections."""
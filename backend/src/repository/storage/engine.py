@@ -0,0 +1,17 @@
+from src.config.manager import settings
+from src.repository.database import database
+from src.repository.storage.base import StorageEngine
+from src.repository.storage.memory import InMemoryDatabase
+
+
+def create_storage_engine(backend: str) -> StorageEngine:
+    if backend == "cassandra":
+        # The Cassandra engine is shared with schema migrations, which always need the cluster
+        return database
+    if backend == "memory":
+        return InMemoryDatabase()
+    raise ValueError(f"Unknown storage backend `{backend}`, expected `cassandra` or `memory`!")
+
+
+# Singleton instance of the StorageEngine selected by `STORAGE_BACKEND`
+storage: StorageEngine = create_storage_engine(backend=settings.STORAGE_BACKEND)
@@ -0,0 +1,427 @@
+import bisect
+import typing
+import uuid
+from datetime import datetime
+
+import loguru
+from src.repository.statements import CQL_STATEMENTS
+from src.repository.storage.base import StorageEngine
+
+# Page size the driver uses when a statement does not set one
+_DEFAULT_FETCH_SIZE: int = 5000
+
+_USER_COLUMNS: tuple[str, ...] = ("user_id", "username", "email")
+_MESSAGE_COLUMNS: tuple[str, ...] = ("chatroom_id", "bucket", "message_id", "message_text", "user_id", "created_at")
+_CHATROOM_COLUMNS: tuple[str, ...] = ("chatroom_id", "chatroom_name", "created_at")
+
+
+def _sort_key(value: typing.Any) -> typing.Any:
+    """Order a value the way Cassandra orders its column type; `uuid`/`timeuuid` values sort by timestamp first."""
+    if isinstance(value, uuid.UUID):
+        return value.version or 0, value.time if value.version == 1 else 0, value.bytes
+    return value
+
+
+def _to_stored(value: typing.Any) -> typing.Any:
+    # Cassandra timestamps only keep milliseconds
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def encode_paging_state(last_key: uuid.UUID) -> bytes:
+    return last_key.bytes
+
+
+def decode_paging_state(paging_state: bytes | None) -> uuid.UUID | None:
+    if paging_state is None:
+        return None
+    if len(paging_state) != 16:
+        raise ValueError("Malformed paging state")
+    return uuid.UUID(bytes=paging_state)
+
+
+class MemoryResult:
+    def __init__(self, rows: list[dict[str, typing.Any]], paging_state: bytes | None = None, was_applied: bool = True):
+        """First page of an in-memory query, shaped like the driver's `ResultSet`."""
+        self.current_rows: list[dict[str, typing.Any]] = rows
+        self.paging_state: bytes | None = paging_state
+        self.was_applied: bool = was_applied
+
+    def one(self) -> dict[str, typing.Any] | None:
+        return self.current_rows[0] if self.current_rows else None
+
+
+class _Partition:
+    def __init__(self):
+        self.rows: dict[typing.Any, dict[str, typing.Any]] = {}
+        # Clustering sort keys of `rows`, ascending
+        self.order: list[typing.Any] = []
+
+
+class MemoryTable:
+    def __init__(self, partition_key: tuple[str, ...], clustering_key: str | None = None, is_descending: bool = False):
+        """
+        Rows of one table grouped by partition, kept in the clustering order of the Cassandra table they mirror.
+
+        Partitions themselves are kept ordered by key, standing in for the token order of full-table scans.
+        """
+        self.partition_key: tuple[str, ...] = partition_key
+        self.clustering_key: str | None = clustering_key
+        self.is_descending: bool = is_descending
+        self._partitions: dict[tuple, _Partition] = {}
+        self._partition_order: list[tuple] = []
+
+    def _locate(self, row: dict[str, typing.Any]) -> tuple[tuple, typing.Any]:
+        partition_key = tuple(_sort_key(row[column]) for column in self.partition_key)
+        clustering_key = _sort_key(row[self.clustering_key]) if self.clustering_key else None
+        return partition_key, clustering_key
+
+    def get(self, key: dict[str, typing.Any]) -> dict[str, typing.Any] | None:
+        partition_key, clustering_key = self._locate(key)
+        partition = self._partitions.get(partition_key)
+        return partition.rows.get(clustering_key) if partition else None
+
+    def upsert(self, row: dict[str, typing.Any]) -> None:
+        """Write `row`, merging it into the stored row with the same primary key like a CQL `INSERT`/`UPDATE`."""
+        partition_key, clustering_key = self._locate(row)
+        partition = self._partitions.get(partition_key)
+        if partition is None:
+            partition = self._partitions[partition_key] = _Partition()
+            bisect.insort(self._partition_order, partition_key)
+
+        stored_row = partition.rows.get(clustering_key)
+        if stored_row is None:
+            partition.rows[clustering_key] = {column: _to_stored(value) for column, value in row.items()}
+            if self.clustering_key:
+                bisect.insort(partition.order, clustering_key)
+        else:
+            stored_row.update({column: _to_stored(value) for column, value in row.items()})
+
+    def delete(self, key: dict[str, typing.Any]) -> None:
+        partition_key, clustering_key = self._locate(key)
+        partition = self._partitions.get(partition_key)
+        if partition is None or partition.rows.pop(clustering_key, None) is None:
+            return
+
+        if self.clustering_key:
+            del partition.order[bisect.bisect_left(partition.order, clustering_key)]
+        if not partition.rows:
+            del self._partitions[partition_key]
+            del self._partition_order[bisect.bisect_left(self._partition_order, partition_key)]
+
+    def select(
+        self,
+        partition: dict[str, typing.Any],
+        limit: int | None = None,
+        below: typing.Any = None,
+        after: typing.Any = None,
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Read a partition in clustering order: rows clustered below `below` and past `after` in that order.
+        """
+        stored_partition = self._partitions.get(tuple(_sort_key(partition[column]) for column in self.partition_key))
+        if stored_partition is None:
+            return []
+
+        order = stored_partition.order
+        start = 0
+        end = bisect.bisect_left(order, _sort_key(below)) if below is not None else len(order)
+        if self.is_descending:
+            if after is not None:
+                end = min(end, bisect.bisect_left(order, _sort_key(after)))
+            keys = order[max(start, end - limit) if limit is not None else start : end][::-1]
+        else:
+            if after is not None:
+                start = bisect.bisect_right(order, _sort_key(after))
+            keys = order[start : min(end, start + limit) if limit is not None else end]
+        return [stored_partition.rows[key] for key in keys]
+
+    def select_in(
+        self, partition: dict[str, typing.Any], keys: typing.Iterable[typing.Any]
+    ) -> list[dict[str, typing.Any]]:
+        """Read the rows of a partition clustered at any of `keys`, in clustering order, like `IN` on the key."""
+        stored_partition = self._partitions.get(tuple(_sort_key(partition[column]) for column in self.partition_key))
+        if stored_partition is None:
+            return []
+
+        clustering_keys = sorted(
+            {_sort_key(key) for key in keys} & stored_partition.rows.keys(), reverse=self.is_descending
+        )
+        return [stored_partition.rows[key] for key in clustering_keys]
+
+    def scan(self, limit: int, after: typing.Any = None) -> list[dict[str, typing.Any]]:
+        """Read a table keyed by a single partition column, whole partitions at a time, past partition `after`."""
+        start = bisect.bisect_right(self._partition_order, (_sort_key(after),)) if after is not None else 0
+        rows: list[dict[str, typing.Any]] = []
+        for partition_key in self._partition_order[start:]:
+            rows.extend(self._partitions[partition_key].rows.values())
+            if len(rows) >= limit:
+                break
+        return rows[:limit]
+
+
+StatementHandler = typing.Callable[[typing.Sequence[typing.Any], int, uuid.UUID | None], MemoryResult]
+
+
+class InMemoryDatabase(StorageEngine):
+    def __init__(self):
+        """
+        Storage engine keeping every table in process memory, for single-node deployments and benchmarks.
+
+        It answers the registered statements with Cassandra's semantics: rows come back in clustering order,
+        listings page through opaque paging states and `IF [NOT] EXISTS` writes report `was_applied`. Every
+        statement runs to completion without yielding to the event loop, so conditional writes are atomic.
+        Data lives as long as the process does.
+        """
+        self.users = MemoryTable(partition_key=("user_id",))
+        self.users_by_username = MemoryTable(partition_key=("username",))
+        self.users_by_email = MemoryTable(partition_key=("email",))
+        self.chatroom_messages = MemoryTable(
+            partition_key=("chatroom_id", "bucket"), clustering_key="message_id", is_descending=True
+        )
+        self.chatroom_message_buckets = MemoryTable(
+            partition_key=("chatroom_id",), clustering_key="bucket", is_descending=True
+        )
+        self.message_search_postings = MemoryTable(
+            partition_key=("chatroom_id", "term", "bucket"), clustering_key="message_id", is_descending=True
+        )
+        self.chatrooms = MemoryTable(partition_key=("chatroom_id",))
+        self.room_members = MemoryTable(partition_key=("chatroom_id",), clustering_key="user_id")
+        self.rooms_by_user = MemoryTable(partition_key=("user_id",), clustering_key="chatroom_id")
+        self.read_markers = MemoryTable(partition_key=("user_id",), clustering_key="chatroom_id")
+        self._handlers: dict[str, StatementHandler] = self._build_handlers()
+
+        missing_statements = CQL_STATEMENTS.keys() - self._handlers.keys()
+        if missing_statements:
+            raise NotImplementedError(f"In-memory storage does not implement {sorted(missing_statements)}!")
+
+    def _build_handlers(self) -> dict[str, StatementHandler]:
+        return {
+            # User
+            "user.insert": self._writer(self.users, ("user_id", "username", "email", "hashed_password")),
+            "user.update_profile": self._writer(self.users, ("username", "email", "user_id")),
+            "user.update_password": self._writer(self.users, ("hashed_password", "user_id")),
+            "user.delete": self._deleter(self.users, ("user_id",)),
+            "user.select_all": lambda parameters, fetch_size, after: self._page(
+                self.users.scan(limit=fetch_size + 1, after=after), "user_id", _USER_COLUMNS, fetch_size
+            ),
+            "user.select_by_id": self._reader(self.users, ("user_id",), _USER_COLUMNS),
+            "user.select_by_username": self._reader(self.users_by_username, ("username",), _USER_COLUMNS),
+            "user.select_by_email": self._reader(self.users_by_email, ("email",), _USER_COLUMNS),
+            "user.claim_username": self._claimer(self.users_by_username, ("username", "user_id", "email")),
+            "user.claim_email": self._claimer(self.users_by_email, ("email", "user_id", "username")),
+            "user.release_username": self._releaser(self.users_by_username, "username", "user_id"),
+            "user.release_email": self._releaser(self.users_by_email, "email", "user_id"),
+            "user.set_username_lookup_email": self._writer(self.users_by_username, ("email", "username")),
+            "user.set_email_lookup_username": self._writer(self.users_by_email, ("username", "email")),
+            # Message
+            "message.insert": self._writer(self.chatroom_messages, _MESSAGE_COLUMNS),
+            "message.select_latest": lambda parameters, *_: self._result(
+                self.chatroom_messages.select(
+                    {"chatroom_id": parameters[0], "bucket": parameters[1]}, limit=parameters[2]
+                ),
+                _MESSAGE_COLUMNS,
+            ),
+            "message.select_before": lambda parameters, *_: self._result(
+                self.chatroom_messages.select(
+                    {"chatroom_id": parameters[0], "bucket": parameters[1]}, limit=parameters[3], below=parameters[2]
+                ),
+                _MESSAGE_COLUMNS,
+            ),
+            "message_bucket.insert": self._writer(self.chatroom_message_buckets, ("chatroom_id", "bucket")),
+            "message_bucket.select_latest": lambda parameters, *_: self._result(
+                self.chatroom_message_buckets.select({"chatroom_id": parameters[0]}, limit=1), ("bucket",)
+            ),
+            "message_bucket.select_before": lambda parameters, *_: self._result(
+                self.chatroom_message_buckets.select({"chatroom_id": parameters[0]}, limit=1, below=parameters[1]),
+                ("bucket",),
+            ),
+            # Message search
+            "message_search.insert": self._writer(
+                self.message_search_postings, ("chatroom_id", "term", "bucket", "message_id")
+            ),
+            "message_search.select_latest": lambda parameters, *_: self._result(
+                self.message_search_postings.select(
+                    {"chatroom_id": parameters[0], "term": parameters[1], "bucket": parameters[2]}, limit=parameters[3]
+                ),
+                ("message_id",),
+            ),
+            "message_search.select_before": lambda parameters, *_: self._result(
+                self.message_search_postings.select(
+                    {"chatroom_id": parameters[0], "term": parameters[1], "bucket": parameters[2]},
+                    limit=parameters[4],
+                    below=parameters[3],
+                ),
+                ("message_id",),
+            ),
+            "message_search.select_matching": lambda parameters, *_: self._result(
+                self.message_search_postings.select_in(
+                    {"chatroom_id": parameters[0], "term": parameters[1], "bucket": parameters[2]}, parameters[3]
+                ),
+                ("message_id",),
+            ),
+            # Chatroom
+            "chatroom.insert": self._writer(self.chatrooms, _CHATROOM_COLUMNS),
+            "chatroom.select_by_id": self._reader(self.chatrooms, ("chatroom_id",), _CHATROOM_COLUMNS),
+            "room_member.insert": self._writer(self.room_members, ("chatroom_id", "user_id", "joined_at")),
+            "room_member.delete": self._deleter(self.room_members, ("chatroom_id", "user_id")),
+            "room_member.select": self._reader(self.room_members, ("chatroom_id", "user_id"), ("user_id",)),
+            "room_member.select_all": lambda parameters, fetch_size, after: self._page(
+                self.room_members.select({"chatroom_id": parameters[0]}, limit=fetch_size + 1, after=after),
+                "user_id",
+                ("user_id", "joined_at"),
+                fetch_size,
+            ),
+            "room_by_user.insert": self._writer(self.rooms_by_user, ("user_id", "chatroom_id", "joined_at")),
+            "room_by_user.delete": self._deleter(self.rooms_by_user, ("user_id", "chatroom_id")),
+            "room_by_user.select_all": lambda parameters, fetch_size, after: self._page(
+                self.rooms_by_user.select({"user_id": parameters[0]}, limit=fetch_size + 1, after=after),
+                "chatroom_id",
+                ("chatroom_id", "joined_at"),
+                fetch_size,
+            ),
+            # Read marker
+            "read_marker.upsert": self._timestamped_writer(
+                self.read_markers, ("user_id", "chatroom_id", "message_id")
+            ),
+            "read_marker.select_all": lambda parameters, fetch_size, after: self._page(
+                self.read_markers.select({"user_id": parameters[0]}, limit=fetch_size + 1, after=after),
+                "chatroom_id",
+                ("chatroom_id", "message_id"),
+                fetch_size,
+            ),
+        }
+
+    @staticmethod
+    def _result(rows: list[dict[str, typing.Any]], columns: tuple[str, ...]) -> MemoryResult:
+        # Rows are copied, so callers never hold on to stored state
+        return MemoryResult([{column: row.get(column) for column in columns} for row in rows])
+
+    @classmethod
+    def _page(
+        cls, rows: list[dict[str, typing.Any]], key_column: str, columns: tuple[str, ...], fetch_size: int
+    ) -> MemoryResult:
+        # One row past the page is read to know whether another page follows
+        result = cls._result(rows[:fetch_size], columns)
+        if len(rows) > fetch_size:
+            result.paging_state = encode_paging_state(rows[fetch_size - 1][key_column])
+        return result
+
+    @staticmethod
+    def _writer(table: MemoryTable, columns: tuple[str, ...]) -> StatementHandler:
+        def _write(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            table.upsert(dict(zip(columns, parameters)))
+            return MemoryResult([])
+
+        return _write
+
+    @staticmethod
+    def _timestamped_writer(table: MemoryTable, columns: tuple[str, ...]) -> StatementHandler:
+        # `USING TIMESTAMP` writes: the last parameter is the write time, and an older write loses to a newer one
+        def _write(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            row = dict(zip(columns, parameters[:-1]))
+            stored_row = table.get(row)
+            if stored_row is None or stored_row["_written_at"] <= parameters[-1]:
+                table.upsert({**row, "_written_at": parameters[-1]})
+            return MemoryResult([])
+
+        return _write
+
+    @staticmethod
+    def _deleter(table: MemoryTable, key_columns: tuple[str, ...]) -> StatementHandler:
+        def _delete(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            table.delete(dict(zip(key_columns, parameters)))
+            return MemoryResult([])
+
+        return _delete
+
+    @classmethod
+    def _reader(cls, table: MemoryTable, key_columns: tuple[str, ...], columns: tuple[str, ...]) -> StatementHandler:
+        def _read(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            row = table.get(dict(zip(key_columns, parameters)))
+            return cls._result([row] if row else [], columns)
+
+        return _read
+
+    @staticmethod
+    def _claimer(table: MemoryTable, columns: tuple[str, ...]) -> StatementHandler:
+        def _claim(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            row = dict(zip(columns, parameters))
+            if table.get(row):
+                return MemoryResult([], was_applied=False)
+            table.upsert(row)
+            return MemoryResult([])
+
+        return _claim
+
+    @staticmethod
+    def _releaser(table: MemoryTable, key_column: str, owner_column: str) -> StatementHandler:
+        def _release(parameters: typing.Sequence[typing.Any], *_: typing.Any) -> MemoryResult:
+            key, owner = parameters
+            row = table.get({key_column: key})
+            if not row or row.get(owner_column) != owner:
+                return MemoryResult([], was_applied=False)
+            table.delete({key_column: key})
+            return MemoryResult([])
+
+        return _release
+
+    async def connect(self) -> None:
+        loguru.logger.info("Database Connection -- Using in-memory storage, data is lost when the process exits")
+
+    def _run(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None,
+        paging_state: bytes | None = None,
+        fetch_size: int | None = None,
+    ) -> MemoryResult:
+        try:
+            handler = self._handlers[name]
+        except KeyError:
+            raise LookupError(f"Statement `{name}` is not registered!") from None
+        return handler(parameters or (), fetch_size or _DEFAULT_FETCH_SIZE, decode_paging_state(paging_state))
+
+    async def execute_prepared(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        paging_state: bytes | None = None,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> MemoryResult:
+        """Run the registered statement `name`; `consistency_level` is accepted for parity and ignored."""
+        return self._run(name, parameters, paging_state=paging_state, fetch_size=fetch_size)
+
+    async def iterate_prepared_pages(
+        self,
+        name: str,
+        parameters: typing.Sequence[typing.Any] | None = None,
+        *,
+        fetch_size: int | None = None,
+        consistency_level: int | None = None,
+    ) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+        paging_state: bytes | None = None
+        while True:
+            result = self._run(name, parameters, paging_state=paging_state, fetch_size=fetch_size)
+            yield result.current_rows
+            paging_state = result.paging_state
+            if not paging_state:
+                break
+
+    async def execute_prepared_batch(
+        self, name: str, parameter_rows: typing.Sequence[typing.Sequence[typing.Any]]
+    ) -> None:
+        for parameters in parameter_rows:
+            self._run(name, parameters)
+
+    async def execute_prepared_concurrent(
+        self, statements: typing.Iterable[tuple[str, typing.Sequence[typing.Any]]], concurrency: int
+    ) -> None:
+        for name, parameters in statements:
+            self._run(name, parameters)
+
+    def shutdown(self) -> None:
+        pass
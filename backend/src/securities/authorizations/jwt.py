@@ -1,17 +1,89 @@
+import collections
 import datetime
+import hashlib
+import threading
+import time
 
 import pydantic
 from jose import jwt as jose_jwt, JWTError as JoseJWTError
 
 from src.config.manager import settings
-from backend.src.models.db.models import Account
+from src.models.schemas.account import UserInResponse as Account
 from src.models.schemas.jwt import JWTAccount, JWToken
 from src.utilities.exceptions.database import EntityDoesNotExist
+from src.utilities.metrics import metrics_registry
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        """
+        Bounded LRU of tokens whose signature and payload were already verified, each kept until its `exp`.
+
+        Entries are keyed by a digest of the signing key and the token, so raw tokens are never held in memory
+        and a token verified against one key is never served for another.
+        """
+        self.max_size: int = max_size
+        self._entries: collections.OrderedDict[bytes, tuple[float, tuple[str, str]]] = collections.OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Counters since startup; expired entries found on lookup count as misses and expirations."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    @staticmethod
+    def digest(token: str, secret_key: str) -> bytes:
+        return hashlib.sha256(f"{secret_key}\x00{token}".encode()).digest()
+
+    def get(self, key: bytes) -> tuple[str, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, details = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return details
+
+    def set(self, key: bytes, details: tuple[str, str], expires_at: float) -> None:
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, details)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 class JWTGenerator:
     def __init__(self):
-        pass
+        self.verified_tokens: VerifiedTokenCache = VerifiedTokenCache(max_size=settings.JWT_CACHE_SIZE)
 
     def _generate_jwt_token(
         self,
@@ -41,6 +113,12 @@ class JWTGenerator:
         )
 
     def retrieve_details_from_token(self, token: str, secret_key: str) -> list[str]:
+        # Repeat presentations of a still valid token skip the signature check and the payload validation
+        cache_key = self.verified_tokens.digest(token=token, secret_key=secret_key)
+        cached_details = self.verified_tokens.get(cache_key)
+        if cached_details:
+            return list(cached_details)
+
         try:
             payload = jose_jwt.decode(token=token, key=secret_key, algorithms=[settings.JWT_ALGORITHM])
             jwt_account = JWTAccount(username=payload["username"], email=payload["email"])
@@ -51,6 +129,12 @@ class JWTGenerator:
         except pydantic.ValidationError as validation_error:
             raise ValueError("Invalid payload in token") from validation_error
 
+        # `decode` already rejected expired tokens; tokens without `exp` never expire and are not cached
+        if isinstance(payload.get("exp"), (int, float)):
+            self.verified_tokens.set(
+                cache_key, details=(jwt_account.username, jwt_account.email), expires_at=payload["exp"]
+            )
+
         return [jwt_account.username, jwt_account.email]
 
 
@@ -59,3 +143,30 @@ def get_jwt_generator() -> JWTGenerator:
 
 
 jwt_generator: JWTGenerator = get_jwt_generator()
+
+metrics_registry.gauge(
+    "jwt_cache_lookups_total",
+    "Verified token cache lookups by outcome; expired entries found on lookup count as misses.",
+    ("result",),
+    callback=lambda: {
+        ("hit",): jwt_generator.verified_tokens.hits,
+        ("miss",): jwt_generator.verified_tokens.misses,
+    },
+    metric_type="counter",
+)
+metrics_registry.gauge(
+    "jwt_cache_removals_total",
+    "Entries dropped from the verified token cache by reason.",
+    ("reason",),
+    callback=lambda: {
+        ("evicted",): jwt_generator.verified_tokens.evictions,
+        ("expired",): jwt_generator.verified_tokens.expirations,
+    },
+    metric_type="counter",
+)
+metrics_registry.gauge(
+    "jwt_cache_entries",
+    "Tokens held in the verified token cache.",
+    (),
+    callback=lambda: {(): jwt_generator.verified_tokens.stats["size"]},
+)
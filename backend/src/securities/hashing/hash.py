@@ -1,11 +1,30 @@
+import asyncio
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 from src.config.manager import settings
+from src.utilities.exceptions.password import PasswordHashingOverloaded
+from src.utilities.metrics import metrics_registry
 
 
 class HashGenerator:
     def __init__(self):
         # Set up a single hashing context
         self._hash_ctx: CryptContext = CryptContext(schemes=[settings.HASHING_ALGORITHM_LAYER_1], deprecated="auto")
+        # bcrypt and argon2 release the GIL while hashing, so a small thread pool runs them in parallel
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: int = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of hash/verify jobs running or queued on the hashing pool."""
+        return self._pending
+
+    @property
+    def queue_length(self) -> int:
+        """Number of jobs waiting for a free hashing thread."""
+        return self._executor._work_queue.qsize() if self._executor else 0
 
     def generate_password_hash(self, password: str) -> str:
         """
@@ -19,9 +38,56 @@ class HashGenerator:
         """
         return self._hash_ctx.verify(password, hashed_password)
 
+    async def generate_password_hash_async(self, password: str) -> str:
+        """
+        Hashes the user's password on the dedicated hashing pool, keeping the event loop free.
+        """
+        return await self._run_on_pool(self.generate_password_hash, password)
+
+    async def is_password_verified_async(self, password: str, hashed_password: str) -> bool:
+        """
+        Verifies the user's password on the dedicated hashing pool, keeping the event loop free.
+        """
+        return await self._run_on_pool(self.is_password_verified, password, hashed_password)
+
+    async def _run_on_pool(self, func: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        # Reject instead of queueing without bound, so a burst is shed quickly rather than timing out late
+        if self._pending >= settings.HASHING_POOL_MAX_PENDING:
+            raise PasswordHashingOverloaded(f"{self._pending} password hashing jobs are already pending!")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.HASHING_POOL_SIZE, thread_name_prefix="password-hashing"
+            )
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def shutdown(self) -> None:
+        """Stop the hashing pool, letting queued jobs finish on a helper thread so the event loop keeps running."""
+        if self._executor:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True)
+
 
 def get_hash_generator() -> HashGenerator:
     return HashGenerator()
 
 
 hash_generator: HashGenerator = get_hash_generator()
+
+metrics_registry.gauge(
+    "executor_queue_length",
+    "Jobs waiting for a free thread, by thread pool.",
+    ("executor",),
+    callback=lambda: {("password-hashing",): hash_generator.queue_length},
+)
+metrics_registry.gauge(
+    "executor_pending_jobs",
+    "Jobs running or waiting on a thread pool, by thread pool.",
+    ("executor",),
+    callback=lambda: {("password-hashing",): hash_generator.pending},
+)
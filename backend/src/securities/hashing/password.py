@@ -8,6 +8,12 @@ class PasswordGenerator:
     def is_password_authenticated(self, password: str, hashed_password: str) -> bool:
         return hash_generator.is_password_verified(password=password, hashed_password=hashed_password)
 
+    async def generate_hashed_password_async(self, new_password: str) -> str:
+        return await hash_generator.generate_password_hash_async(password=new_password)
+
+    async def is_password_authenticated_async(self, password: str, hashed_password: str) -> bool:
+        return await hash_generator.is_password_verified_async(password=password, hashed_password=hashed_password)
+
 
 def get_pwd_generator() -> PasswordGenerator:
     return PasswordGenerator()
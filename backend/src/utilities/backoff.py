@@ -0,0 +1,36 @@
+import asyncio
+import random
+import typing
+
+import loguru
+
+T = typing.TypeVar("T")
+
+
+async def retry_with_backoff(
+    operation: typing.Callable[[], typing.Awaitable[T]],
+    *,
+    name: str,
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+) -> T:
+    """
+    Await `operation` until it succeeds, sleeping with exponential backoff and full jitter between attempts.
+
+    The delay before retry `n` is drawn uniformly from `[0, min(max_delay, base_delay * 2**n)]`, so instances
+    restarted together do not hammer a recovering dependency in lockstep. The last failure is re-raised.
+    """
+    for attempt in range(attempts):
+        try:
+            return await operation()
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            loguru.logger.warning(
+                f"{name} -- Attempt {attempt + 1}/{attempts} failed, retrying in {delay:.2f}s: {e!r}"
+            )
+            await asyncio.sleep(delay)
+
+    raise ValueError(f"{name} -- `attempts` must be positive, got {attempts}!")
@@ -8,3 +8,21 @@ class EntityAlreadyExists(Exception):
     """
     Throw an exception when the data already exist in the database.
     """
+
+
+class InvalidPaginationCursor(Exception):
+    """
+    Throw an exception when a pagination cursor cannot be decoded or is rejected by the database.
+    """
+
+
+class SchemaVersionMismatch(Exception):
+    """
+    Throw an exception when the database schema is older than the version this code requires.
+    """
+
+
+class SchemaMigrationLocked(Exception):
+    """
+    Throw an exception when another process holds the schema migration lock.
+    """
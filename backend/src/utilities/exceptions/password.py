@@ -2,3 +2,9 @@ class PasswordDoesNotMatch(Exception):
     """
     Throw an exception when the account password does not match the entitiy's hashed password from the database.
     """
+
+
+class PasswordHashingOverloaded(Exception):
+    """
+    Throw an exception when the password hashing pool has reached its pending job limit.
+    """
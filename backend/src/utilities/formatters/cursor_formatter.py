@@ -0,0 +1,31 @@
+import base64
+import binascii
+import uuid
+
+
+def encode_paging_cursor(paging_state: bytes | None) -> str | None:
+    if not paging_state:
+        return None
+    return base64.urlsafe_b64encode(paging_state).decode("ascii").rstrip("=")
+
+
+def decode_paging_cursor(cursor: str | None) -> bytes | None:
+    if not cursor:
+        return None
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError) as decode_error:
+        raise ValueError(f"Malformed pagination cursor `{cursor}`") from decode_error
+
+
+def encode_history_cursor(bucket: int, message_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{bucket}:{message_id.hex}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple[int, uuid.UUID]:
+    try:
+        decoded_cursor = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        bucket, message_id = decoded_cursor.split(":")
+        return int(bucket), uuid.UUID(hex=message_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as decode_error:
+        raise ValueError(f"Malformed history cursor `{cursor}`") from decode_error
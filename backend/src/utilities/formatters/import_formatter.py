@@ -0,0 +1,53 @@
+import csv
+import json
+import typing
+
+import pydantic
+from src.models.schemas.account import AccountInCreate
+
+ACCOUNT_IMPORT_FORMATS: tuple[str, ...] = ("jsonl", "csv")
+
+
+def format_validation_error(validation_error: pydantic.ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(location) for location in error['loc']) or 'row'}: {error['msg']}"
+        for error in validation_error.errors()
+    )
+
+
+def parse_account_rows(
+    lines: typing.Iterable[str], file_format: str
+) -> typing.Iterator[tuple[int, AccountInCreate | ValueError]]:
+    """
+    Parse accounts from JSON lines or from CSV with a `username,email,password` header, one per line.
+
+    Yields `(line number, account)` pairs, or `(line number, error)` for rows that cannot be parsed, so one bad
+    row never stops the rest of the stream. Blank lines are skipped.
+    """
+    if file_format not in ACCOUNT_IMPORT_FORMATS:
+        raise ValueError(f"Unknown import format `{file_format}`, expected one of {ACCOUNT_IMPORT_FORMATS}")
+
+    header: list[str] | None = None
+    line_number = 0
+    for line in lines:
+        line_number += 1
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            if file_format == "jsonl":
+                row = json.loads(line)
+            else:
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [column.strip() for column in values]
+                    continue
+                if len(values) != len(header):
+                    raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+                row = dict(zip(header, values))
+            yield line_number, AccountInCreate.model_validate(row)
+        except pydantic.ValidationError as validation_error:
+            yield line_number, ValueError(format_validation_error(validation_error))
+        except ValueError as parse_error:
+            yield line_number, parse_error
@@ -0,0 +1,168 @@
+import bisect
+import math
+import typing
+
+# Seconds; spans sub-millisecond cache hits up to requests that are about to time out
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = label_names
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> typing.Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """
+        Histogram keeping one flat list per label set: a count per bucket (the last one is `+Inf`) and the sum.
+
+        Recording is a dict lookup, a bisect and two additions; cumulative counts are only built on scrape.
+        """
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = label_names
+        self.buckets: tuple[float, ...] = buckets
+        self._series: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> typing.Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            cumulative_count = 0.0
+            for upper_bound, bucket_count in zip((*self.buckets, math.inf), series):
+                cumulative_count += bucket_count
+                bucket_labels = _format_labels(self.label_names, labels, extra=f'le="{_format_value(upper_bound)}"')
+                yield f"{self.name}_bucket{bucket_labels} {_format_value(cumulative_count)}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {_format_value(cumulative_count)}"
+
+
+class Gauge:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        callback: typing.Callable[[], dict[LabelValues, float]],
+        metric_type: typing.Literal["gauge", "counter"] = "gauge",
+    ):
+        """Value read from `callback` at scrape time, for state that its owner already tracks."""
+        self.name: str = name
+        self.documentation: str = documentation
+        self.label_names: tuple[str, ...] = label_names
+        self.callback: typing.Callable[[], dict[LabelValues, float]] = callback
+        self.metric_type: str = metric_type
+
+    def collect(self) -> typing.Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for labels, value in self.callback().items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """In-process metrics rendered in the Prometheus text exposition format."""
+        self._metrics: dict[str, Counter | Histogram | Gauge] = {}
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name=name, documentation=documentation, label_names=label_names))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(  # type: ignore
+            Histogram(name=name, documentation=documentation, label_names=label_names, buckets=buckets)
+        )
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        callback: typing.Callable[[], dict[LabelValues, float]],
+        metric_type: typing.Literal["gauge", "counter"] = "gauge",
+    ) -> Gauge:
+        return self._register(  # type: ignore
+            Gauge(
+                name=name,
+                documentation=documentation,
+                label_names=label_names,
+                callback=callback,
+                metric_type=metric_type,
+            )
+        )
+
+    def _register(self, metric: Counter | Histogram | Gauge) -> Counter | Histogram | Gauge:
+        # Registering twice returns the first metric, so re-imported modules keep recording into the same series
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics.values() for line in metric.collect()) + "\n"
+
+
+# Singleton instance of MetricsRegistry
+metrics_registry: MetricsRegistry = MetricsRegistry()
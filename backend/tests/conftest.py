@@ -1,9 +1,64 @@
+import time
+import typing
+import uuid
+
 import asgi_lifespan
 import fastapi
 import httpx
 import pytest
+from cassandra.util import datetime_from_uuid1, uuid_from_time
 
 from src.main import initialize_backend_application
+from src.repository.crud.message import compute_message_bucket
+from src.repository.storage.memory import InMemoryDatabase
+
+
+class RecordingDatabase(InMemoryDatabase):
+    def __init__(self, failing_chatroom_id: uuid.UUID | None = None):
+        """
+        In-memory storage recording every statement it runs as `(name, rows)`, a batch being one entry.
+
+        Batches of `failing_chatroom_id`'s partition raise instead of being written.
+        """
+        super().__init__()
+        self.failing_chatroom_id: uuid.UUID | None = failing_chatroom_id
+        self.statements: list[tuple[str, int]] = []
+
+    def count(self, prefix: str) -> int:
+        """Number of recorded statements whose name starts with `prefix`."""
+        return sum(1 for name, _ in self.statements if name.startswith(prefix))
+
+    async def execute_prepared(self, name: str, parameters: typing.Any = None, **kwargs: typing.Any) -> typing.Any:
+        self.statements.append((name, 1))
+        return await super().execute_prepared(name, parameters, **kwargs)
+
+    async def execute_prepared_batch(self, name: str, parameter_rows: typing.Sequence[typing.Any]) -> None:
+        if self.failing_chatroom_id is not None and parameter_rows[0][0] == self.failing_chatroom_id:
+            raise RuntimeError("Batch too large")
+        self.statements.append((name, len(parameter_rows)))
+        await super().execute_prepared_batch(name, parameter_rows)
+
+    async def execute_prepared_concurrent(
+        self, statements: typing.Iterable[tuple[str, typing.Sequence[typing.Any]]], concurrency: int
+    ) -> None:
+        statements = list(statements)
+        self.statements.extend((name, 1) for name, _ in statements)
+        await super().execute_prepared_concurrent(statements, concurrency=concurrency)
+
+
+async def store_messages(
+    storage: InMemoryDatabase, chatroom_id: uuid.UUID, texts: typing.Sequence[str], spacing_seconds: float = 1.0
+) -> list[uuid.UUID]:
+    """Store one message per text, oldest first and `spacing_seconds` apart up to now, with their buckets."""
+    started_at = time.time() - len(texts) * spacing_seconds
+    message_ids = [uuid_from_time(started_at + index * spacing_seconds) for index in range(len(texts))]
+    for message_id, text in zip(message_ids, texts):
+        bucket = compute_message_bucket(message_id)
+        await storage.execute_prepared("message_bucket.insert", (chatroom_id, bucket))
+        await storage.execute_prepared(
+            "message.insert", (chatroom_id, bucket, message_id, text, uuid.uuid4(), datetime_from_uuid1(message_id))
+        )
+    return message_ids
 
 
 @pytest.fixture(name="backend_test_app")
@@ -0,0 +1,74 @@
+import asyncio
+import typing
+
+from src.config.manager import settings
+from src.models.schemas.account import AccountInCreate
+from src.repository.cache import RedisCache
+from src.repository.crud.user import UserCRUDRepository
+from src.repository.storage.memory import InMemoryDatabase
+from src.utilities.formatters.import_formatter import parse_account_rows
+
+
+def test_csv_rows_are_parsed_with_their_line_numbers() -> None:
+    lines = ["username,email,password", "zoë,zoe@example.com,secret", "", "bob,not-an-email,secret", "short,row"]
+    rows = list(parse_account_rows(lines=lines, file_format="csv"))
+
+    assert [line for line, _ in rows] == [2, 4, 5]
+    assert rows[0][1] == AccountInCreate(username="zoë", email="zoe@example.com", password="secret")
+    assert isinstance(rows[1][1], ValueError) and "email" in str(rows[1][1])
+    assert isinstance(rows[2][1], ValueError)
+
+
+def test_jsonl_rows_are_parsed_and_bad_rows_reported() -> None:
+    lines = ['{"username": "ann", "email": "ann@example.com", "password": "pw"}', '{"username": "x"']
+    rows = list(parse_account_rows(lines=lines, file_format="jsonl"))
+
+    assert rows[0] == (1, AccountInCreate(username="ann", email="ann@example.com", password="pw"))
+    assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
+
+
+async def test_import_reports_conflicts_without_aborting() -> None:
+    user_repo = UserCRUDRepository(storage=InMemoryDatabase(), redis_cache=RedisCache())
+    lines = [
+        '{"username": "ann", "email": "ann@example.com", "password": "pw"}',
+        '{"username": "ann", "email": "other@example.com", "password": "pw"}',
+        '{"username": "bob"}',
+        '{"username": "bea", "email": "ann@example.com", "password": "pw"}',
+        '{"username": "cat", "email": "cat@example.com", "password": "pw"}',
+    ]
+    accounts = parse_account_rows(lines=lines, file_format="jsonl")
+
+    results = {result.line: result async for result in user_repo.import_users(accounts=accounts)}
+
+    assert sorted(results) == [1, 2, 3, 4, 5]
+    assert results[3].status == "invalid"
+    # Lines 1 and 2 share a username and lines 1 and 4 an email; whichever claims first wins, the others conflict
+    created_lines = [line for line in (1, 2, 4) if results[line].status == "created"]
+    assert created_lines in ([1], [2, 4])
+    assert all(results[line].status == "conflict" for line in {1, 2, 4} - set(created_lines))
+    assert results[5].status == "created"
+    assert (await user_repo.read_account_by_username("cat")).user_id == results[5].user_id
+
+
+async def test_import_pauses_reading_for_a_slow_consumer(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "BULK_WRITE_CONCURRENCY", 2)
+    user_repo = UserCRUDRepository(storage=InMemoryDatabase(), redis_cache=RedisCache())
+    lines = [
+        f'{{"username": "user{index}", "email": "user{index}@example.com", "password": "pw"}}' for index in range(8)
+    ]
+    lines_read: list[int] = []
+
+    def _read_accounts() -> typing.Iterator[tuple[int, AccountInCreate | ValueError]]:
+        for line, account in parse_account_rows(lines=lines, file_format="jsonl"):
+            lines_read.append(line)
+            yield line, account
+
+    imported = user_repo.import_users(accounts=_read_accounts())
+    first_result = await anext(imported)
+    await asyncio.sleep(0.2)
+
+    assert first_result.status == "created"
+    # The consumed row's slot only comes back once the consumer asks for the next result
+    assert len(lines_read) <= settings.BULK_WRITE_CONCURRENCY + 1
+    remaining = [result async for result in imported]
+    assert len(remaining) == 7 and len(lines_read) == 8
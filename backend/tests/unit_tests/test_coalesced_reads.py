@@ -0,0 +1,66 @@
+import asyncio
+import datetime
+import uuid
+
+import pytest
+
+from src.repository.cache import RedisCache
+from src.repository.crud.base import coalesced_reads_total
+from src.repository.crud.chatroom import ChatroomCRUDRepository
+from src.utilities.exceptions.database import EntityDoesNotExist
+from tests.conftest import RecordingDatabase
+
+
+async def test_concurrent_identical_reads_share_one_fetch() -> None:
+    storage, redis_cache, chatroom_id = RecordingDatabase(), RedisCache(), uuid.uuid4()
+    await storage.execute_prepared("chatroom.insert", (chatroom_id, "lobby", datetime.datetime(2024, 1, 1)))
+    storage.statements.clear()
+    coalesced_before = coalesced_reads_total._values.get(("ChatroomCRUDRepository.read_chatroom_by_id",), 0.0)
+
+    # Every request builds its own repository, and they still share the read
+    chatrooms = await asyncio.gather(
+        *(
+            ChatroomCRUDRepository(storage=storage, redis_cache=redis_cache).read_chatroom_by_id(chatroom_id)
+            for _ in range(10)
+        )
+    )
+
+    assert {chatroom.chatroom_name for chatroom in chatrooms} == {"lobby"}
+    assert storage.statements == [("chatroom.select_by_id", 1)]
+    coalesced_after = coalesced_reads_total._values[("ChatroomCRUDRepository.read_chatroom_by_id",)]
+    assert coalesced_after - coalesced_before == 9
+
+    await ChatroomCRUDRepository(storage=storage, redis_cache=redis_cache).read_chatroom_by_id(chatroom_id)
+    assert len(storage.statements) == 2
+
+
+async def test_coalesced_callers_all_receive_the_error() -> None:
+    storage = RecordingDatabase()
+    chatroom_repo = ChatroomCRUDRepository(storage=storage, redis_cache=RedisCache())
+
+    missing_chatroom_id = uuid.uuid4()
+
+    results = await asyncio.gather(
+        chatroom_repo.read_chatroom_by_id(missing_chatroom_id),
+        chatroom_repo.read_chatroom_by_id(missing_chatroom_id),
+        chatroom_repo.read_chatroom_by_id(uuid.uuid4()),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, EntityDoesNotExist) for result in results)
+    assert len(storage.statements) == 2
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_read() -> None:
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    await storage.execute_prepared("chatroom.insert", (chatroom_id, "lobby", datetime.datetime(2024, 1, 1)))
+    chatroom_repo = ChatroomCRUDRepository(storage=storage, redis_cache=RedisCache())
+
+    first_read = asyncio.ensure_future(chatroom_repo.read_chatroom_by_id(chatroom_id))
+    second_read = asyncio.ensure_future(chatroom_repo.read_chatroom_by_id(chatroom_id))
+    await asyncio.sleep(0)
+    first_read.cancel()
+
+    assert (await second_read).chatroom_id == chatroom_id
+    with pytest.raises(asyncio.CancelledError):
+        await first_read
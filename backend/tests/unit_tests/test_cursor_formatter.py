@@ -0,0 +1,42 @@
+import uuid
+
+import pytest
+
+from src.utilities.formatters.cursor_formatter import (
+    decode_history_cursor,
+    decode_paging_cursor,
+    encode_history_cursor,
+    encode_paging_cursor,
+)
+
+
+def test_paging_cursor_round_trip() -> None:
+    paging_state = b"\x00\x10paging-state\xff"
+    cursor = encode_paging_cursor(paging_state)
+
+    assert cursor is not None
+    assert "=" not in cursor
+    assert decode_paging_cursor(cursor) == paging_state
+
+
+def test_empty_paging_state_has_no_cursor() -> None:
+    assert encode_paging_cursor(None) is None
+    assert encode_paging_cursor(b"") is None
+    assert decode_paging_cursor(None) is None
+
+
+def test_malformed_cursor_raises_value_error() -> None:
+    with pytest.raises(ValueError):
+        decode_paging_cursor("a")
+
+
+def test_history_cursor_round_trip() -> None:
+    message_id = uuid.uuid1()
+    cursor = encode_history_cursor(bucket=20379, message_id=message_id)
+
+    assert decode_history_cursor(cursor) == (20379, message_id)
+
+
+def test_malformed_history_cursor_raises_value_error() -> None:
+    with pytest.raises(ValueError):
+        decode_history_cursor(encode_paging_cursor(b"not-a-history-cursor"))  # type: ignore
@@ -0,0 +1,25 @@
+import pytest
+
+from src.config.manager import settings
+from src.securities.hashing.hash import HashGenerator
+from src.utilities.exceptions.password import PasswordHashingOverloaded
+
+
+async def test_async_hash_is_verifiable() -> None:
+    hash_generator = HashGenerator()
+    try:
+        hashed_password = await hash_generator.generate_password_hash_async(password="s3cret")
+
+        assert await hash_generator.is_password_verified_async(password="s3cret", hashed_password=hashed_password)
+        assert not await hash_generator.is_password_verified_async(password="wrong", hashed_password=hashed_password)
+        assert hash_generator.pending == 0
+    finally:
+        await hash_generator.shutdown()
+
+
+async def test_hashing_pool_rejects_jobs_over_the_pending_limit() -> None:
+    hash_generator = HashGenerator()
+    hash_generator._pending = settings.HASHING_POOL_MAX_PENDING
+
+    with pytest.raises(PasswordHashingOverloaded):
+        await hash_generator.generate_password_hash_async(password="s3cret")
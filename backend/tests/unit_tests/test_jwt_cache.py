@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from jose import jwt as jose_jwt
+
+from src.config.manager import settings
+from src.securities.authorizations.jwt import jwt_generator, JWTGenerator, VerifiedTokenCache
+from src.utilities.metrics import metrics_registry
+
+
+def encode_token(exp: float) -> str:
+    return jose_jwt.encode(
+        {"username": "alice", "email": "alice@example.com", "exp": int(exp)},
+        key=settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+
+def test_repeat_token_is_served_from_cache() -> None:
+    generator = JWTGenerator()
+    token = encode_token(exp=time.time() + 60)
+
+    first = generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY)
+    second = generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY)
+
+    assert first == second == ["alice", "alice@example.com"]
+    assert generator.verified_tokens.hits == 1
+    assert generator.verified_tokens.misses == 1
+
+
+def test_cached_token_is_not_served_for_another_key() -> None:
+    generator = JWTGenerator()
+    token = encode_token(exp=time.time() + 60)
+    generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY)
+
+    with pytest.raises(ValueError):
+        generator.retrieve_details_from_token(token=token, secret_key="another-secret")
+
+
+def test_cache_evicts_least_recently_used_and_expires_entries() -> None:
+    token_cache = VerifiedTokenCache(max_size=2)
+    now = time.time()
+    token_cache.set(b"a", details=("a", "a@example.com"), expires_at=now + 60)
+    token_cache.set(b"b", details=("b", "b@example.com"), expires_at=now + 60)
+    token_cache.get(b"a")
+    token_cache.set(b"c", details=("c", "c@example.com"), expires_at=now + 60)
+
+    assert token_cache.get(b"b") is None
+    assert token_cache.get(b"a") == ("a", "a@example.com")
+    assert token_cache.evictions == 1
+
+    token_cache._entries[b"a"] = (now - 1, ("a", "a@example.com"))
+    assert token_cache.get(b"a") is None
+    assert token_cache.expirations == 1
+
+
+def test_cache_counters_are_exported(monkeypatch) -> None:
+    monkeypatch.setattr(jwt_generator, "verified_tokens", VerifiedTokenCache(max_size=1))
+    for exp in (time.time() + 60, time.time() + 61):
+        token = encode_token(exp=exp)
+        jwt_generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY)
+    jwt_generator.retrieve_details_from_token(token=token, secret_key=settings.JWT_SECRET_KEY)
+
+    rendered = metrics_registry.render()
+
+    assert 'jwt_cache_lookups_total{result="hit"} 1' in rendered
+    assert 'jwt_cache_lookups_total{result="miss"} 2' in rendered
+    assert 'jwt_cache_removals_total{reason="evicted"} 1' in rendered
+    assert "jwt_cache_entries 1" in rendered
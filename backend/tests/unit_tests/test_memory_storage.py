@@ -0,0 +1,73 @@
+import time
+import uuid
+
+import pytest
+from cassandra.util import uuid_from_time
+
+from src.repository.storage.memory import InMemoryDatabase
+
+
+async def test_claims_are_unique_and_released_only_by_their_owner() -> None:
+    storage = InMemoryDatabase()
+    owner_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    first_claim = await storage.execute_prepared("user.claim_username", ("alice", owner_id, "alice@example.com"))
+    second_claim = await storage.execute_prepared("user.claim_username", ("alice", other_id, "other@example.com"))
+    assert first_claim.was_applied and not second_claim.was_applied
+
+    foreign_release = await storage.execute_prepared("user.release_username", ("alice", other_id))
+    assert not foreign_release.was_applied
+    owner_row = (await storage.execute_prepared("user.select_by_username", ("alice",))).one()
+    assert owner_row is not None
+    assert owner_row["user_id"] == owner_id
+
+    assert (await storage.execute_prepared("user.release_username", ("alice", owner_id))).was_applied
+    assert (await storage.execute_prepared("user.select_by_username", ("alice",))).one() is None
+
+
+async def test_messages_are_read_newest_first_within_a_bucket() -> None:
+    storage = InMemoryDatabase()
+    chatroom_id, user_id = uuid.uuid4(), uuid.uuid4()
+    now = time.time()
+    message_ids = [uuid_from_time(now + offset) for offset in range(5)]
+    await storage.execute_prepared_batch(
+        "message.insert",
+        [(chatroom_id, 1, message_id, "hello", user_id, None) for message_id in reversed(message_ids)],
+    )
+
+    latest = await storage.execute_prepared("message.select_latest", (chatroom_id, 1, 3))
+    assert [row["message_id"] for row in latest.current_rows] == message_ids[:1:-1]
+
+    before = await storage.execute_prepared("message.select_before", (chatroom_id, 1, message_ids[2], 10))
+    assert [row["message_id"] for row in before.current_rows] == message_ids[1::-1]
+
+
+async def test_message_buckets_are_walked_newest_first() -> None:
+    storage = InMemoryDatabase()
+    chatroom_id = uuid.uuid4()
+    for bucket in (3, 1, 2):
+        await storage.execute_prepared("message_bucket.insert", (chatroom_id, bucket))
+
+    assert (await storage.execute_prepared("message_bucket.select_latest", (chatroom_id,))).one() == {"bucket": 3}
+    assert (await storage.execute_prepared("message_bucket.select_before", (chatroom_id, 3))).one() == {"bucket": 2}
+    assert (await storage.execute_prepared("message_bucket.select_before", (chatroom_id, 1))).one() is None
+
+
+async def test_listing_pages_through_every_row_once() -> None:
+    storage = InMemoryDatabase()
+    user_ids = {uuid.uuid4() for _ in range(25)}
+    for user_id in user_ids:
+        await storage.execute_prepared("user.insert", (user_id, f"user-{user_id}", f"{user_id}@example.com", "hash"))
+
+    pages = [page async for page in storage.iterate_prepared_pages("user.select_all", fetch_size=10)]
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert {row["user_id"] for page in pages for row in page} == user_ids
+    assert all("hashed_password" not in row for page in pages for row in page)
+
+
+async def test_malformed_paging_state_is_rejected() -> None:
+    storage = InMemoryDatabase()
+
+    with pytest.raises(ValueError):
+        await storage.execute_prepared("user.select_all", paging_state=b"not-a-key", fetch_size=10)
@@ -0,0 +1,101 @@
+import asyncio
+import datetime
+import uuid
+
+import pytest
+from cassandra.util import uuid_from_time
+
+from src.config.manager import settings
+from src.repository import ingestion
+from src.repository.crud.message import compute_message_bucket
+from src.repository.ingestion import MessageIngestionBuffer, PendingMessage
+from tests.conftest import RecordingDatabase
+
+
+def _build_message(chatroom_id: uuid.UUID, text: str = "hello") -> PendingMessage:
+    message_id = uuid_from_time(datetime.datetime.now())
+    return PendingMessage(
+        chatroom_id=chatroom_id,
+        bucket=compute_message_bucket(message_id),
+        message_id=message_id,
+        message_text=text,
+        user_id=uuid.uuid4(),
+        created_at=datetime.datetime.now(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def buffer_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Search indexing has its own tests; here it would only start a writer against the configured storage
+    monkeypatch.setattr(ingestion.message_search_indexer, "enqueue", lambda messages: None)
+    monkeypatch.setattr(settings, "MESSAGE_ACK_MODE", "flush")
+    monkeypatch.setattr(settings, "MESSAGE_BATCH_MAX_SIZE", 3)
+    monkeypatch.setattr(settings, "MESSAGE_BATCH_DELAY_MS", 60_000)
+
+
+async def test_a_full_batch_is_flushed_without_waiting_for_the_delay() -> None:
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    buffer = MessageIngestionBuffer(storage=storage)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(buffer.submit(_build_message(chatroom_id)) for _ in range(3))), timeout=1.0
+    )
+
+    assert storage.statements == [("message_bucket.insert", 1), ("message.insert", 3)]
+    await buffer.close()
+
+
+async def test_a_partial_batch_is_flushed_after_the_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MESSAGE_BATCH_DELAY_MS", 10)
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    buffer = MessageIngestionBuffer(storage=storage)
+
+    await asyncio.wait_for(buffer.submit(_build_message(chatroom_id)), timeout=1.0)
+
+    assert storage.statements == [("message_bucket.insert", 1), ("message.insert", 1)]
+    await buffer.close()
+
+
+async def test_a_failed_partition_fails_only_its_own_messages() -> None:
+    failing_chatroom_id, chatroom_id = uuid.uuid4(), uuid.uuid4()
+    storage = RecordingDatabase(failing_chatroom_id=failing_chatroom_id)
+    buffer = MessageIngestionBuffer(storage=storage)
+
+    results = await asyncio.gather(
+        buffer.submit(_build_message(failing_chatroom_id)),
+        buffer.submit(_build_message(chatroom_id)),
+        buffer.submit(_build_message(chatroom_id)),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1:] == [None, None]
+    assert ("message.insert", 2) in storage.statements
+    await buffer.close()
+
+
+async def test_partitions_are_split_into_batches_by_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MESSAGE_BATCH_MAX_BYTES", 1200)
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    buffer = MessageIngestionBuffer(storage=storage)
+
+    await asyncio.gather(*(buffer.submit(_build_message(chatroom_id, text="x" * 400)) for _ in range(3)))
+
+    # The bucket index is written before the messages it points to
+    assert storage.statements == [("message_bucket.insert", 1), ("message.insert", 2), ("message.insert", 1)]
+    await buffer.close()
+
+
+async def test_close_drains_buffered_messages(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "MESSAGE_ACK_MODE", "enqueue")
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    buffer = MessageIngestionBuffer(storage=storage)
+    message = _build_message(chatroom_id)
+
+    await buffer.submit(message)
+    assert storage.statements == []
+    await buffer.close()
+
+    assert storage.chatroom_messages.get({"chatroom_id": chatroom_id, "bucket": message.bucket, **message._asdict()})
+    with pytest.raises(RuntimeError):
+        await buffer.submit(message)
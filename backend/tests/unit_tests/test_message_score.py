@@ -0,0 +1,21 @@
+import time
+
+from cassandra.util import unix_time_from_uuid1, uuid_from_time
+
+from src.repository.crud.message import compute_message_score
+
+
+def test_message_score_is_unix_microseconds() -> None:
+    message_id = uuid_from_time(1_700_000_000.123456)
+
+    assert compute_message_score(message_id) == round(unix_time_from_uuid1(message_id) * 1_000_000)
+
+
+def test_message_score_orders_like_message_ids() -> None:
+    now = time.time()
+    message_ids = [uuid_from_time(now + offset / 1_000_000) for offset in range(0, 50, 7)]
+    scores = [compute_message_score(message_id) for message_id in message_ids]
+
+    assert scores == sorted(scores)
+    assert len(set(scores)) == len(scores)
+    assert all(float(score) == score for score in scores)
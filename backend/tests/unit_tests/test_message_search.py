@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+
+from src.config.manager import settings
+from src.repository.cache import RedisCache
+from src.repository.crud.message import compute_message_bucket, MessageCRUDRepository
+from src.repository.search import IndexedMessage, MessageSearchIndexer, tokenize_message_text
+from src.repository.storage.memory import InMemoryDatabase
+from tests.conftest import store_messages
+
+
+async def _store_indexed_messages(
+    storage: InMemoryDatabase, chatroom_id: uuid.UUID, texts: list[str]
+) -> list[uuid.UUID]:
+    # One message per bucket width apart, so the messages spread over several buckets
+    message_ids = await store_messages(storage, chatroom_id, texts, spacing_seconds=settings.MESSAGE_BUCKET_SECONDS)
+    await MessageSearchIndexer(storage=storage).index_messages(
+        IndexedMessage(chatroom_id, compute_message_bucket(message_id), message_id, text)
+        for message_id, text in zip(message_ids, texts)
+    )
+    return message_ids
+
+
+def test_terms_are_case_folded_and_deduplicated() -> None:
+    assert tokenize_message_text("Hello, hello WORLD! a ok-go") == ["hello", "world", "ok", "go"]
+    assert tokenize_message_text("one two three", max_terms=2) == ["one", "two"]
+
+
+async def test_search_intersects_terms_newest_first() -> None:
+    storage, chatroom_id = InMemoryDatabase(), uuid.uuid4()
+    message_ids = await _store_indexed_messages(
+        storage, chatroom_id, ["deploy the release", "release notes", "Release deploy done", "lunch?"]
+    )
+    message_repo = MessageCRUDRepository(storage=storage, redis_cache=RedisCache())
+
+    search_page = await message_repo.search_messages(chatroom_id=chatroom_id, query="DEPLOY release", limit=10)
+
+    assert [reference.message_id for reference in search_page.messages] == [message_ids[2], message_ids[0]]
+    assert search_page.next_cursor is None
+    assert (await message_repo.search_messages(chatroom_id=chatroom_id, query="missing", limit=10)).messages == []
+
+
+@pytest.mark.parametrize(
+    "budget", [{"SEARCH_SCAN_MAX_BUCKETS": 2}, {"SEARCH_FETCH_SIZE": 1, "SEARCH_SCAN_MAX_POSTINGS": 2}]
+)
+async def test_search_pages_resume_across_scan_budgets(monkeypatch: pytest.MonkeyPatch, budget: dict) -> None:
+    for name, value in budget.items():
+        monkeypatch.setattr(settings, name, value)
+    storage, chatroom_id = InMemoryDatabase(), uuid.uuid4()
+    message_ids = await _store_indexed_messages(storage, chatroom_id, [f"ping {index}" for index in range(5)])
+    message_repo = MessageCRUDRepository(storage=storage, redis_cache=RedisCache())
+
+    found_ids: list[uuid.UUID] = []
+    cursor: str | None = None
+    for _ in range(10):
+        search_page = await message_repo.search_messages(chatroom_id=chatroom_id, query="ping", limit=3, cursor=cursor)
+        found_ids.extend(reference.message_id for reference in search_page.messages)
+        cursor = search_page.next_cursor
+        if cursor is None:
+            break
+
+    assert found_ids == message_ids[::-1]
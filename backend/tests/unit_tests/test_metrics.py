@@ -0,0 +1,34 @@
+from src.utilities.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("request_seconds", "Request latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, ("/chatrooms",))
+
+    rendered = registry.render()
+
+    assert 'request_seconds_bucket{route="/chatrooms",le="0.1"} 1' in rendered
+    assert 'request_seconds_bucket{route="/chatrooms",le="1"} 3' in rendered
+    assert 'request_seconds_bucket{route="/chatrooms",le="+Inf"} 4' in rendered
+    assert 'request_seconds_count{route="/chatrooms"} 4' in rendered
+    assert 'request_seconds_sum{route="/chatrooms"} 4.05' in rendered
+
+
+def test_counter_and_gauge_render_escaped_labels() -> None:
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors.", ("error",)).inc(('say "hi"\n',), amount=2)
+    registry.gauge("queue_length", "Queued jobs.", (), callback=lambda: {(): 7})
+
+    rendered = registry.render()
+
+    assert "# TYPE errors_total counter" in rendered
+    assert 'errors_total{error="say \\"hi\\"\\n"} 2' in rendered
+    assert "queue_length 7" in rendered
+
+
+def test_registering_a_metric_twice_returns_the_first() -> None:
+    registry = MetricsRegistry()
+
+    assert registry.counter("jobs_total", "Jobs.") is registry.counter("jobs_total", "Jobs.")
@@ -0,0 +1,40 @@
+import uuid
+
+import pytest
+
+from src.config.manager import settings
+from src.repository.cache import RedisCache
+from src.repository.presence import PresenceTracker
+
+
+def test_heartbeats_are_coalesced_into_one_flush() -> None:
+    tracker = PresenceTracker(redis_cache=RedisCache())
+    user_id = uuid.uuid4()
+    for _ in range(3):
+        tracker.heartbeat(user_id)
+
+    assert tracker.collect_due_users(now=1000.0) == [user_id]
+    assert tracker.collect_due_users(now=1001.0) == []
+
+
+def test_connected_users_are_refreshed_once_a_third_of_the_ttl_passed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PRESENCE_TTL", 30)
+    tracker = PresenceTracker(redis_cache=RedisCache())
+    user_id, other_user_id = uuid.uuid4(), uuid.uuid4()
+    tracker.track(user_id)
+    tracker.track(user_id)
+    tracker.track(other_user_id)
+
+    assert set(tracker.collect_due_users(now=1000.0)) == {user_id, other_user_id}
+    assert tracker.collect_due_users(now=1005.0) == []
+
+    tracker.untrack(user_id)
+    tracker.untrack(other_user_id)
+    assert tracker.connected_users == 1
+    assert tracker.collect_due_users(now=1010.0) == [user_id]
+
+
+async def test_nobody_is_online_without_redis() -> None:
+    tracker = PresenceTracker(redis_cache=RedisCache())
+
+    assert await tracker.read_online_members("chatroom:members:unknown") == []
@@ -0,0 +1,103 @@
+import asyncio
+import typing
+
+from src.repository.cache import RedisCache
+from src.repository.pubsub import RedisPubSubHub
+
+
+class FakePubSub:
+    """Records SUBSCRIBE/UNSUBSCRIBE commands and hands out the messages put on its queue."""
+
+    def __init__(self):
+        self.commands: list[tuple[str, str]] = []
+        self.messages: asyncio.Queue[dict[str, str]] = asyncio.Queue()
+        self.is_closed: bool = False
+
+    async def subscribe(self, channel: str) -> None:
+        self.commands.append(("SUBSCRIBE", channel))
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.commands.append(("UNSUBSCRIBE", channel))
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float) -> dict[str, str] | None:
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        self.is_closed = True
+
+
+class FakeRedis:
+    def __init__(self):
+        self.pubsub_connection: FakePubSub = FakePubSub()
+
+    def pubsub(self, ignore_subscribe_messages: bool) -> FakePubSub:
+        return self.pubsub_connection
+
+
+def build_hub() -> tuple[RedisPubSubHub, FakePubSub]:
+    redis_cache = RedisCache()
+    redis = FakeRedis()
+    redis_cache.redis = redis  # type: ignore
+    return RedisPubSubHub(redis_cache=redis_cache), redis.pubsub_connection
+
+
+async def test_listeners_of_a_channel_share_one_subscription() -> None:
+    hub, pubsub = build_hub()
+    first_received: list[str] = []
+    second_received: list[str] = []
+    try:
+        await hub.subscribe(channel="chatroom:a", listener=first_received.append)
+        await hub.subscribe(channel="chatroom:a", listener=second_received.append)
+
+        assert pubsub.commands == [("SUBSCRIBE", "chatroom:a")]
+        assert hub.channels == 1
+
+        await hub.unsubscribe(channel="chatroom:a", listener=first_received.append)
+        assert pubsub.commands == [("SUBSCRIBE", "chatroom:a")]
+
+        await hub.unsubscribe(channel="chatroom:a", listener=second_received.append)
+        assert pubsub.commands == [("SUBSCRIBE", "chatroom:a"), ("UNSUBSCRIBE", "chatroom:a")]
+        assert hub.channels == 0
+    finally:
+        await hub.close()
+
+    assert pubsub.is_closed
+
+
+async def test_messages_reach_every_listener_despite_a_failing_one() -> None:
+    hub, pubsub = build_hub()
+    received: list[str] = []
+    delivered = asyncio.Event()
+
+    def failing_listener(data: str) -> None:
+        raise RuntimeError("socket gone")
+
+    def listener(data: str) -> None:
+        received.append(data)
+        if len(received) == 2:
+            delivered.set()
+
+    try:
+        await hub.subscribe(channel="chatroom:a", listener=failing_listener)
+        await hub.subscribe(channel="chatroom:a", listener=listener)
+        for data in ("first", "second"):
+            pubsub.messages.put_nowait({"type": "message", "channel": "chatroom:a", "data": data})
+
+        await asyncio.wait_for(delivered.wait(), timeout=1.0)
+    finally:
+        await hub.close()
+
+    assert received == ["first", "second"]
+
+
+async def test_closing_waits_for_the_reader_task() -> None:
+    hub, _ = build_hub()
+    await hub.subscribe(channel="chatroom:a", listener=lambda data: None)
+    reader_task = typing.cast(asyncio.Task, hub._reader_task)
+
+    await hub.close()
+
+    assert reader_task.done() and hub._reader_task is None
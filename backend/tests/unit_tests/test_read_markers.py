@@ -0,0 +1,49 @@
+import time
+import uuid
+
+from cassandra.util import uuid_from_time
+
+from src.models.schemas.message import ReadMarkerInUpdate
+from src.repository.cache import RedisCache
+from src.repository.crud.message import MessageCRUDRepository
+from src.repository.read_markers import decode_read_marker, encode_read_marker
+from src.repository.storage.memory import InMemoryDatabase
+from tests.conftest import store_messages
+
+
+def test_read_markers_round_trip_through_their_cached_form() -> None:
+    message_id = uuid_from_time(time.time())
+
+    assert decode_read_marker(encode_read_marker(score=123, message_id=message_id)) == message_id
+
+
+async def test_a_late_marker_write_does_not_move_the_stored_marker_back() -> None:
+    storage, user_id, chatroom_id = InMemoryDatabase(), uuid.uuid4(), uuid.uuid4()
+    older_message_id, newer_message_id = uuid_from_time(time.time() - 1), uuid_from_time(time.time())
+
+    await storage.execute_prepared("read_marker.upsert", (user_id, chatroom_id, newer_message_id, 2))
+    await storage.execute_prepared("read_marker.upsert", (user_id, chatroom_id, older_message_id, 1))
+
+    result = await storage.execute_prepared("read_marker.select_all", (user_id,))
+    assert result.current_rows == [{"chatroom_id": chatroom_id, "message_id": newer_message_id}]
+
+
+async def test_unread_counts_fall_back_to_storage_without_redis() -> None:
+    storage, user_id = InMemoryDatabase(), uuid.uuid4()
+    read_chatroom_id, unread_chatroom_id = uuid.uuid4(), uuid.uuid4()
+    for chatroom_id in (read_chatroom_id, unread_chatroom_id):
+        await storage.execute_prepared("room_by_user.insert", (user_id, chatroom_id, None))
+    message_ids = await store_messages(storage, read_chatroom_id, ["hello"] * 5)
+    await store_messages(storage, unread_chatroom_id, ["hello"] * 3)
+    message_repo = MessageCRUDRepository(storage=storage, redis_cache=RedisCache())
+
+    for message_id in (message_ids[3], message_ids[1]):
+        await message_repo.mark_read(read_chatroom_id, ReadMarkerInUpdate(user_id=user_id, message_id=message_id))
+
+    unread = {room.chatroom_id: room for room in (await message_repo.read_unread_counts(user_id=user_id)).chatrooms}
+    assert (unread[read_chatroom_id].last_read_message_id, unread[read_chatroom_id].unread_count) == (
+        message_ids[3],
+        1,
+    )
+    assert (unread[unread_chatroom_id].last_read_message_id, unread[unread_chatroom_id].unread_count) == (None, 3)
+    assert not unread[unread_chatroom_id].is_capped
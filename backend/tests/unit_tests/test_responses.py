@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime
+
+import fastapi
+import fastapi.testclient
+
+from src.api.responses import PydanticJSONResponse
+from src.models.schemas.message import MessageInResponse, MessagePageInResponse
+
+
+def test_pydantic_json_response_matches_response_model_serialization() -> None:
+    message_page = MessagePageInResponse(
+        messages=[
+            MessageInResponse(
+                chatroom_id=uuid.uuid4(),
+                message_id=uuid.uuid1(),
+                user_id=uuid.uuid4(),
+                message_text='ünïcode "quoted" \\ /\n☃ 😀',
+                created_at=datetime(2024, 2, 29, 23, 59, 59, 123000),
+            )
+        ],
+        next_cursor="abc",
+    )
+    app = fastapi.FastAPI()
+
+    @app.get("/serialized", response_model=MessagePageInResponse)
+    async def serialized() -> MessagePageInResponse:
+        return message_page
+
+    @app.get("/rendered", response_model=MessagePageInResponse)
+    async def rendered() -> PydanticJSONResponse:
+        return PydanticJSONResponse(content=message_page)
+
+    client = fastapi.testclient.TestClient(app)
+    serialized_response, rendered_response = client.get("/serialized"), client.get("/rendered")
+
+    assert rendered_response.content == serialized_response.content
+    assert rendered_response.headers["content-type"] == serialized_response.headers["content-type"]
@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+
+from src.config.manager import settings
+from src.repository.cache import RedisCache
+from src.repository.crud.chatroom import ChatroomCRUDRepository
+from tests.conftest import RecordingDatabase
+
+
+async def test_members_are_deduplicated_and_written_in_batches_to_both_tables(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "MEMBERS_BATCH_SIZE", 2)
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    chatroom_repo = ChatroomCRUDRepository(storage=storage, redis_cache=RedisCache())
+    user_ids = [uuid.uuid4() for _ in range(5)]
+
+    await chatroom_repo.add_members(chatroom_id=chatroom_id, user_ids=[*user_ids, user_ids[0], user_ids[3]])
+
+    assert sorted(rows for name, rows in storage.statements if name == "room_member.insert") == [1, 2, 2]
+    assert storage.count("room_by_user.insert") == 5
+    for user_id in user_ids:
+        assert await chatroom_repo.is_member(chatroom_id=chatroom_id, user_id=user_id)
+        user_rooms = await chatroom_repo.read_user_chatrooms_page(user_id=user_id, limit=10)
+        assert [room.chatroom_id for room in user_rooms.chatrooms] == [chatroom_id]
+
+
+async def test_removed_members_leave_both_tables() -> None:
+    storage, chatroom_id = RecordingDatabase(), uuid.uuid4()
+    chatroom_repo = ChatroomCRUDRepository(storage=storage, redis_cache=RedisCache())
+    staying_id, leaving_id = uuid.uuid4(), uuid.uuid4()
+    await chatroom_repo.add_members(chatroom_id=chatroom_id, user_ids=[staying_id, leaving_id])
+
+    await chatroom_repo.remove_members(chatroom_id=chatroom_id, user_ids=[leaving_id, leaving_id])
+
+    assert storage.statements[-2:] == [("room_member.delete", 1), ("room_by_user.delete", 1)]
+    assert not await chatroom_repo.is_member(chatroom_id=chatroom_id, user_id=leaving_id)
+    assert (await chatroom_repo.read_user_chatrooms_page(user_id=leaving_id, limit=10)).chatrooms == []
+    assert await chatroom_repo.is_member(chatroom_id=chatroom_id, user_id=staying_id)
+
+
+async def test_members_are_paged_with_a_cursor() -> None:
+    chatroom_id = uuid.uuid4()
+    chatroom_repo = ChatroomCRUDRepository(storage=RecordingDatabase(), redis_cache=RedisCache())
+    user_ids = [uuid.uuid4() for _ in range(5)]
+    await chatroom_repo.add_members(chatroom_id=chatroom_id, user_ids=user_ids)
+
+    paged_ids: list[uuid.UUID] = []
+    cursor: str | None = None
+    for _ in range(5):
+        members_page = await chatroom_repo.read_members_page(chatroom_id=chatroom_id, limit=2, cursor=cursor)
+        assert len(members_page.members) <= 2
+        paged_ids.extend(member.user_id for member in members_page.members)
+        cursor = members_page.next_cursor
+        if cursor is None:
+            break
+
+    assert cursor is None
+    assert sorted(paged_ids) == sorted(user_ids)
@@ -0,0 +1,43 @@
+import pytest
+
+from src.repository.schema.migrator import load_migrations, SchemaMigrator
+from src.utilities.exceptions.database import SchemaVersionMismatch
+
+
+class RecordedVersions:
+    def __init__(self, versions: list[int]):
+        self.current_rows = [{"version": version} for version in versions]
+
+
+class SchemaMigrationsTable:
+    def __init__(self, versions: list[int] | None):
+        self.versions = versions
+
+    def table_metadata(self, table_name: str) -> object | None:
+        return object() if self.versions is not None else None
+
+    async def execute_async(self, statement: str, parameters: tuple | None = None) -> RecordedVersions:
+        return RecordedVersions(self.versions or [])
+
+
+def test_migrations_are_numbered_contiguously() -> None:
+    migrations = load_migrations()
+
+    assert [migration.version for migration in migrations] == list(range(1, len(migrations) + 1))
+    assert all(migration.description for migration in migrations)
+
+
+async def test_check_rejects_an_outdated_schema() -> None:
+    migrator = SchemaMigrator(cassandra_db=SchemaMigrationsTable(versions=None))  # type: ignore
+
+    with pytest.raises(SchemaVersionMismatch):
+        await migrator.check()
+
+
+async def test_check_accepts_the_latest_or_a_newer_schema() -> None:
+    latest_version = len(load_migrations())
+    migrator = SchemaMigrator(
+        cassandra_db=SchemaMigrationsTable(versions=list(range(1, latest_version + 2)))  # type: ignore
+    )
+
+    assert await migrator.check() == latest_version + 1
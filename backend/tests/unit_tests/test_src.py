@@ -1,6 +1,8 @@
 import fastapi
+from starlette.routing import Match
 
 import src
+from src.config.manager import settings
 from src.main import backend_app
 
 
@@ -14,3 +16,15 @@ def test_application_is_fastapi_instance() -> None:
     assert backend_app.docs_url == "/docs"
     assert backend_app.openapi_url == "/openapi.json"
     assert backend_app.redoc_url == "/redoc"
+
+
+def test_account_listings_do_not_shadow_usernames() -> None:
+    for username in ("page", "stream", "list"):
+        scope = {"type": "http", "method": "GET", "path": f"{settings.API_PREFIX}/accounts/{username}"}
+        route = next(
+            route
+            for route in backend_app.router.routes
+            if isinstance(route, fastapi.routing.APIRoute) and route.matches(scope)[0] == Match.FULL
+        )
+
+        assert route.name == "users:read-user-by-username"
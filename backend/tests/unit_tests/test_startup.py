@@ -0,0 +1,37 @@
+import pytest
+
+from src.repository.health import DependencyHealth
+from src.utilities.backoff import retry_with_backoff
+
+
+async def test_retry_with_backoff_retries_until_success() -> None:
+    attempts: list[None] = []
+
+    async def flaky() -> str:
+        attempts.append(None)
+        if len(attempts) < 3:
+            raise ConnectionError("not yet")
+        return "connected"
+
+    assert await retry_with_backoff(flaky, name="flaky", attempts=5, base_delay=0.001, max_delay=0.01) == "connected"
+    assert len(attempts) == 3
+
+
+async def test_retry_with_backoff_reraises_last_failure() -> None:
+    async def down() -> None:
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        await retry_with_backoff(down, name="down", attempts=2, base_delay=0.001, max_delay=0.01)
+
+
+def test_dependency_health_is_ready_only_when_every_dependency_is() -> None:
+    health = DependencyHealth(dependencies=("redis", "cassandra"))
+    health.mark_ready("redis")
+    assert not health.is_ready
+
+    health.mark_failed("cassandra", error=ConnectionError("down"))
+    assert health.report()["cassandra"] == {"status": "failed", "error": "ConnectionError('down')"}
+
+    health.mark_ready("cassandra")
+    assert health.is_ready
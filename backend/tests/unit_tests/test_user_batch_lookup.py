@@ -0,0 +1,33 @@
+import uuid
+
+from src.models.schemas.account import AccountInCreate
+from src.repository.cache import RedisCache
+from src.repository.crud.user import UserCRUDRepository
+from src.repository.storage.memory import InMemoryDatabase
+
+
+async def test_batch_lookup_returns_each_user_once_and_reports_missing_keys() -> None:
+    user_repo = UserCRUDRepository(storage=InMemoryDatabase(), redis_cache=RedisCache())
+    ann = await user_repo._register_user(
+        AccountInCreate(username="ann", email="ann@example.com", password="pw"), hashed_password="hash"
+    )
+    bob = await user_repo._register_user(
+        AccountInCreate(username="bob", email="bob@example.com", password="pw"), hashed_password="hash"
+    )
+    unknown_id = uuid.uuid4()
+
+    batch = await user_repo.read_accounts(
+        user_ids=[bob.user_id, unknown_id, bob.user_id], usernames=["ann", "bob", "nobody"]
+    )
+
+    assert batch.users == [bob, ann]
+    assert batch.missing_user_ids == [unknown_id]
+    assert batch.missing_usernames == ["nobody"]
+
+
+async def test_empty_batch_lookup() -> None:
+    user_repo = UserCRUDRepository(storage=InMemoryDatabase(), redis_cache=RedisCache())
+
+    batch = await user_repo.read_accounts(user_ids=[], usernames=[])
+
+    assert batch.users == [] and batch.missing_user_ids == [] and batch.missing_usernames == []
@@ -0,0 +1,142 @@
+import typing
+import uuid
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.models.schemas.account import AccountInCreate, AccountInUpdate
+from src.repository.cache import NEGATIVE_CACHE_ENTRY, RedisCache
+from src.repository.crud.user import UserCRUDRepository
+from src.utilities.exceptions.database import EntityDoesNotExist
+from tests.conftest import RecordingDatabase
+
+
+class DictRedis:
+    """The few Redis commands of the read-through cache, over a dict; TTLs are ignored."""
+
+    def __init__(self, is_down: bool = False):
+        self.values: dict[str, str] = {}
+        self.is_down: bool = is_down
+
+    def _check(self) -> None:
+        if self.is_down:
+            raise RedisConnectionError("Redis is down")
+
+    async def get(self, key: str) -> str | None:
+        self._check()
+        return self.values.get(key)
+
+    async def mget(self, keys: typing.Sequence[str]) -> list[str | None]:
+        self._check()
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key: str, value: str, ex: int) -> None:
+        self._check()
+        self.values[key] = value
+
+    async def delete(self, *keys: str) -> None:
+        self._check()
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction: bool) -> "DictRedisPipeline":
+        return DictRedisPipeline(redis=self)
+
+
+class DictRedisPipeline:
+    def __init__(self, redis: DictRedis):
+        self.redis: DictRedis = redis
+        self.commands: list[tuple[str, str, int]] = []
+
+    async def __aenter__(self) -> "DictRedisPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        self.commands.clear()
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.commands.append((key, value, ex))
+
+    async def execute(self) -> None:
+        for key, value, ex in self.commands:
+            await self.redis.set(key, value, ex=ex)
+
+
+def build_user_repo(redis: DictRedis) -> tuple[UserCRUDRepository, RecordingDatabase, RedisCache]:
+    storage, redis_cache = RecordingDatabase(), RedisCache()
+    redis_cache.redis = redis  # type: ignore
+    return UserCRUDRepository(storage=storage, redis_cache=redis_cache), storage, redis_cache
+
+
+async def register(user_repo: UserCRUDRepository, username: str) -> typing.Any:
+    return await user_repo._register_user(
+        AccountInCreate(username=username, email=f"{username}@example.com", password="pw"), hashed_password="hash"
+    )
+
+
+async def test_read_through_serves_users_and_missing_names_from_the_cache() -> None:
+    redis = DictRedis()
+    user_repo, storage, redis_cache = build_user_repo(redis)
+    ann = await register(user_repo, "ann")
+
+    assert await user_repo.read_account_by_username("ann") == ann
+    assert await user_repo.read_account_by_username("ann") == ann
+    for _ in range(2):
+        with pytest.raises(EntityDoesNotExist):
+            await user_repo.read_account_by_username("nobody")
+
+    assert storage.count("user.select_by") == 2
+    assert redis.values["user:username:nobody"] == NEGATIVE_CACHE_ENTRY
+    assert redis_cache.stats == {"hits": 2, "negative_hits": 1, "misses": 2, "errors": 0}
+
+
+async def test_batch_read_through_serves_cached_users_and_missing_keys() -> None:
+    user_repo, storage, _ = build_user_repo(DictRedis())
+    ann = await register(user_repo, "ann")
+    unknown_id = uuid.uuid4()
+
+    for _ in range(2):
+        batch = await user_repo.read_accounts(user_ids=[ann.user_id, unknown_id], usernames=["nobody"])
+
+        assert batch.users == [ann]
+        assert batch.missing_user_ids == [unknown_id]
+        assert batch.missing_usernames == ["nobody"]
+    assert storage.count("user.select_by") == 3
+
+
+async def test_update_and_delete_drop_the_cached_entries() -> None:
+    user_repo, _, _ = build_user_repo(DictRedis())
+    ann = await register(user_repo, "ann")
+    await user_repo.read_account_by_id(ann.user_id)
+    await user_repo.read_account_by_username("ann")
+    await user_repo.read_account_by_email("ann@example.com")
+    with pytest.raises(EntityDoesNotExist):
+        await user_repo.read_account_by_username("annie")
+
+    await user_repo.update_account_by_id(ann.user_id, AccountInUpdate(username="annie", email=None, password=None))
+
+    assert (await user_repo.read_account_by_id(ann.user_id)).username == "annie"
+    assert (await user_repo.read_account_by_username("annie")).user_id == ann.user_id
+    with pytest.raises(EntityDoesNotExist):
+        await user_repo.read_account_by_username("ann")
+
+    await user_repo.delete_account_by_id(ann.user_id)
+
+    with pytest.raises(EntityDoesNotExist):
+        await user_repo.read_account_by_id(ann.user_id)
+    with pytest.raises(EntityDoesNotExist):
+        await user_repo.read_account_by_email("ann@example.com")
+
+
+async def test_reads_fall_back_to_storage_when_redis_fails() -> None:
+    user_repo, storage, redis_cache = build_user_repo(DictRedis(is_down=True))
+    ann = await register(user_repo, "ann")
+    errors_before = redis_cache.errors
+
+    assert await user_repo.read_account_by_username("ann") == ann
+    batch = await user_repo.read_accounts(user_ids=[ann.user_id], usernames=["ann"])
+
+    assert batch.users == [ann]
+    assert storage.count("user.select_by") == 3
+    # Each read fails to look up the cache and to fill it again
+    assert redis_cache.errors - errors_before == 4